@@ -0,0 +1,69 @@
+"""Benchmark of the completion of the node names of Gstudio
+
+Builds a completion index of a million synthetic nodes, then
+measures the completion of prefixes of 1 to 4 characters, first
+on blocks not ranked yet, then on ranked blocks, and the update
+of the names of a node.
+
+Usage:
+
+  $ DJANGO_SETTINGS_MODULE=gstudio.testsettings \\
+    python benchmarks/completion.py
+"""
+import time
+import random
+import string
+
+from gstudio.completion import CompletionIndex
+
+NODES = 1000000
+ROUNDS = 200
+LIMIT = 10
+
+
+def name(generator):
+    """Return a random name of one to three words"""
+    return ' '.join([''.join([generator.choice(string.ascii_lowercase)
+                              for j in range(generator.randint(3, 9))])
+                     for i in range(generator.randint(1, 3))])
+
+
+def nodes(generator):
+    """Iterate over the (id, title, keys, score) of the nodes"""
+    for pk in xrange(NODES):
+        title = name(generator)
+        keys = set([title])
+        if not pk % 4:
+            keys.add(name(generator))
+        yield pk, title, keys, generator.randint(0, 500)
+
+
+def measure(label, function, arguments):
+    """Print the mean time of the function over the arguments"""
+    start = time.time()
+    for argument in arguments:
+        function(argument)
+    elapsed = (time.time() - start) / len(arguments)
+    print '%-28s %9.1f us' % (label, elapsed * 1000000)
+
+
+def main():
+    generator = random.Random(42)
+    start = time.time()
+    index = CompletionIndex(nodes(generator))
+    print '%i names of %i nodes indexed in %.1f s' % (
+        len(index), len(index.keys), time.time() - start)
+
+    for length in range(1, 5):
+        prefixes = [name(generator)[:length] for i in range(ROUNDS)]
+        complete = lambda prefix: index.complete(prefix, LIMIT)
+        measure('prefix of %i, cold blocks' % length, complete, prefixes)
+        measure('prefix of %i, ranked blocks' % length, complete, prefixes)
+
+    measure('update of a node',
+            lambda pk: index.add(pk, 'renamed', set(['renamed']), 0),
+            [generator.randrange(NODES) for i in range(ROUNDS)])
+
+
+if __name__ == '__main__':
+    main()
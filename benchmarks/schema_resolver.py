@@ -0,0 +1,115 @@
+"""Benchmark of the schema resolution of Gstudio
+
+Builds a 10 levels and 10 000 nodes taxonomy of objecttypes in a
+test database, then resolves the attribute types inherited by the
+leaves, first by walking the parents one at a time like the former
+implementation, then with the MPTT schema resolver.
+
+Usage:
+
+  $ DJANGO_SETTINGS_MODULE=gstudio.testsettings \\
+    python benchmarks/schema_resolver.py
+"""
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.db.models.signals import post_save
+
+from gstudio.models import Nodetype
+from gstudio.models import Objecttype
+from gstudio.models import Attributetype
+from gstudio.schema import get_resolver
+from gstudio.signals import disconnect_gstudio_signals
+
+LEVELS = (1, 4, 16, 64, 256, 659, 1000, 2000, 3000, 3000)
+SAMPLE = 200
+
+
+def build_taxonomy():
+    """Create the taxonomy, with one attribute type per inner node,
+    and return the leaves. The nodes are created as roots then
+    linked to their parents, and the tree is rebuilt once."""
+    parents = []
+    for depth, size in enumerate(LEVELS):
+        level = []
+        for i in range(size):
+            # Increasing titles, each root is inserted last
+            slug = 'node-%02d-%05d' % (depth, i)
+            node = Objecttype.objects.create(title=slug, slug=slug,
+                                             content=slug)
+            if depth < len(LEVELS) - 1:
+                Attributetype.objects.create(
+                    title='%s-at' % slug, slug='%s-at' % slug,
+                    content=slug, subjecttype=node)
+            level.append(node.pk)
+        for i, parent in enumerate(parents):
+            Nodetype.objects.filter(pk__in=level[i::len(parents)]).update(
+                parent=parent)
+        transaction.commit()
+        parents = level
+    Objecttype._tree_manager.rebuild()
+    transaction.commit()
+    return Objecttype.objects.filter(pk__in=parents)
+
+
+def parent_walk(node):
+    """The former resolution, one query per ancestor and per step"""
+    ancestors = []
+    parent = node.parent
+    while parent:
+        ancestors.append(parent)
+        parent = parent.parent
+    attributetypes = []
+    for ancestor in ancestors:
+        attributetypes.extend(Attributetype.objects.filter(
+            subjecttype=ancestor.id))
+    return attributetypes
+
+
+def resolver(node):
+    """The resolution with a fresh schema resolver"""
+    get_resolver().clear()
+    return get_resolver().attributetypes(node)
+
+
+def measure(name, resolve, nodes):
+    """Resolve the nodes and print the queries and time spent"""
+    connection.queries = []
+    start = time.time()
+    for node in nodes:
+        resolve(Objecttype.objects.get(pk=node.pk))
+    duration = time.time() - start
+    print '%-12s %6d queries %8.3f s' % (name, len(connection.queries),
+                                          duration)
+
+
+def main():
+    disconnect_gstudio_signals()
+    # The neighbourhoods are not rendered, skip their maintenance
+    post_save.disconnect(dispatch_uid='gstudio.nid.post_save.nbh')
+    old_name = settings.DATABASES['default']['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        transaction.enter_transaction_management()
+        transaction.managed(True)
+        start = time.time()
+        leaves = build_taxonomy()
+        transaction.leave_transaction_management()
+        print 'Taxonomy of %s nodes built in %.1f s' % (
+            sum(LEVELS), time.time() - start)
+
+        settings.DEBUG = True
+        nodes = list(leaves[:SAMPLE])
+        expected = [[at.pk for at in parent_walk(node)] for node in nodes]
+        assert expected == [[at.pk for at in resolver(node)]
+                            for node in nodes]
+        measure('parent walk', parent_walk, nodes)
+        measure('resolver', resolver, nodes)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
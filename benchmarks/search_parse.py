@@ -0,0 +1,80 @@
+"""Benchmark of the parsing of the search patterns of Gstudio
+
+Parses typical and pathological patterns with the former grammar,
+without packrat nor cache, then with the search front-end: first
+on a cold cache, where plain keywords skip the grammar and the
+others are parsed with packrat, then on a warm cache.
+
+Usage:
+
+  $ DJANGO_SETTINGS_MODULE=gstudio.testsettings \\
+    python benchmarks/search_parse.py
+"""
+import time
+
+from pyparsing import ParserElement
+from pyparsing import ParseBaseException
+
+from gstudio import search
+
+# Without packrat the nested patterns take exponential time,
+# each level of parentheses multiplying it by about 4.
+ROUNDS = {'typical': 200, 'pathological': 5}
+PATTERNS = {
+    'typical': ['django', 'gnowledge studio', 'nodetypes of the graph',
+                'content 1 or 2', '"my content" -draft',
+                'author:webmaster tag:gstudio',
+                'metatype:anim* (cat or dog)'],
+    'pathological': ['((((cat))))',
+                     ' or '.join(['word%i' % i for i in range(30)]),
+                     '-(-(-(a and b) or c) and d)',
+                     '(((cat or dog) and mouse) or "bird" ' * 2,
+                     'metatype:"unterminated'],
+    }
+
+
+def former_parse(pattern):
+    """The former parsing, without cache nor fast path"""
+    try:
+        return search.QUERY.parseString(pattern)[0]
+    except (ParseBaseException, ValueError):
+        return search.basic_pattern(pattern)
+
+
+def measure(label, function, patterns):
+    """Print the mean parse time of the patterns"""
+    start = time.time()
+    for i in range(ROUNDS[label]):
+        for pattern in patterns:
+            function(pattern)
+    elapsed = (time.time() - start) / (ROUNDS[label] * len(patterns))
+    print '%-14s %-32s %9.1f us' % (label, function.__doc__.split(',')[0],
+                                    elapsed * 1000000)
+
+
+def cold_parse(pattern):
+    """Front-end on a cold cache, keywords fast path and packrat"""
+    search.PATTERNS.clear()
+    return search.search_pattern(pattern)
+
+
+def warm_parse(pattern):
+    """Front-end on a warm cache"""
+    return search.search_pattern(pattern)
+
+
+def main():
+    for label, patterns in sorted(PATTERNS.items()):
+        ParserElement._packratEnabled = False
+        ParserElement._parse = ParserElement._parseNoCache
+        measure(label, former_parse, patterns)
+        ParserElement._packratEnabled = False
+        ParserElement.enablePackrat()
+        measure(label, cold_parse, patterns)
+        for pattern in patterns:
+            warm_parse(pattern)
+        measure(label, warm_parse, patterns)
+
+
+if __name__ == '__main__':
+    main()
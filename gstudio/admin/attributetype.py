@@ -18,6 +18,8 @@ import reversion
 from gstudio import settings
 from gstudio.managers import HIDDEN
 from gstudio.managers import PUBLISHED
+from gstudio.publication import refresh_live
+from gstudio.publication import redate_nodes
 from gstudio.ping import DirectoryPinger
 from gstudio.admin.forms import AttributetypeAdminForm
 
@@ -224,7 +226,11 @@ types','dataType','verbose_name','null','blank','help_text','max_digits','decima
 
     def make_published(self, request, queryset):
         """Set attributetypes selected as published"""
+        # The queryset may be filtered on the status it changes
+        pks = list(queryset.values_list('pk', flat=True))
+        queryset = queryset.model.objects.filter(pk__in=pks)
         queryset.update(status=PUBLISHED)
+        refresh_live(queryset)
         self.ping_directories(request, queryset, messages=False)
         self.message_user(
             request, _('The selected attributetypes are now marked as published.'))
@@ -232,7 +238,11 @@ types','dataType','verbose_name','null','blank','help_text','max_digits','decima
 
     def make_hidden(self, request, queryset):
         """Set attributetypes selected as hidden"""
+        # The queryset may be filtered on the status it changes
+        pks = list(queryset.values_list('pk', flat=True))
+        queryset = queryset.model.objects.filter(pk__in=pks)
         queryset.update(status=HIDDEN)
+        refresh_live(queryset)
         self.message_user(
             request, _('The selected attributetypes are now marked as hidden.'))
     make_hidden.short_description = _('Set attributetypes selected as hidden')
@@ -271,7 +281,10 @@ types','dataType','verbose_name','null','blank','help_text','max_digits','decima
 
     def put_on_top(self, request, queryset):
         """Put the selected attributetypes on top at the current date"""
-        queryset.update(creation_date=datetime.now())
+        # The queryset may be filtered on the date it changes
+        pks = list(queryset.values_list('pk', flat=True))
+        queryset = queryset.model.objects.filter(pk__in=pks)
+        redate_nodes(queryset, datetime.now())
         self.ping_directories(request, queryset, messages=False)
         self.message_user(request, _(
             'The selected attributetypes are now set at the current date.'))
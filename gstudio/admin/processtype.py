@@ -18,6 +18,8 @@ import reversion
 from gstudio import settings
 from gstudio.managers import HIDDEN
 from gstudio.managers import PUBLISHED
+from gstudio.publication import refresh_live
+from gstudio.publication import redate_nodes
 from gstudio.ping import DirectoryPinger
 from gstudio.admin.forms import ProcesstypeAdminForm
 
@@ -221,7 +223,11 @@ class ProcesstypeAdmin(reversion.VersionAdmin):
 
     def make_published(self, request, queryset):
         """Set processtypes selected as published"""
+        # The queryset may be filtered on the status it changes
+        pks = list(queryset.values_list('pk', flat=True))
+        queryset = queryset.model.objects.filter(pk__in=pks)
         queryset.update(status=PUBLISHED)
+        refresh_live(queryset)
         self.ping_directories(request, queryset, messages=False)
         self.message_user(
             request, _('The selected processtypes are now marked as published.'))
@@ -229,7 +235,11 @@ class ProcesstypeAdmin(reversion.VersionAdmin):
 
     def make_hidden(self, request, queryset):
         """Set processtypes selected as hidden"""
+        # The queryset may be filtered on the status it changes
+        pks = list(queryset.values_list('pk', flat=True))
+        queryset = queryset.model.objects.filter(pk__in=pks)
         queryset.update(status=HIDDEN)
+        refresh_live(queryset)
         self.message_user(
             request, _('The selected processtypes are now marked as hidden.'))
     make_hidden.short_description = _('Set processtypes selected as hidden')
@@ -268,7 +278,10 @@ class ProcesstypeAdmin(reversion.VersionAdmin):
 
     def put_on_top(self, request, queryset):
         """Put the selected processtypes on top at the current date"""
-        queryset.update(creation_date=datetime.now())
+        # The queryset may be filtered on the date it changes
+        pks = list(queryset.values_list('pk', flat=True))
+        queryset = queryset.model.objects.filter(pk__in=pks)
+        redate_nodes(queryset, datetime.now())
         self.ping_directories(request, queryset, messages=False)
         self.message_user(request, _(
             'The selected processtypes are now set at the current date.'))
@@ -17,6 +17,8 @@ import reversion
 from gstudio import settings
 from gstudio.managers import HIDDEN
 from gstudio.managers import PUBLISHED
+from gstudio.publication import refresh_live
+from gstudio.publication import redate_nodes
 from gstudio.ping import DirectoryPinger
 from gstudio.admin.forms import RelationtypeAdminForm
 
@@ -234,7 +236,11 @@ class RelationtypeAdmin(reversion.VersionAdmin):
 
     def make_published(self, request, queryset):
         """Set relationtypes selected as published"""
+        # The queryset may be filtered on the status it changes
+        pks = list(queryset.values_list('pk', flat=True))
+        queryset = queryset.model.objects.filter(pk__in=pks)
         queryset.update(status=PUBLISHED)
+        refresh_live(queryset)
         self.ping_directories(request, queryset, messages=False)
         self.message_user(
             request, _('The selected relationtypes are now marked as published.'))
@@ -242,7 +248,11 @@ class RelationtypeAdmin(reversion.VersionAdmin):
 
     def make_hidden(self, request, queryset):
         """Set relationtypes selected as hidden"""
+        # The queryset may be filtered on the status it changes
+        pks = list(queryset.values_list('pk', flat=True))
+        queryset = queryset.model.objects.filter(pk__in=pks)
         queryset.update(status=HIDDEN)
+        refresh_live(queryset)
         self.message_user(
             request, _('The selected relationtypes are now marked as hidden.'))
     make_hidden.short_description = _('Set relationtypes selected as hidden')
@@ -281,7 +291,10 @@ class RelationtypeAdmin(reversion.VersionAdmin):
 
     def put_on_top(self, request, queryset):
         """Put the selected relationtypes on top at the current date"""
-        queryset.update(creation_date=datetime.now())
+        # The queryset may be filtered on the date it changes
+        pks = list(queryset.values_list('pk', flat=True))
+        queryset = queryset.model.objects.filter(pk__in=pks)
+        redate_nodes(queryset, datetime.now())
         self.ping_directories(request, queryset, messages=False)
         self.message_user(request, _(
             'The selected relationtypes are now set at the current date.'))
@@ -0,0 +1,103 @@
+"""Date archives of the nodetypes of Gstudio
+
+The number of live nodetypes created each day on each site is
+stored in the NodetypeArchive table. The rows of a day are recounted
+when one of its nodetypes is saved, deleted, flipped by the
+publication scheduler or published on other sites, so the calendar,
+the archives widgets and the date based views read the months and
+the days having nodetypes from a table growing with the number of
+days, not with the number of nodetypes."""
+from datetime import time
+from datetime import datetime
+
+from django.db.models import Count
+from django.contrib.sites.models import Site
+
+from gstudio.snapshots import changed
+
+
+def nodetypes_days(nodetypes):
+    """Return the days of creation of the nodetypes"""
+    from gstudio.models import Nodetype
+    return set([creation_date.date() for creation_date in
+                Nodetype.objects.filter(pk__in=list(nodetypes)).values_list(
+                    'creation_date', flat=True)])
+
+
+def update_archives(days):
+    """Recount the live nodetypes created on the days"""
+    from gstudio.models import Nodetype
+    from gstudio.models import NodetypeArchive
+    days = list(set(days))
+    if not days:
+        return
+    NodetypeArchive.objects.filter(day__in=days).delete()
+    for day in days:
+        rows = Nodetype.objects.filter(
+            is_live=True, creation_date__range=(
+                datetime.combine(day, time.min),
+                datetime.combine(day, time.max))).values(
+            'sites').annotate(count=Count('pk')).order_by()
+        for row in rows:
+            if row['sites'] is not None:
+                NodetypeArchive.objects.create(
+                    site_id=row['sites'], day=day, count=row['count'])
+
+
+def rebuild_archives():
+    """Recount the live nodetypes of all the days"""
+    from gstudio.models import Nodetype
+    from gstudio.models import NodetypeArchive
+    NodetypeArchive.objects.all().delete()
+    update_archives([date.date() for date in Nodetype.objects.filter(
+        is_live=True).dates('creation_date', 'day')])
+
+
+def archive_dates(kind, order='ASC', **filters):
+    """Return the first datetimes of the years, months or days
+    having live nodetypes on the current site, optionally
+    filtered by lookups on their day"""
+    from gstudio.models import NodetypeArchive
+    return [datetime(*date.timetuple()[:3]) for date in
+            NodetypeArchive.objects.filter(
+                site=Site.objects.get_current(), **filters).dates(
+                'day', kind, order=order)]
+
+
+def archives_saved(sender, instance, created, previous):
+    """Recount the days of a nodetype saved
+    live or not anymore, or with a new date"""
+    if not created and changed(instance, previous,
+                               'is_live', 'creation_date'):
+        days = set([instance.creation_date.date()])
+        if previous and previous['creation_date']:
+            days.add(previous['creation_date'].date())
+        update_archives(days)
+
+
+def archives_post_delete_handler(sender, **kwargs):
+    """Recount the day of a deleted nodetype"""
+    update_archives([kwargs['instance'].creation_date.date()])
+
+
+def archives_m2m_changed_handler(sender, **kwargs):
+    """Recount the days of the nodetypes published
+    on other sites, from either side"""
+    from gstudio.models import Nodetype
+    instance = kwargs['instance']
+    pk_set = kwargs['pk_set']
+    if isinstance(instance, Nodetype):
+        days = set([instance.creation_date.date()])
+    elif pk_set is not None:
+        days = nodetypes_days(pk_set)
+    else:
+        days = nodetypes_days(instance.nodetypes.values_list(
+            'pk', flat=True))
+
+    # The rows removed are only known before the change
+    if kwargs['action'].startswith('pre_'):
+        instance._archives_days = days
+        return
+    days |= getattr(instance, '_archives_days', set())
+    instance._archives_days = set()
+    update_archives(days)
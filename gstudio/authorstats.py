@@ -0,0 +1,99 @@
+"""Publication statistics of the authors of Gstudio
+
+The number of live nodetypes of each author on each site, with
+the dates of the first and the last of them, are stored in the
+AuthorStats table. The rows of an author are recomputed when one of
+its nodetypes is saved, deleted, flipped by the publication
+scheduler, or when the authors or the sites of a nodetype change,
+so the published authors are listed with a single indexed read."""
+from django.db.models import Max
+from django.db.models import Min
+from django.db.models import Count
+from django.contrib.auth.models import User
+
+from gstudio.snapshots import changed
+
+
+def nodetypes_authors(nodetypes):
+    """Return the ids of the authors of the nodetypes"""
+    from gstudio.models import Nodetype
+    return set(Nodetype.authors.through.objects.filter(
+        nodetype__in=list(nodetypes)).values_list('user', flat=True))
+
+
+def update_author_stats(authors):
+    """Recompute the statistics of the authors"""
+    from gstudio.models import Nodetype
+    from gstudio.models import AuthorStats
+    authors = list(set(authors))
+    if not authors:
+        return
+    AuthorStats.objects.filter(author__in=authors).delete()
+    rows = Nodetype.authors.through.objects.filter(
+        user__in=authors, nodetype__is_live=True).values(
+        'user', 'nodetype__sites').annotate(
+        count=Count('nodetype'), first=Min('nodetype__creation_date'),
+        last=Max('nodetype__creation_date')).order_by()
+    for row in rows:
+        if row['nodetype__sites'] is not None:
+            AuthorStats.objects.create(
+                author_id=row['user'], site_id=row['nodetype__sites'],
+                published_count=row['count'],
+                first_publication=row['first'],
+                last_publication=row['last'])
+
+
+def rebuild_author_stats():
+    """Recompute the statistics of all the authors"""
+    from gstudio.models import Nodetype
+    from gstudio.models import AuthorStats
+    AuthorStats.objects.all().delete()
+    update_author_stats(Nodetype.authors.through.objects.values_list(
+        'user', flat=True).distinct())
+
+
+def author_stats_saved(sender, instance, created, previous):
+    """Update the statistics of the authors of a nodetype
+    saved live or not anymore, or with a new date"""
+    if not created and changed(instance, previous,
+                               'is_live', 'creation_date'):
+        update_author_stats(nodetypes_authors([instance.pk]))
+
+
+def author_stats_pre_delete_handler(sender, **kwargs):
+    """Remember the authors of a nodetype being deleted"""
+    instance = kwargs['instance']
+    instance._author_stats_authors = nodetypes_authors([instance.pk])
+
+
+def author_stats_post_delete_handler(sender, **kwargs):
+    """Update the statistics of the authors of a deleted nodetype"""
+    instance = kwargs['instance']
+    update_author_stats(getattr(instance, '_author_stats_authors', []))
+
+
+def author_stats_m2m_changed_handler(sender, **kwargs):
+    """Update the statistics of the authors concerned by a change
+    of the authors or of the sites of nodetypes, from either side"""
+    from gstudio.models import Nodetype
+    instance = kwargs['instance']
+    pk_set = kwargs['pk_set']
+    if isinstance(instance, User):
+        authors = set([instance.pk])
+    elif sender is Nodetype.authors.through and pk_set is not None:
+        authors = set(pk_set)
+    elif isinstance(instance, Nodetype):
+        authors = nodetypes_authors([instance.pk])
+    elif pk_set is not None:
+        authors = nodetypes_authors(pk_set)
+    else:
+        authors = nodetypes_authors(instance.nodetypes.values_list(
+            'pk', flat=True))
+
+    # The rows removed are only known before the change
+    if kwargs['action'].startswith('pre_'):
+        instance._author_stats_authors = authors
+        return
+    authors |= getattr(instance, '_author_stats_authors', set())
+    instance._author_stats_authors = set()
+    update_author_stats(authors)
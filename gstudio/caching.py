@@ -0,0 +1,121 @@
+"""Caching helpers of Gstudio"""
+from time import time
+from threading import RLock
+from collections import deque
+
+from django.core.cache import cache
+
+# An expired generation makes every process rebuild what it guards,
+# so it is kept for 30 days, the longest timeout memcached takes
+# as a duration.
+GENERATION_TIMEOUT = 60 * 60 * 24 * 30
+# The changes published under the generations of an in-memory index
+# are replayed by the other processes. A process lagging further
+# behind rebuilds its index instead.
+CHANGE_LOG_LENGTH = 1000
+CHANGE_KEY = '%s:change:%s'
+
+
+def get_generation(key):
+    """Return the generation stored at a key, starting it from
+    the current time if it is missing, so a generation restarted
+    after its expiry does not meet the values seen before"""
+    cache.add(key, int(time() * 1000), GENERATION_TIMEOUT)
+    return cache.get(key)
+
+
+def bump_generation(key):
+    """Increment the generation stored at a key and return it"""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        return get_generation(key)
+
+
+def publish_change(key, change):
+    """Bump the generation stored at a key and keep a change
+    under the new generation, for the other processes to replay"""
+    generation = bump_generation(key)
+    if generation is not None:
+        cache.set(CHANGE_KEY % (key, generation), change,
+                  GENERATION_TIMEOUT)
+    return generation
+
+
+def get_changes(key, since, until):
+    """Return the changes published at a key after the generation
+    since and up to the generation until, or None if one of them
+    is missing or if they are too many to replay"""
+    if since is None or until is None or \
+           not 0 <= until - since <= CHANGE_LOG_LENGTH:
+        return None
+    keys = [CHANGE_KEY % (key, generation)
+            for generation in range(since + 1, until + 1)]
+    changes = cache.get_many(keys)
+    if len(changes) < len(keys):
+        return None
+    return [changes[change_key] for change_key in keys]
+
+
+class LRUCache(object):
+    """Mapping keeping its most recently used items
+
+    Each use of a key is appended to a queue, and the items are
+    dropped from the front of the queue when the key has no later
+    use, so the queue is compacted when it grows too long."""
+
+    def __init__(self, size):
+        self.size = size
+        self.items = {}
+        self.uses = {}
+        self.queue = deque()
+        self.lock = RLock()
+
+    def use(self, key):
+        """Mark a key as the most recently used"""
+        self.queue.append(key)
+        self.uses[key] = self.uses.get(key, 0) + 1
+        if len(self.queue) > 4 * max(self.size, 1):
+            keys = []
+            for queued in reversed(self.queue):
+                if self.uses.pop(queued, None):  # Its last use
+                    keys.append(queued)
+            keys.reverse()
+            self.queue = deque(keys)
+            self.uses = dict.fromkeys(keys, 1)
+
+    def get(self, key, default=None):
+        """Return the item of a key and mark it as used"""
+        self.lock.acquire()
+        try:
+            if not key in self.items:
+                return default
+            self.use(key)
+            return self.items[key]
+        finally:
+            self.lock.release()
+
+    def set(self, key, value):
+        """Store an item, dropping the least recently used one"""
+        self.lock.acquire()
+        try:
+            self.items[key] = value
+            self.use(key)
+            while len(self.items) > self.size:
+                old_key = self.queue.popleft()
+                self.uses[old_key] -= 1
+                if not self.uses[old_key]:
+                    del self.uses[old_key]
+                    del self.items[old_key]
+        finally:
+            self.lock.release()
+
+    def clear(self):
+        """Drop all the items"""
+        self.lock.acquire()
+        try:
+            self.items.clear()
+            self.uses.clear()
+            self.queue.clear()
+        finally:
+            self.lock.release()
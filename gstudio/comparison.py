@@ -2,8 +2,36 @@
 Based on clustered_models app"""
 from math import sqrt
 
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import numpy
+    from scipy import sparse
+except ImportError:
+    numpy = sparse = None
+
+from gstudio.caching import get_generation
+from gstudio.caching import bump_generation
 from gstudio.settings import F_MIN
 from gstudio.settings import F_MAX
+from gstudio.settings import SIMILAR_NODETYPES
+from gstudio.settings import SIMILARITY_CACHE_TIMEOUT
+
+# Number of rows correlated at once with the whole matrix,
+# bounding the dense scores to SIMILARITY_CHUNK * rows floats.
+SIMILARITY_CHUNK = 256
+# Number of changed instances vectorized per query.
+REFRESH_CHUNK = 500
+# Number of consecutive ids whose word counts are cached together,
+# keeping each item of the cache far below the 1 MB of memcached.
+STORE_CHUNK = 100
+VERSION_KEY = 'gstudio:similarity:version'
+RELATED_VERSION_KEY = 'gstudio:similarity:related_version'
+STORE_KEY = 'gstudio:similarity:store'
+STORE_CHUNK_KEY = 'gstudio:similarity:store:%s:%s'
+STORE_FIELDS = ['title', 'excerpt', 'content']
+RELATED_KEY = 'gstudio:similarity:related:%s:%s:%s:%s'
 
 
 def pearson_score(list1, list2):
@@ -91,3 +119,334 @@ class VectorBuilder(object):
     def __call__(self):
         self.flush()
         return self.columns, self.dataset
+
+
+def get_similarity_version(key=VERSION_KEY):
+    """Return the version token of the published nodetypes,
+    or of their stored relations, None if the cache is disabled"""
+    return get_generation(key)
+
+
+def bump_similarity_version(key=VERSION_KEY):
+    """Change the version token of the published nodetypes,
+    or of their stored relations"""
+    bump_generation(key)
+
+
+class DocumentStore(object):
+    """Word counts of the instances of a manager,
+    refreshed incrementally from their last update.
+    Shared through the cache by chunks of STORE_CHUNK ids,
+    each chunk stored under the version of its last change."""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.vocabulary = {}
+        self.words = []
+        self.frequencies = []
+        self.documents = {}
+        self.version = None
+        self.chunks = {}
+
+    def add(self, pk, last_update, words):
+        """Count the words of an instance"""
+        counts = {}
+        for word in words.split():
+            counts[word] = counts.get(word, 0) + 1
+        self.add_counts(pk, last_update, counts)
+
+    def add_counts(self, pk, last_update, counts):
+        """Store the {word: count} of an instance"""
+        self.remove(pk)
+        columns = {}
+        for word, count in counts.items():
+            if not word in self.vocabulary:
+                self.vocabulary[word] = len(self.words)
+                self.words.append(word)
+                self.frequencies.append(0)
+            column = self.vocabulary[word]
+            columns[column] = count
+            self.frequencies[column] += 1
+        self.documents[pk] = (last_update, columns)
+
+    def remove(self, pk):
+        """Forget the words of an instance"""
+        last_update, counts = self.documents.pop(pk, (None, {}))
+        for column in counts:
+            self.frequencies[column] -= 1
+
+    def word_counts(self, pk):
+        """Return the {word: count} of an instance"""
+        return dict((self.words[column], count) for column, count
+                    in self.documents[pk][1].items())
+
+    def prune(self):
+        """Number again the columns of the words still counted,
+        once the words of no instance are the most"""
+        used = len([frequency for frequency in self.frequencies
+                    if frequency])
+        if 2 * used >= len(self.frequencies):
+            return
+        documents = [(pk, last_update, self.word_counts(pk))
+                     for pk, (last_update, counts) in self.documents.items()]
+        self.vocabulary = {}
+        self.words = []
+        self.frequencies = []
+        self.documents = {}
+        for pk, last_update, counts in documents:
+            self.add_counts(pk, last_update, counts)
+
+    def dump(self, chunks):
+        """Return the {pk: (last_update, {word: count})}
+        of the instances of each chunk"""
+        dumps = dict((chunk, {}) for chunk in chunks)
+        for pk, (last_update, counts) in self.documents.items():
+            chunk = pk // STORE_CHUNK
+            if chunk in dumps:
+                dumps[chunk][pk] = (last_update, self.word_counts(pk))
+        return dumps
+
+    def refresh(self, manager):
+        """Count the words of the new and updated instances of
+        the manager, forget the removed ones, and return the
+        ids of the instances changed"""
+        version = get_similarity_version()
+        if version is not None and version == self.version:
+            return []
+        queryset = manager.all()
+        last_updates = dict(queryset.values_list('pk', 'last_update'))
+        removed = [pk for pk in self.documents if not pk in last_updates]
+        changed = [pk for pk, last_update in last_updates.items()
+                   if self.documents.get(pk, (None,))[0] != last_update]
+        for pk in removed:
+            self.remove(pk)
+        for start in range(0, len(changed), REFRESH_CHUNK):
+            for values in queryset.filter(
+                pk__in=changed[start:start + REFRESH_CHUNK]).values_list(
+                'pk', 'last_update', *self.fields):
+                self.add(values[0], values[1],
+                         ' '.join([unicode(value) for value in values[2:]]))
+        self.prune()
+        self.version = version
+        return removed + changed
+
+
+class SimilarityEngine(object):
+    """Sparse term matrix of a document store, comparing
+    its rows with the pearson correlation in vectorized passes"""
+
+    def __init__(self, store):
+        if sparse is None:
+            raise ImproperlyConfigured('numpy and scipy modules '
+                                       'are not available')
+        self.store = store
+        self.build_matrix()
+
+    def build_matrix(self):
+        """Put the word counts of the documents in a sparse matrix
+        and precompute the sums and deviations of its rows"""
+        self.ids = sorted(self.store.documents)
+        self.rows = dict((pk, row) for row, pk in enumerate(self.ids))
+        self.columns = {}
+        if not self.ids:
+            self.matrix = sparse.csr_matrix((0, 0))
+            self.sums = self.deviations = numpy.zeros(0)
+            return
+
+        documents = float(len(self.ids))
+        for column, frequency in enumerate(self.store.frequencies):
+            frequency = frequency / documents
+            if frequency > F_MIN and frequency < F_MAX:
+                self.columns[column] = len(self.columns)
+
+        rows, columns, counts = [], [], []
+        for row, pk in enumerate(self.ids):
+            for column, count in self.store.documents[pk][1].items():
+                if column in self.columns:
+                    rows.append(row)
+                    columns.append(self.columns[column])
+                    counts.append(count)
+        self.matrix = sparse.csr_matrix(
+            (numpy.array(counts, dtype=float), (rows, columns)),
+            shape=(len(self.ids), len(self.columns)))
+
+        width = float(len(self.columns) or 1)
+        self.sums = numpy.asarray(self.matrix.sum(axis=1)).ravel()
+        squares = numpy.asarray(
+            self.matrix.multiply(self.matrix).sum(axis=1)).ravel()
+        self.deviations = numpy.sqrt(numpy.maximum(
+            squares - self.sums ** 2 / width, 0.0))
+
+    def correlations(self, rows):
+        """Return the correlations of the rows with every row,
+        NaN where a row has no variance"""
+        width = float(len(self.columns) or 1)
+        products = (self.matrix[rows] * self.matrix.T).toarray()
+        covariances = products - numpy.outer(self.sums[rows],
+                                             self.sums) / width
+        denominators = numpy.outer(self.deviations[rows], self.deviations)
+        scores = numpy.empty(covariances.shape)
+        scores.fill(numpy.nan)
+        comparable = denominators > 0
+        scores[comparable] = covariances[comparable] / \
+                             denominators[comparable]
+        return scores
+
+    def top(self, rows, number):
+        """Return the [(pk, score)] of the number most
+        correlated instances of each row"""
+        scores = self.correlations(rows)
+        scores[numpy.arange(len(rows)), rows] = numpy.nan
+        scores[numpy.isnan(scores)] = -numpy.inf
+        number = min(number, len(self.ids) - 1)
+        if number <= 0:
+            return [[] for row in rows]
+        candidates = numpy.argpartition(-scores, number - 1,
+                                        axis=1)[:, :number]
+        tops = []
+        for i, columns in enumerate(candidates):
+            top = [(self.ids[column], float(scores[i, column]))
+                   for column in columns
+                   if scores[i, column] != -numpy.inf]
+            tops.append(sorted(top, key=lambda (pk, score): (-score, pk)))
+        return tops
+
+    def related(self, pk, number):
+        """Return the [(pk, score)] of the number
+        instances most correlated to an instance"""
+        if not pk in self.rows:
+            return []
+        return self.top([self.rows[pk]], number)[0]
+
+    def all_related(self, number):
+        """Iterate over the (pk, [(pk, score)]) of the number
+        instances most correlated to each instance"""
+        for start in range(0, len(self.ids), SIMILARITY_CHUNK):
+            rows = range(start, min(start + SIMILARITY_CHUNK, len(self.ids)))
+            for row, top in zip(rows, self.top(rows, number)):
+                yield self.ids[row], top
+
+
+def load_document_store(fields):
+    """Return the document store shared through the cache,
+    or None if its list of chunks or one of them is missing"""
+    manifest = cache.get(STORE_KEY)
+    if manifest is None:
+        return None
+    keys = [STORE_CHUNK_KEY % (version, chunk)
+            for chunk, version in manifest['chunks'].items()]
+    chunks = cache.get_many(keys)
+    if len(chunks) < len(keys):
+        return None
+    store = DocumentStore(fields)
+    for chunk in chunks.values():
+        for pk, (last_update, counts) in chunk.items():
+            store.add_counts(pk, last_update, counts)
+    store.version = manifest['version']
+    store.chunks = manifest['chunks']
+    return store
+
+
+def save_document_store(store, pks):
+    """Share through the cache the chunks of the document
+    store holding the given ids, under the version of the store"""
+    values = {}
+    for chunk, documents in store.dump(
+        set([pk // STORE_CHUNK for pk in pks])).items():
+        if documents:
+            values[STORE_CHUNK_KEY % (store.version, chunk)] = documents
+            store.chunks[chunk] = store.version
+        else:
+            store.chunks.pop(chunk, None)
+    cache.set_many(values, SIMILARITY_CACHE_TIMEOUT)
+    cache.set(STORE_KEY, {'version': store.version, 'chunks': store.chunks},
+              SIMILARITY_CACHE_TIMEOUT)
+
+
+def get_similarity_engine():
+    """Return a similarity engine of the published nodetypes,
+    from the document store shared by the processes through the
+    cache, vectorizing only the nodetypes changed since its update"""
+    from gstudio.models import Nodetype
+
+    store = load_document_store(STORE_FIELDS)
+    if store is None:
+        store = DocumentStore(STORE_FIELDS)
+        store.refresh(Nodetype.published)
+        save_document_store(store, store.documents.keys())
+    else:
+        changed = store.refresh(Nodetype.published)
+        if changed:
+            save_document_store(store, changed)
+    return SimilarityEngine(store)
+
+
+def get_related_nodetypes(object_id, number):
+    """Return the published nodetypes related to a nodetype, cached
+    under the versions of the nodetypes and of their relations"""
+    from gstudio.models import Nodetype
+
+    key = RELATED_KEY % (get_similarity_version(),
+                         get_similarity_version(RELATED_VERSION_KEY),
+                         object_id, number)
+    nodetypes = cache.get(key)
+    if nodetypes is None:
+        nodetypes = list(Nodetype.published.filter(
+            related_to__nodetype=object_id).order_by(
+            'related_to__rank')[:number])
+        cache.set(key, nodetypes, SIMILARITY_CACHE_TIMEOUT)
+    return nodetypes
+
+
+def store_related_nodetypes(related):
+    """Replace the related nodetypes stored for the nodetypes
+    of the {nodetype_id: [(related_id, score)]} given"""
+    from gstudio.models import RelatedNodetype
+
+    RelatedNodetype.objects.filter(nodetype__in=related.keys()).delete()
+    for nodetype_id, top in related.items():
+        for rank, (related_id, score) in enumerate(top):
+            RelatedNodetype.objects.create(
+                nodetype_id=nodetype_id, related_id=related_id,
+                score=score, rank=rank)
+    bump_similarity_version(RELATED_VERSION_KEY)
+
+
+def compute_related_nodetypes(nodetype_ids=None, number=SIMILAR_NODETYPES):
+    """Compute and store the related nodetypes of the published
+    nodetypes, or of the given nodetypes only"""
+    from gstudio.models import RelatedNodetype
+
+    engine = get_similarity_engine()
+    if nodetype_ids is None:
+        RelatedNodetype.objects.all().delete()
+        related = {}
+        for nodetype_id, top in engine.all_related(number):
+            related[nodetype_id] = top
+            if len(related) == SIMILARITY_CHUNK:
+                store_related_nodetypes(related)
+                related = {}
+    else:
+        related = dict((nodetype_id, engine.related(nodetype_id, number))
+                       for nodetype_id in nodetype_ids)
+    store_related_nodetypes(related)
+
+
+def similarity_models():
+    """Return the Nodetype model with its subclasses"""
+    from gstudio.models import Nodetype
+
+    models = []
+    pending = [Nodetype]
+    while pending:
+        model = pending.pop(0)
+        if not model in models:
+            models.append(model)
+            pending.extend(model.__subclasses__())
+    return models
+
+
+def similarity_changed_handler(sender, **kwargs):
+    """Change the version token after a nodetype
+    or its sites have been saved or deleted"""
+    bump_similarity_version()
@@ -0,0 +1,275 @@
+"""In-memory prefix index completing the names of the nodes
+
+The titles, alternate names and plurals of the nodes are lowercased
+and kept sorted, in blocks of at most 2 * COMPLETION_BLOCK keys,
+each block also knowing its keys by decreasing score of their node.
+A prefix matches a range of the sorted keys, whose best nodes are
+merged lazily from the few blocks covering it.
+The index is built once per process and on first use, then
+updated in place as the nodes are saved and deleted. Each change
+is also published in the cache under a new generation, so the
+other processes replay the changes they missed on the next use
+of their index, and rebuild it only when some of them are missing."""
+from heapq import merge
+from bisect import insort
+from bisect import bisect_left
+from bisect import bisect_right
+from threading import RLock
+
+from tagging.utils import parse_tag_input
+
+from gstudio.caching import get_changes
+from gstudio.caching import get_generation
+from gstudio.caching import publish_change
+from gstudio.caching import bump_generation
+from gstudio.settings import COMPLETION_LIMIT
+
+COMPLETION_BLOCK = 128
+# Above every character of the basic multilingual plane
+LAST_CHARACTER = u'\uffff'
+GENERATION_KEY = 'gstudio:completion_index:generation'
+
+INDEX = {'index': None, 'generation': None}
+INDEX_LOCK = RLock()
+
+
+def normalize(name):
+    """Return the completion key of a name"""
+    return u' '.join(name.lower().split())
+
+
+def completion_keys(title, altnames, plural):
+    """Return the completion keys of the names of a node"""
+    names = [title, plural] + parse_tag_input(altnames or '')
+    return set([normalize(name) for name in names if name and name.strip()])
+
+
+def node_completion(node):
+    """Return the (title, keys, score) completing a node"""
+    return (node.title, completion_keys(node.title, node.altnames,
+                                        node.plural), node.rating_score)
+
+
+def completion_nodes():
+    """Iterate over the (id, title, keys, score)
+    of the nodes stored in the database"""
+    from gstudio.models import Node
+
+    for pk, title, altnames, plural, score in Node.objects.values_list(
+        'pk', 'title', 'altnames', 'plural', 'rating_score').iterator():
+        yield pk, title, completion_keys(title, altnames, plural), score
+
+
+def completion_models():
+    """Return the models of the nodes, with their subclasses"""
+    from gstudio.models import Node
+
+    models = []
+    pending = [Node]
+    while pending:
+        model = pending.pop(0)
+        if not model in models:
+            models.append(model)
+            pending.extend(model.__subclasses__())
+    return models
+
+
+class CompletionIndex(object):
+    """Sorted blocks of the (key, id) completing the nodes"""
+
+    def __init__(self, nodes=()):
+        self.lock = RLock()
+        self.pack(nodes)
+
+    def pack(self, nodes):
+        """Sort the keys of the (id, title, keys, score) nodes"""
+        self.titles = {}
+        self.scores = {}
+        self.keys = {}
+        entries = []
+        for pk, title, keys, score in nodes:
+            self.titles[pk] = title
+            self.scores[pk] = score or 0
+            self.keys[pk] = tuple(keys)
+            entries.extend([(key, pk) for key in keys])
+        entries.sort()
+        self.blocks = [entries[i:i + COMPLETION_BLOCK] for i in
+                       range(0, len(entries), COMPLETION_BLOCK)] or [[]]
+        self.firsts = [block and block[0] or () for block in self.blocks]
+        self.ranked = [None] * len(self.blocks)
+
+    def __len__(self):
+        return sum([len(block) for block in self.blocks])
+
+    def __contains__(self, pk):
+        return pk in self.keys
+
+    def block_of(self, entry):
+        """Return the position of the block where an entry belongs"""
+        return max(bisect_right(self.firsts, entry) - 1, 0)
+
+    def insert(self, entry):
+        """Insert a (key, id) entry in its block"""
+        i = self.block_of(entry)
+        block = self.blocks[i]
+        insort(block, entry)
+        self.firsts[i] = block[0]
+        self.ranked[i] = None
+        if len(block) > 2 * COMPLETION_BLOCK:
+            self.blocks[i:i + 1] = [block[:COMPLETION_BLOCK],
+                                    block[COMPLETION_BLOCK:]]
+            self.firsts[i:i + 1] = [block[0], block[COMPLETION_BLOCK]]
+            self.ranked[i:i + 1] = [None, None]
+
+    def delete(self, entry):
+        """Delete a (key, id) entry from its block"""
+        i = self.block_of(entry)
+        block = self.blocks[i]
+        j = bisect_left(block, entry)
+        if j == len(block) or block[j] != entry:
+            return
+        del block[j]
+        self.ranked[i] = None
+        if block:
+            self.firsts[i] = block[0]
+        elif len(self.blocks) > 1:
+            del self.blocks[i], self.firsts[i], self.ranked[i]
+        else:
+            self.firsts[i] = ()
+
+    def add(self, pk, title, keys, score):
+        """Add or replace the keys of a node"""
+        with self.lock:
+            self.remove(pk)
+            self.titles[pk] = title
+            self.scores[pk] = score or 0
+            self.keys[pk] = tuple(keys)
+            for key in keys:
+                self.insert((key, pk))
+
+    def remove(self, pk):
+        """Remove the keys of a node"""
+        with self.lock:
+            for key in self.keys.pop(pk, ()):
+                self.delete((key, pk))
+            self.titles.pop(pk, None)
+            self.scores.pop(pk, None)
+
+    def rank(self, i):
+        """Return the (-score, key, id) of the block i
+        by decreasing score"""
+        if self.ranked[i] is None:
+            self.ranked[i] = sorted([(-self.scores[pk], key, pk)
+                                     for key, pk in self.blocks[i]])
+        return self.ranked[i]
+
+    def complete(self, prefix, limit=COMPLETION_LIMIT):
+        """Return the (id, title) of the best nodes
+        having a name starting with the prefix"""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        lowest, highest = (prefix,), (prefix + LAST_CHARACTER,)
+        with self.lock:
+            rankings = []
+            for i in range(self.block_of(lowest), len(self.blocks)):
+                block = self.blocks[i]
+                if not block or block[0] >= highest:
+                    break
+                ranked = self.rank(i)
+                if block[0] < lowest or block[-1] >= highest:
+                    ranked = [entry for entry in ranked
+                              if lowest <= entry[1:] < highest]
+                rankings.append(ranked)
+
+            completions = []
+            seen = set()
+            for score, key, pk in merge(*rankings):
+                if not pk in seen:
+                    seen.add(pk)
+                    completions.append((pk, self.titles[pk]))
+                    if len(completions) == limit:
+                        break
+            return completions
+
+
+def apply_change(index, change):
+    """Apply a (id, completion) change to an index,
+    removing the node if its completion is None"""
+    pk, completion = change
+    if completion is None:
+        index.remove(pk)
+    else:
+        index.add(pk, *completion)
+
+
+def replay_changes(generation):
+    """Apply to the index of the process the changes published
+    up to a generation, or drop the index if some are missing"""
+    with INDEX_LOCK:
+        if INDEX['index'] is None or INDEX['generation'] == generation:
+            return
+        changes = get_changes(GENERATION_KEY, INDEX['generation'],
+                              generation)
+        if changes is None:
+            INDEX['index'] = None
+            return
+        for change in changes:
+            apply_change(INDEX['index'], change)
+        INDEX['generation'] = generation
+
+
+def get_completion_index():
+    """Return the completion index of the process, building it on
+    first use or when the changes of the other processes are missing"""
+    generation = get_generation(GENERATION_KEY)
+    with INDEX_LOCK:
+        replay_changes(generation)
+        if INDEX['index'] is None:
+            INDEX['index'] = CompletionIndex(completion_nodes())
+            INDEX['generation'] = generation
+        return INDEX['index']
+
+
+def rebuild_completion_index():
+    """Rebuild the completion index of the process and ask the
+    other processes to rebuild theirs"""
+    bump_generation(GENERATION_KEY)
+    with INDEX_LOCK:
+        INDEX['generation'] = None
+        return get_completion_index()
+
+
+def completion_index_changed(change):
+    """Publish a (id, completion) change under a new generation
+    of the completion index, and apply it to the index of the
+    process after the changes of the other processes"""
+    generation = publish_change(GENERATION_KEY, change)
+    with INDEX_LOCK:
+        if generation is None and INDEX['index'] is not None:
+            apply_change(INDEX['index'], change)
+        else:
+            replay_changes(generation)
+
+
+def completion_post_init_handler(sender, **kwargs):
+    """Remember the completion of a loaded node"""
+    instance = kwargs['instance']
+    instance._completion = node_completion(instance)
+
+
+def completion_post_save_handler(sender, **kwargs):
+    """Update the completion of a saved node"""
+    instance = kwargs['instance']
+    old_completion = not kwargs['created'] and \
+                     getattr(instance, '_completion', None) or None
+    new_completion = node_completion(instance)
+    instance._completion = new_completion
+    if old_completion == new_completion:
+        return
+    completion_index_changed((instance.pk, new_completion))
+
+
+def completion_post_delete_handler(sender, **kwargs):
+    """Remove the completion of a deleted node"""
+    completion_index_changed((kwargs['instance'].pk, None))
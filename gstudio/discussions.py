@@ -0,0 +1,97 @@
+"""Recent discussions of the nodetypes of Gstudio
+
+The public comments and linkbacks of the nodetypes are listed in
+the Discussion table, with their kind and their submit date, as the
+comments and their flags are saved and deleted. The recent ones are
+read by walking the index of the submit dates, joined to the live
+nodetypes, instead of filtering the comments by the ids of all the
+published nodetypes. Only the DISCUSSIONS_SIZE most recent
+discussions of each kind are kept."""
+from django.contrib import comments
+from django.contrib.sites.models import Site
+from django.contrib.comments.models import CommentFlag
+
+from gstudio.settings import DISCUSSIONS_SIZE
+from gstudio.popularity import nodetype_content_types
+
+COMMENT = 'comment'
+LINKBACK = 'linkback'
+LINKBACK_FLAGS = ('pingback', 'trackback')
+
+
+def discussion_kind(comment):
+    """Return the kind of the discussion of a comment,
+    None if it is not public or not on a nodetype"""
+    if not comment.is_public or not comment.object_pk or \
+           not comment.content_type_id in nodetype_content_types():
+        return None
+    flags = set(comment.flags.values_list('flag', flat=True))
+    if flags.intersection(LINKBACK_FLAGS):
+        return LINKBACK
+    if not flags or CommentFlag.MODERATOR_APPROVAL in flags:
+        return COMMENT
+    return None
+
+
+def trim_discussions(kind, size=DISCUSSIONS_SIZE):
+    """Remove the discussions of a kind older than the size most recent"""
+    from gstudio.models import Discussion
+    discussions = Discussion.objects.filter(kind=kind)
+    oldest = discussions.order_by('-submit_date').values_list(
+        'submit_date', flat=True)[size:size + 1]
+    if oldest:
+        discussions.filter(submit_date__lte=oldest[0]).delete()
+
+
+def update_discussion(comment, trim=True):
+    """List or unlist a comment in the recent discussions"""
+    from gstudio.models import Nodetype
+    from gstudio.models import Discussion
+    Discussion.objects.filter(comment=comment.pk).delete()
+    kind = discussion_kind(comment)
+    if kind is None or not Nodetype.objects.filter(
+        pk=comment.object_pk).exists():
+        return
+    Discussion.objects.create(comment=comment, kind=kind,
+                              nodetype_id=int(comment.object_pk),
+                              submit_date=comment.submit_date)
+    if trim:
+        trim_discussions(kind)
+
+
+def rebuild_discussions(size=DISCUSSIONS_SIZE):
+    """List the size most recent discussions of each kind"""
+    from gstudio.models import Discussion
+    Discussion.objects.all().delete()
+    for comment in comments.get_model().objects.filter(
+        content_type__in=nodetype_content_types(),
+        is_public=True).order_by('-submit_date').iterator():
+        update_discussion(comment, trim=False)
+        if Discussion.objects.filter(kind=COMMENT).count() >= size and \
+               Discussion.objects.filter(kind=LINKBACK).count() >= size:
+            break
+    for kind in (COMMENT, LINKBACK):
+        trim_discussions(kind, size)
+
+
+def recent_discussions(kind, number):
+    """Return the number most recent public comments of a kind
+    on the nodetypes live on the current site"""
+    return comments.get_model().objects.filter(
+        gstudio_discussion__kind=kind,
+        gstudio_discussion__nodetype__is_live=True,
+        gstudio_discussion__nodetype__sites=Site.objects.get_current()
+        ).order_by('-gstudio_discussion__submit_date')[:number]
+
+
+def discussion_post_save_handler(sender, **kwargs):
+    """Update the discussion of a saved comment"""
+    update_discussion(kwargs['instance'])
+
+
+def discussion_flag_changed_handler(sender, **kwargs):
+    """Update the discussion of a comment flagged or unflagged,
+    unless the comment has been deleted with its flags"""
+    for comment in comments.get_model().objects.filter(
+        pk=kwargs['instance'].comment_id):
+        update_discussion(comment)
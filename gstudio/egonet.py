@@ -0,0 +1,159 @@
+"""Egonets of the Gstudio's nodes
+
+The egonet of a node is explored breadth first, following the
+relations, attributes and parent links of the graph index, each hop
+fetching the memberships and the inferred relations of the whole
+frontier at once, and serialized in the node_metadata format of the
+graph viewer."""
+import json
+
+from django.db.models import Q
+
+from gstudio.graphindex import PARENT
+from gstudio.graphindex import FORWARD
+from gstudio.graphindex import BACKWARD
+from gstudio.graphindex import get_graph_index
+from gstudio.settings import GRAPH_MAX_NODES
+from gstudio.settings import GRAPH_MAX_EDGES
+
+SUBTYPES = 'contains_subtypes'
+MEMBERS = 'contains_members'
+# Keeps the frontier lookups under the SQLite variables limit
+FRONTIER_CHUNK = 400
+
+
+def load_labels(labels, known):
+    """Add the (title, slug, is a relation type) of the
+    labels of the graph index missing from known"""
+    from gstudio.models import NID
+    from gstudio.models import Relationtype
+
+    labels = [label for label in labels
+              if label != PARENT and not label in known]
+    if not labels:
+        return
+    relationtypes = set(Relationtype.objects.filter(
+        pk__in=labels).values_list('pk', flat=True))
+    for pk, title, slug in NID.objects.filter(pk__in=labels).values_list(
+        'pk', 'title', 'slug'):
+        known[pk] = (title, slug, pk in relationtypes)
+
+
+def index_edges(frontier, relationtypes=None, labels=None):
+    """Yield the (predicate, from, to) edges of the graph index
+    touching the nodes of the frontier, the attributes from their
+    subject only. labels caches the types of the labels met."""
+    if labels is None:
+        labels = {}
+    index = get_graph_index()
+    edges = []
+    for node in frontier:
+        edges.extend([(label, node, target)
+                      for label, target in index.edges(node, FORWARD)])
+        edges.extend([(label, source, node)
+                      for label, source in index.edges(node, BACKWARD)])
+    load_labels(set([edge[0] for edge in edges]), labels)
+
+    for label, source, target in edges:
+        if label == PARENT:
+            yield SUBTYPES, source, target
+        elif label in labels:
+            title, slug, is_relationtype = labels[label]
+            if is_relationtype:
+                if not relationtypes or slug in relationtypes:
+                    yield title, source, target
+            elif source in frontier:
+                yield title, source, target
+
+
+def frontier_edges(frontier, relationtypes=None, inferred=False,
+                   labels=None):
+    """Yield the (predicate, from, to) edges touching
+    the nodes of the frontier, with the inferred relations
+    if asked"""
+    from gstudio.models import Nodetype
+    from gstudio.models import InferredRelation
+
+    frontier = set(frontier)
+    for edge in index_edges(frontier, relationtypes, labels):
+        yield edge
+
+    frontier = list(frontier)
+    for i in range(0, len(frontier), FRONTIER_CHUNK):
+        ids = frontier[i:i + FRONTIER_CHUNK]
+
+        if inferred:
+            relations = InferredRelation.objects.filter(
+                Q(left_subject__in=ids) | Q(right_subject__in=ids))
+            if relationtypes:
+                relations = relations.filter(
+                    relationtype__slug__in=relationtypes)
+            for edge in relations.values_list('relationtype__title',
+                                              'left_subject', 'right_subject'):
+                yield edge
+
+        for metatype, nodetype in Nodetype.metatypes.through.objects.filter(
+            Q(metatype__in=ids) | Q(nodetype__in=ids)).values_list(
+            'metatype', 'nodetype'):
+            yield MEMBERS, metatype, nodetype
+
+
+def egonet(node, depth=1, relationtypes=None, inferred=False,
+           max_nodes=GRAPH_MAX_NODES, max_edges=GRAPH_MAX_EDGES):
+    """Explore the egonet of a node up to depth hops,
+    within the nodes and edges limits.
+    Return the ids of the nodes met, the node first,
+    and the edges by predicate."""
+    nodes = [node.pk]
+    seen = set(nodes)
+    edges = {}
+    edges_seen = set()
+    frontier = set(nodes)
+    labels = {}
+
+    for hop in range(depth):
+        next_frontier = set()
+        for predicate, source, target in frontier_edges(
+            frontier, relationtypes, inferred, labels):
+            if (predicate, source, target) in edges_seen:
+                continue
+            if len(edges_seen) >= max_edges:
+                break
+            news = [end for end in set([source, target]) if end not in seen]
+            if len(seen) + len(news) > max_nodes:
+                continue
+            nodes.extend(news)
+            seen.update(news)
+            next_frontier.update(news)
+            edges_seen.add((predicate, source, target))
+            edges.setdefault(predicate, []).append(
+                {'from': source, 'to': target, 'value': 1})
+        if not next_frontier or len(edges_seen) >= max_edges:
+            break
+        frontier = next_frontier
+
+    return nodes, edges
+
+
+def node_metadata(ids):
+    """Return the metadata of the nodes, in the order of the ids"""
+    from gstudio.models import NID
+    return [{'_id': str(node.pk), 'title': node.title,
+             'screen_name': node.title, 'url': node.get_absolute_url()}
+            for node in NID.objects.resolve_many(ids)]
+
+
+def iter_egonet_json(nodes, edges):
+    """Yield the compact JSON of an egonet, piece by piece"""
+    dumps = lambda data: json.dumps(data, separators=(',', ':'))
+
+    yield '{"node_metadata":['
+    for i, metadata in enumerate(node_metadata(nodes)):
+        yield (i and ',' or '') + dumps(metadata)
+    yield ']'
+    for predicate, items in edges.items():
+        yield ',%s:[' % dumps(predicate)
+        for i, item in enumerate(items):
+            yield (i and ',' or '') + dumps(item)
+        yield ']'
+    yield '}'
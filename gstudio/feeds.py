@@ -1,6 +1,5 @@
 """Feeds for Gstudio"""
 from urlparse import urljoin
-from BeautifulSoup import BeautifulSoup
 
 from django.contrib.auth.models import User
 from django.contrib.sites.models import Site
@@ -74,9 +73,9 @@ class NodetypeFeed(GstudioFeed):
         if item.image:
             return item.image.url
 
-        img = BeautifulSoup(item.html_content).find('img')
-        if img:
-            return urljoin(self.site_url, img['src'])
+        images = item.rendered_content.images
+        if images:
+            return urljoin(self.site_url, images[0])
 
     def item_enclosure_length(self, item):
         """Hardcoded enclosure length"""
@@ -0,0 +1,140 @@
+"""Cached fragments of the template tags of Gstudio
+
+The HTML rendered by a template tag is stored in the cache with
+the generations of its dependencies, read back while they have not
+changed. A dependency is a model, such as 'metatype' or 'tagusage',
+or one of the nodetypes or users displayed, such as 'nodetype:12'.
+The generations are counters in the cache, incremented by signal
+handlers: a nodetype saved only moves its own counter, unless it
+enters or leaves the listings, by being created, deleted, published,
+unpublished, featured, redated or moved to other sites."""
+from hashlib import md5
+
+from django.db.models import Model
+from django.core.cache import cache
+from django.utils.encoding import smart_str
+from django.utils.translation import get_language
+from django.contrib.auth.models import User
+from django.contrib.sites.models import Site
+
+from gstudio.caching import get_generation
+from gstudio.caching import bump_generation
+from gstudio.settings import FRAGMENT_CACHE_TIMEOUT
+from gstudio.snapshots import changed
+
+FRAGMENT_KEY = 'gstudio:fragment:%s'
+GENERATION_KEY = 'gstudio:fragment:generation:%s'
+TRACKED_FIELDS = ('is_live', 'creation_date', 'featured', 'status')
+
+
+def fragment_models():
+    """Return the models whose saves change all their fragments"""
+    from gstudio.models import Author
+    from gstudio.models import Metatype
+    from gstudio.models import TagUsage
+    from gstudio.models import AuthorStats
+    from gstudio.models import NodetypeArchive
+    return [Metatype, User, Author, AuthorStats, TagUsage, NodetypeArchive]
+
+
+def dependency_label(model):
+    """Return the dependency of a model or of an instance,
+    nodetypes and users being tracked one by one"""
+    from gstudio.models import Nodetype
+    if isinstance(model, Model):
+        model = model.__class__
+    if issubclass(model, Nodetype):
+        return 'nodetype'
+    if issubclass(model, User):
+        return 'user'
+    return model._meta.module_name
+
+
+def instances_dependencies(data):
+    """Return the dependencies on the nodetypes and
+    users displayed in the context of a fragment"""
+    dependencies = set()
+    for value in data.values():
+        if isinstance(value, Model):
+            value = [value]
+        elif isinstance(value, basestring) or \
+                 not hasattr(value, '__iter__'):
+            continue
+        for instance in value:
+            if isinstance(instance, Model) and \
+                   dependency_label(instance) in ('nodetype', 'user'):
+                dependencies.add('%s:%s' % (dependency_label(instance),
+                                            instance.pk))
+    return dependencies
+
+
+def dependencies_generations(dependencies):
+    """Return the {dependency: generation} of the dependencies"""
+    return dict([(dependency, get_generation(GENERATION_KEY % dependency))
+                 for dependency in dependencies])
+
+
+def fragment_key(name, args):
+    """Return the cache key of a fragment for its arguments,
+    the current site and the current language"""
+    return FRAGMENT_KEY % md5(smart_str(repr(
+        (name, Site.objects.get_current().pk, get_language(),
+         args)))).hexdigest()
+
+
+def get_fragment(key):
+    """Return the HTML of a fragment, None if it is
+    not cached or if one of its dependencies changed"""
+    fragment = cache.get(key)
+    if fragment is not None:
+        html, generations = fragment
+        if dependencies_generations(generations.keys()) == generations:
+            return html
+
+
+def render_fragment(name, args, dependencies, render):
+    """Return the HTML of a fragment, rendered by render on a miss.
+    render returns the HTML and the context data of the fragment"""
+    if not FRAGMENT_CACHE_TIMEOUT:
+        return render()[0]
+    key = fragment_key(name, args)
+    html = get_fragment(key)
+    if html is None:
+        generations = dependencies_generations(dependencies)
+        html, data = render()
+        generations.update(dependencies_generations(
+            instances_dependencies(data)))
+        cache.set(key, (html, generations), FRAGMENT_CACHE_TIMEOUT)
+    return html
+
+
+def fragments_saved(sender, instance, created, previous):
+    """Expire the fragments displaying a saved instance, and all
+    the fragments of its model if it enters or leaves the listings"""
+    label = dependency_label(sender)
+    dependencies = ['%s:%s' % (label, instance.pk)]
+    if created or changed(instance, previous, *TRACKED_FIELDS) or \
+           label not in ('nodetype', 'user'):
+        dependencies.append(label)
+    for dependency in dependencies:
+        bump_generation(GENERATION_KEY % dependency)
+
+
+def fragments_post_save_handler(sender, **kwargs):
+    """Expire the fragments of a saved instance
+    of a model without snapshot"""
+    fragments_saved(sender, kwargs['instance'], kwargs.get('created'), None)
+
+
+def fragments_post_delete_handler(sender, **kwargs):
+    """Expire the fragments of the model of a deleted instance"""
+    label = dependency_label(sender)
+    for dependency in (label, '%s:%s' % (label, kwargs['instance'].pk)):
+        bump_generation(GENERATION_KEY % dependency)
+
+
+def fragments_m2m_changed_handler(sender, **kwargs):
+    """Expire the fragments of the nodetypes when their sites,
+    metatypes or authors change"""
+    if kwargs['action'].startswith('post_'):
+        bump_generation(GENERATION_KEY % 'nodetype')
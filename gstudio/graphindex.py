@@ -0,0 +1,350 @@
+"""In-memory adjacency index of the gnowledge graph
+
+The edges of the graph, relations, attributes and parent links,
+are packed in integer arrays in compressed sparse row form,
+once per process and on first use. The changes saved afterwards
+are kept in a delta log applied over the arrays, which are
+repacked when the log grows. Each change is also published in the
+cache under a new generation, so the other processes replay the
+changes they missed on the next use of their index, and rebuild
+it only when some of them are missing."""
+from array import array
+from bisect import bisect_left
+from threading import RLock
+from collections import deque
+
+from gstudio.caching import get_changes
+from gstudio.caching import get_generation
+from gstudio.caching import publish_change
+from gstudio.caching import bump_generation
+from gstudio.settings import GRAPH_INDEX_COMPACT_AFTER
+
+# Label of the edges from a parent to its subtypes,
+# the other labels are the ids of the relation and
+# attribute types, which are never 0.
+PARENT = 0
+FORWARD = 'forward'
+BACKWARD = 'backward'
+BOTH = 'both'
+GENERATION_KEY = 'gstudio:graph_index:generation'
+
+INDEX = {'index': None, 'generation': None}
+INDEX_LOCK = RLock()
+
+
+def graph_edges():
+    """Iterate over the (source, label, target)
+    edges of the gnowledge graph stored in the database"""
+    from gstudio.models import Nodetype
+    from gstudio.models import Metatype
+    from gstudio.models import Relation
+    from gstudio.models import Attribute
+
+    for edge in Relation.objects.values_list(
+        'left_subject', 'relationtype', 'right_subject').iterator():
+        yield edge
+    for edge in Attribute.objects.values_list(
+        'subject', 'attributetype', 'pk').iterator():
+        yield edge
+    for model in (Nodetype, Metatype):
+        for parent, child in model.objects.filter(
+            parent__isnull=False).values_list('parent', 'pk').iterator():
+            yield parent, PARENT, child
+
+
+def graph_edge(instance):
+    """Return the edge stored by an instance, if any"""
+    from gstudio.models import Nodetype
+    from gstudio.models import Metatype
+    from gstudio.models import Relation
+    from gstudio.models import Attribute
+
+    if isinstance(instance, Relation):
+        edge = (instance.left_subject_id, instance.relationtype_id,
+                instance.right_subject_id)
+    elif isinstance(instance, Attribute):
+        edge = (instance.subject_id, instance.attributetype_id, instance.pk)
+    elif isinstance(instance, (Nodetype, Metatype)):
+        edge = (instance.parent_id, PARENT, instance.pk)
+    else:
+        return None
+    if None in edge:
+        return None
+    return edge
+
+
+def graph_models():
+    """Return the models storing edges, with their subclasses"""
+    from gstudio.models import Nodetype
+    from gstudio.models import Metatype
+    from gstudio.models import Relation
+    from gstudio.models import Attribute
+
+    models = []
+    pending = [Nodetype, Metatype, Relation, Attribute]
+    while pending:
+        model = pending.pop(0)
+        if not model in models:
+            models.append(model)
+            pending.extend(model.__subclasses__())
+    return models
+
+
+class CSR(object):
+    """Adjacency lists sorted by source and
+    packed in integer arrays"""
+
+    def __init__(self, edges):
+        self.nodes = array('l')
+        self.offsets = array('l', [0])
+        self.labels = array('l')
+        self.targets = array('l')
+        for source, label, target in sorted(edges):
+            if not self.nodes or self.nodes[-1] != source:
+                if self.nodes:
+                    self.offsets.append(len(self.targets))
+                self.nodes.append(source)
+            self.labels.append(label)
+            self.targets.append(target)
+        if self.nodes:
+            self.offsets.append(len(self.targets))
+
+    def __len__(self):
+        return len(self.targets)
+
+    def __contains__(self, edge):
+        source, label, target = edge
+        return (label, target) in self.edges(source)
+
+    def edges(self, node):
+        """Return the (label, target) edges of a node"""
+        i = bisect_left(self.nodes, node)
+        if i == len(self.nodes) or self.nodes[i] != node:
+            return []
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return zip(self.labels[start:end], self.targets[start:end])
+
+    def __iter__(self):
+        """Iterate over the (source, label, target) edges"""
+        for i, node in enumerate(self.nodes):
+            for j in range(self.offsets[i], self.offsets[i + 1]):
+                yield node, self.labels[j], self.targets[j]
+
+
+class GraphIndex(object):
+    """Traversable index of the gnowledge graph"""
+
+    def __init__(self, edges=()):
+        self.lock = RLock()
+        self.pack(edges)
+
+    def pack(self, edges):
+        """Pack the edges in arrays and empty the delta log"""
+        edges = list(edges)
+        self.forward = CSR(edges)
+        self.backward = CSR([(target, label, source)
+                             for source, label, target in edges])
+        self.added = set()
+        self.added_edges = {FORWARD: {}, BACKWARD: {}}
+        self.removed = set()
+        self.log = []
+
+    def compact(self):
+        """Apply the delta log to the arrays"""
+        with self.lock:
+            self.pack(self.iter_edges())
+
+    def iter_edges(self):
+        """Iterate over the current edges"""
+        for edge in self.forward:
+            if not edge in self.removed:
+                yield edge
+        for edge in self.added:
+            yield edge
+
+    def __len__(self):
+        return len(self.forward) - len(self.removed) + len(self.added)
+
+    def record(self, operation, edge):
+        """Append an addition '+' or a removal '-'
+        of an edge to the delta log, and apply it.
+        A change already applied is ignored."""
+        with self.lock:
+            self.log.append((operation, edge))
+            source, label, target = edge
+            forward = self.added_edges[FORWARD].setdefault(source, set())
+            backward = self.added_edges[BACKWARD].setdefault(target, set())
+            if operation == '+':
+                if edge in self.removed:
+                    self.removed.discard(edge)
+                elif not edge in self.added and not edge in self.forward:
+                    self.added.add(edge)
+                    forward.add((label, target))
+                    backward.add((label, source))
+            elif edge in self.added:
+                self.added.discard(edge)
+                forward.discard((label, target))
+                backward.discard((label, source))
+            elif edge in self.forward:
+                self.removed.add(edge)
+            if len(self.log) > GRAPH_INDEX_COMPACT_AFTER:
+                self.compact()
+
+    def edges(self, node, direction=FORWARD):
+        """Return the (label, neighbour) edges of a node"""
+        if direction == BOTH:
+            return self.edges(node, FORWARD) + self.edges(node, BACKWARD)
+        csr = direction == FORWARD and self.forward or self.backward
+        edges = [(label, target) for label, target in csr.edges(node)]
+        if self.removed:
+            edges = [(label, neighbour) for label, neighbour in edges
+                     if not self.as_edge(node, label, neighbour,
+                                         direction) in self.removed]
+        edges.extend(self.added_edges[direction].get(node, ()))
+        return edges
+
+    def as_edge(self, node, label, neighbour, direction):
+        """Return the stored edge of a neighbour"""
+        if direction == FORWARD:
+            return node, label, neighbour
+        return neighbour, label, node
+
+    def neighbours(self, node, labels=None, direction=BOTH):
+        """Return the ids of the neighbours of a node,
+        optionally along the given labels only"""
+        neighbours = []
+        seen = set()
+        for label, neighbour in self.edges(node, direction):
+            if (labels is None or label in labels) and \
+                   not neighbour in seen:
+                seen.add(neighbour)
+                neighbours.append(neighbour)
+        return neighbours
+
+    def expand(self, node, hops, labels=None, direction=BOTH):
+        """Return the nodes at most hops away from
+        the node, with their distance"""
+        distances = {node: 0}
+        frontier = [node]
+        for hop in range(1, hops + 1):
+            if not frontier:
+                break
+            next_frontier = []
+            for current in frontier:
+                for neighbour in self.neighbours(current, labels, direction):
+                    if not neighbour in distances:
+                        distances[neighbour] = hop
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        return distances
+
+    def shortest_path(self, source, target, labels=None, direction=BOTH):
+        """Return the ids on a shortest path from
+        source to target, or None if unreachable"""
+        parents = {source: None}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if current == target:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = parents[current]
+                return path[::-1]
+            for neighbour in self.neighbours(current, labels, direction):
+                if not neighbour in parents:
+                    parents[neighbour] = current
+                    queue.append(neighbour)
+        return None
+
+    def closure(self, node, relationtype, direction=FORWARD):
+        """Return the ids reached from a node through the relation
+        type, transitively if the relation type is transitive"""
+        labels = set([relationtype.pk])
+        if not relationtype.is_transitive:
+            return self.neighbours(node, labels, direction)
+        reached = self.expand(node, len(self) + 1, labels, direction)
+        del reached[node]
+        return sorted(reached, key=reached.get)
+
+
+def replay_changes(generation):
+    """Apply to the index of the process the changes published
+    up to a generation, or drop the index if some are missing"""
+    with INDEX_LOCK:
+        if INDEX['index'] is None or INDEX['generation'] == generation:
+            return
+        changes = get_changes(GENERATION_KEY, INDEX['generation'],
+                              generation)
+        if changes is None:
+            INDEX['index'] = None
+            return
+        for change in changes:
+            for operation, edge in change:
+                INDEX['index'].record(operation, edge)
+        INDEX['generation'] = generation
+
+
+def get_graph_index():
+    """Return the graph index of the process, building it on first
+    use or when the changes of the other processes are missing"""
+    generation = get_generation(GENERATION_KEY)
+    with INDEX_LOCK:
+        replay_changes(generation)
+        if INDEX['index'] is None:
+            INDEX['index'] = GraphIndex(graph_edges())
+            INDEX['generation'] = generation
+        return INDEX['index']
+
+
+def rebuild_graph_index():
+    """Rebuild the graph index of the process and ask the
+    other processes to rebuild theirs"""
+    bump_generation(GENERATION_KEY)
+    with INDEX_LOCK:
+        INDEX['generation'] = None
+        return get_graph_index()
+
+
+def graph_index_changed(change):
+    """Publish the ('+' or '-', edge) operations of a change under
+    a new generation of the graph index, and apply them to the index
+    of the process after the changes of the other processes"""
+    generation = publish_change(GENERATION_KEY, change)
+    with INDEX_LOCK:
+        if generation is None and INDEX['index'] is not None:
+            for operation, edge in change:
+                INDEX['index'].record(operation, edge)
+        else:
+            replay_changes(generation)
+
+
+def graph_post_init_handler(sender, **kwargs):
+    """Remember the edge stored by a loaded instance"""
+    instance = kwargs['instance']
+    instance._graph_edge = graph_edge(instance)
+
+
+def graph_post_save_handler(sender, **kwargs):
+    """Log the edge changes of a saved instance"""
+    instance = kwargs['instance']
+    old_edge = not kwargs['created'] and \
+               getattr(instance, '_graph_edge', None) or None
+    new_edge = graph_edge(instance)
+    instance._graph_edge = new_edge
+    if old_edge == new_edge:
+        return
+    change = []
+    if old_edge:
+        change.append(('-', old_edge))
+    if new_edge:
+        change.append(('+', new_edge))
+    graph_index_changed(change)
+
+
+def graph_post_delete_handler(sender, **kwargs):
+    """Log the removal of the edge of a deleted instance"""
+    instance = kwargs['instance']
+    edge = getattr(instance, '_graph_edge', None)
+    if edge:
+        graph_index_changed([('-', edge)])
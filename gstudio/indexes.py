@@ -0,0 +1,75 @@
+"""Composite indexes of the hot lookups of Gstudio
+
+Django cannot declare an index over several columns, so the
+indexes are listed here, created by the 0002 migration with South
+and by the post_syncdb handler when the tables are created."""
+from django.db import transaction
+from django.db import connections
+from django.db import DEFAULT_DB_ALIAS
+
+INDEXES = (
+    # Relations of a node, by relation type
+    ('gstudio_relation', ('left_subject_id', 'relationtype_id')),
+    ('gstudio_relation', ('right_subject_id', 'relationtype_id')),
+    # Attributes of a node, by attribute type
+    ('gstudio_attribute', ('subject_id', 'attributetype_id')),
+    # Publication windows, scanned by gstudio.publication
+    ('gstudio_nodetype', ('status', 'start_publication', 'end_publication')),
+    # Nodes by name, for gnowql.get_node
+    ('gstudio_nid', ('title',)),
+    # Nodes by date and slug, for protect_nodetype and the pingbacks
+    ('gstudio_nid', ('slug', 'creation_date')),
+    # Date based archives
+    ('gstudio_nid', ('creation_date',)),
+    )
+
+
+def index_name(table, columns):
+    """Return the name of the index of the columns of a table"""
+    return '%s_%s' % (table, '_'.join(
+        [column.endswith('_id') and column[:-3] or column
+         for column in columns]))
+
+
+def index_sql(table, columns, using=DEFAULT_DB_ALIAS):
+    """Return the SQL creating the index of the columns of a table"""
+    quote_name = connections[using].ops.quote_name
+    return 'CREATE INDEX %s ON %s (%s)' % (
+        quote_name(index_name(table, columns)), quote_name(table),
+        ', '.join([quote_name(column) for column in columns]))
+
+
+def index_exists(table, name, using=DEFAULT_DB_ALIAS):
+    """Tell if a table has an index of this name"""
+    connection = connections[using]
+    cursor = connection.cursor()
+    if connection.vendor == 'sqlite':
+        cursor.execute('SELECT 1 FROM sqlite_master WHERE type = %s '
+                       'AND tbl_name = %s AND name = %s',
+                       ['index', table, name])
+    elif connection.vendor == 'postgresql':
+        cursor.execute('SELECT 1 FROM pg_indexes WHERE tablename = %s '
+                       'AND indexname = %s', [table, name])
+    elif connection.vendor == 'mysql':
+        cursor.execute('SHOW INDEX FROM %s WHERE Key_name = %%s' % \
+                       connection.ops.quote_name(table), [name])
+    else:
+        return False
+    return bool(cursor.fetchall())
+
+
+def create_indexes_handler(sender, **kwargs):
+    """Create the indexes of the tables of Gstudio created
+    by syncdb, or by the migrations when the 0002 migration
+    has not created them already"""
+    if kwargs['app'].__name__ != 'gstudio.models':
+        return  # Sent once per application
+    using = kwargs.get('db', DEFAULT_DB_ALIAS)
+    tables = [model._meta.db_table
+              for model in kwargs.get('created_models', [])]
+    cursor = connections[using].cursor()
+    for table, columns in INDEXES:
+        if table in tables and \
+               not index_exists(table, index_name(table, columns), using):
+            cursor.execute(index_sql(table, columns, using))
+    transaction.commit_unless_managed(using=using)
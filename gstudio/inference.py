@@ -0,0 +1,199 @@
+"""Inference of the relations of Gstudio
+
+The relations holding by the symmetry or the transitivity of their
+relation type are materialized in the InferredRelation table.
+The table is maintained incrementally as relations are saved
+and deleted: an added relation only joins the predecessors of its
+left subject to the successors of its right subject, a removed one
+only rederives the closure of the subjects which could reach it."""
+from django.db.models import Q
+
+
+def is_inferred(relationtype):
+    """Tell if the relations of a relation type are inferred"""
+    return bool(relationtype.is_symmetrical or relationtype.is_transitive)
+
+
+def explicit_successors(relationtype, nodes):
+    """Return the {node: successors} of the nodes through
+    the stored relations of the relation type"""
+    from gstudio.models import Relation
+    successors = dict((node, set()) for node in nodes)
+    relations = Relation.objects.filter(relationtype=relationtype)
+    lookup = Q(left_subject__in=nodes)
+    if relationtype.is_symmetrical:
+        lookup |= Q(right_subject__in=nodes)
+    for left, right in relations.filter(lookup).values_list(
+        'left_subject', 'right_subject'):
+        if left in successors:
+            successors[left].add(right)
+        if relationtype.is_symmetrical and right in successors:
+            successors[right].add(left)
+    return successors
+
+
+def derive(relationtype, sources):
+    """Return the {source: subjects} inferred from the sources,
+    exploring the stored relations one hop at a time"""
+    reached = dict((source, set()) for source in sources)
+    adjacency = {}
+    frontiers = dict((source, set([source])) for source in sources)
+    while frontiers:
+        unknown = set()
+        for frontier in frontiers.values():
+            unknown.update(frontier - set(adjacency))
+        if unknown:
+            adjacency.update(explicit_successors(relationtype, unknown))
+        next_frontiers = {}
+        for source, frontier in frontiers.items():
+            news = set()
+            for node in frontier:
+                news.update(adjacency[node])
+            if not relationtype.is_transitive:
+                reached[source] = news
+                continue
+            news -= reached[source]
+            reached[source].update(news)
+            if news:
+                next_frontiers[source] = news
+        frontiers = next_frontiers
+    return reached
+
+
+def inferred_pairs(relationtype, lookup):
+    """Return the (left, right) pairs of the inferred
+    relations of the relation type matching the lookup"""
+    from gstudio.models import InferredRelation
+    return set(InferredRelation.objects.filter(
+        lookup, relationtype=relationtype).values_list(
+        'left_subject', 'right_subject'))
+
+
+def store_pairs(relationtype, pairs):
+    """Store the inferred relations of the (left, right) pairs"""
+    from gstudio.models import InferredRelation
+    for left, right in pairs:
+        InferredRelation.objects.create(left_subject_id=left,
+                                        relationtype=relationtype,
+                                        right_subject_id=right)
+
+
+def relation_added(relationtype, left, right):
+    """Infer the relations following from a new one"""
+    if not is_inferred(relationtype):
+        return
+    edges = [(left, right)]
+    if relationtype.is_symmetrical:
+        edges.append((right, left))
+
+    for left, right in edges:
+        lefts, rights = set([left]), set([right])
+        if relationtype.is_transitive:
+            lefts.update([pair[0] for pair in inferred_pairs(
+                relationtype, Q(right_subject=left))])
+            rights.update([pair[1] for pair in inferred_pairs(
+                relationtype, Q(left_subject=right))])
+        existing = inferred_pairs(relationtype, Q(left_subject__in=lefts,
+                                                  right_subject__in=rights))
+        store_pairs(relationtype, set([(l, r) for l in lefts
+                                       for r in rights]) - existing)
+
+
+def relation_removed(relationtype, left, right):
+    """Rederive the relations which could follow
+    from a removed one"""
+    if not is_inferred(relationtype):
+        return
+    from gstudio.models import InferredRelation
+
+    sources = set([left])
+    if relationtype.is_symmetrical:
+        sources.add(right)
+    if relationtype.is_transitive:
+        sources.update([pair[0] for pair in inferred_pairs(
+            relationtype, Q(right_subject__in=sources))])
+
+    for source, subjects in derive(relationtype, sources).items():
+        existing = set([pair[1] for pair in inferred_pairs(
+            relationtype, Q(left_subject=source))])
+        InferredRelation.objects.filter(
+            relationtype=relationtype, left_subject=source,
+            right_subject__in=existing - subjects).delete()
+        store_pairs(relationtype, [(source, subject) for subject
+                                   in subjects - existing])
+
+
+def rebuild_inferred_relations(relationtype):
+    """Recompute all the inferred relations of a relation type"""
+    from gstudio.models import Relation
+    from gstudio.models import InferredRelation
+
+    InferredRelation.objects.filter(relationtype=relationtype).delete()
+    if not is_inferred(relationtype):
+        return
+    sources = set()
+    for left, right in Relation.objects.filter(
+        relationtype=relationtype).values_list('left_subject',
+                                               'right_subject'):
+        sources.add(left)
+        if relationtype.is_symmetrical:
+            sources.add(right)
+    for source, subjects in derive(relationtype, sources).items():
+        store_pairs(relationtype, [(source, subject)
+                                   for subject in subjects])
+
+
+def relation_edge(relation):
+    """Return the (relationtype, left, right) of a relation"""
+    return (relation.relationtype_id, relation.left_subject_id,
+            relation.right_subject_id)
+
+
+def inference_post_init_handler(sender, **kwargs):
+    """Remember the loaded relation, or the flags
+    of the loaded relation type"""
+    from gstudio.models import Relation
+    instance = kwargs['instance']
+    if isinstance(instance, Relation):
+        instance._inference_edge = relation_edge(instance)
+    else:
+        instance._inference_flags = (instance.is_symmetrical,
+                                     instance.is_transitive)
+
+
+def inference_post_save_handler(sender, **kwargs):
+    """Update the inferred relations after the save
+    of a relation or of a relation type"""
+    from gstudio.models import Relation
+    from gstudio.models import Relationtype
+    instance = kwargs['instance']
+
+    if isinstance(instance, Relation):
+        old_edge = not kwargs['created'] and \
+                   getattr(instance, '_inference_edge', None) or None
+        new_edge = relation_edge(instance)
+        instance._inference_edge = new_edge
+        if old_edge == new_edge:
+            return
+        if old_edge and not None in old_edge:
+            relation_removed(Relationtype.objects.get(pk=old_edge[0]),
+                             *old_edge[1:])
+        relation_added(instance.relationtype, *new_edge[1:])
+    else:
+        old_flags = getattr(instance, '_inference_flags', (None, None))
+        instance._inference_flags = (instance.is_symmetrical,
+                                     instance.is_transitive)
+        if map(bool, old_flags) != map(bool, instance._inference_flags):
+            rebuild_inferred_relations(instance)
+
+
+def inference_post_delete_handler(sender, **kwargs):
+    """Rederive the inferred relations after
+    the deletion of a relation"""
+    from gstudio.models import Relationtype
+    relationtype_id, left, right = kwargs['instance']._inference_edge
+    try:
+        relationtype = Relationtype.objects.get(pk=relationtype_id)
+    except Relationtype.DoesNotExist:
+        return
+    relation_removed(relationtype, left, right)
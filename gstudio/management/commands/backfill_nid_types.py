@@ -0,0 +1,36 @@
+"""Backfill command module for the types of Gstudio's nodes"""
+from django.db.models import get_models
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import NoArgsCommand
+
+from gstudio.models import NID
+
+
+class Command(NoArgsCommand):
+    """Command object for recording the concrete
+    model of the nodes saved without it"""
+    help = 'Record the concrete model of the nodes missing it.'
+
+    def handle_noargs(self, **options):
+        verbosity = int(options.get('verbosity', 1))
+
+        # The deepest models first, a node belongs to the
+        # tables of all its ancestor models
+        models = [model for model in get_models()
+                  if issubclass(model, NID) and not model._meta.proxy]
+        models.sort(key=lambda model: len(model._meta.get_parent_list()),
+                    reverse=True)
+
+        nodes_count = 0
+        for model in models:
+            content_type = ContentType.objects.get_for_model(model)
+            count = NID.objects.filter(
+                content_type__isnull=True,
+                pk__in=model._base_manager.values('pk')).update(
+                content_type=content_type)
+            nodes_count += count
+            if verbosity > 1 and count:
+                print '%i %s typed.' % (count, model._meta.verbose_name)
+
+        if verbosity:
+            print '%i nodes typed.' % nodes_count
@@ -0,0 +1,32 @@
+"""Compaction command module for the popularity of Gstudio's nodetypes"""
+from optparse import make_option
+
+from django.core.management.base import NoArgsCommand
+
+from gstudio.models import NodetypePopularity
+from gstudio.popularity import compact_popularity
+from gstudio.popularity import rebuild_popularity
+
+
+class Command(NoArgsCommand):
+    """Command object for recounting the comments of the
+    nodetypes over the last day and the last week"""
+    help = 'Remove the old comments from the popularity of the nodetypes.'
+
+    option_list = NoArgsCommand.option_list + (
+        make_option('--rebuild', action='store_true', dest='rebuild',
+                    default=False,
+                    help='Recount all the comments of the nodetypes.'),
+        )
+
+    def handle_noargs(self, **options):
+        verbosity = int(options.get('verbosity', 1))
+
+        if options.get('rebuild'):
+            rebuild_popularity()
+        else:
+            compact_popularity()
+
+        if verbosity:
+            print '%i nodetypes commented.' % \
+                  NodetypePopularity.objects.count()
@@ -0,0 +1,26 @@
+"""Compute command module for Gstudio's related nodetypes"""
+from django.db import transaction
+from django.core.management.base import NoArgsCommand
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import CommandError
+
+from gstudio.models import RelatedNodetype
+from gstudio.comparison import compute_related_nodetypes
+
+
+class Command(NoArgsCommand):
+    """Command object for storing the nodetypes
+    similar to each published nodetype"""
+    help = 'Compute the similar nodetypes of the published nodetypes.'
+
+    @transaction.commit_on_success
+    def handle_noargs(self, **options):
+        verbosity = int(options.get('verbosity', 1))
+
+        try:
+            compute_related_nodetypes()
+        except ImproperlyConfigured, error:
+            raise CommandError(error)
+
+        if verbosity:
+            print '%i related nodetypes.' % RelatedNodetype.objects.count()
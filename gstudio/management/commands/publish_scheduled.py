@@ -0,0 +1,45 @@
+"""Scheduler command module for the publication of Gstudio's nodes"""
+import time
+from datetime import datetime
+from optparse import make_option
+
+from django.core.management.base import NoArgsCommand
+
+from gstudio.publication import update_live
+from gstudio.publication import next_transition
+from gstudio.settings import PUBLICATION_INTERVAL
+
+
+class Command(NoArgsCommand):
+    """Command object flipping the is_live flags of the nodetypes
+    and gbobjects entering or leaving their publication window"""
+    help = 'Publish and unpublish the nodes at the dates scheduled.'
+
+    option_list = NoArgsCommand.option_list + (
+        make_option('--daemon', action='store_true', dest='daemon',
+                    default=False,
+                    help='Keep running, waking up at each publication date.'),
+        )
+
+    def handle_noargs(self, **options):
+        verbosity = int(options.get('verbosity', 1))
+
+        while True:
+            now = datetime.now()
+            flipped = update_live(now)
+            if verbosity and (flipped or not options.get('daemon')):
+                print '%s: %i nodes published or unpublished.' % (
+                    now.strftime('%Y-%m-%d %H:%M:%S'), flipped)
+            if not options.get('daemon'):
+                break
+            time.sleep(self.delay(next_transition(now)))
+
+    def delay(self, transition):
+        """Return the seconds to sleep until a transition,
+        at most PUBLICATION_INTERVAL"""
+        if transition is None:
+            return PUBLICATION_INTERVAL
+        delta = transition - datetime.now()
+        seconds = delta.days * 86400 + delta.seconds + \
+                  delta.microseconds / 1000000.0
+        return min(max(seconds, 0), PUBLICATION_INTERVAL)
@@ -0,0 +1,19 @@
+"""Rebuild command module for Gstudio's date archives"""
+from django.core.management.base import NoArgsCommand
+
+from gstudio.models import NodetypeArchive
+from gstudio.archives import rebuild_archives
+
+
+class Command(NoArgsCommand):
+    """Command object for recounting the live
+    nodetypes created each day on each site"""
+    help = 'Recompute the date archives of the nodetypes.'
+
+    def handle_noargs(self, **options):
+        verbosity = int(options.get('verbosity', 1))
+
+        rebuild_archives()
+
+        if verbosity:
+            print '%i days archived.' % NodetypeArchive.objects.count()
@@ -0,0 +1,19 @@
+"""Rebuild command module for Gstudio's author statistics"""
+from django.core.management.base import NoArgsCommand
+
+from gstudio.models import AuthorStats
+from gstudio.authorstats import rebuild_author_stats
+
+
+class Command(NoArgsCommand):
+    """Command object for recounting the live
+    nodetypes of the authors on each site"""
+    help = 'Recompute the publication statistics of the authors.'
+
+    def handle_noargs(self, **options):
+        verbosity = int(options.get('verbosity', 1))
+
+        rebuild_author_stats()
+
+        if verbosity:
+            print '%i author statistics.' % AuthorStats.objects.count()
@@ -0,0 +1,22 @@
+"""Rebuild command module for Gstudio's completion index"""
+from time import time
+
+from django.core.management.base import NoArgsCommand
+
+from gstudio.completion import rebuild_completion_index
+
+
+class Command(NoArgsCommand):
+    """Command object for rebuilding the in-memory
+    completion index of the running processes"""
+    help = 'Rebuild the completion index, in all the running processes.'
+
+    def handle_noargs(self, **options):
+        verbosity = int(options.get('verbosity', 1))
+
+        start = time()
+        index = rebuild_completion_index()
+
+        if verbosity:
+            print '%i names of %i nodes indexed in %.2f seconds.' % (
+                len(index), len(index.keys), time() - start)
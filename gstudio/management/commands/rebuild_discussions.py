@@ -0,0 +1,19 @@
+"""Rebuild command module for Gstudio's recent discussions"""
+from django.core.management.base import NoArgsCommand
+
+from gstudio.models import Discussion
+from gstudio.discussions import rebuild_discussions
+
+
+class Command(NoArgsCommand):
+    """Command object for listing the most recent
+    comments and linkbacks of the nodetypes"""
+    help = 'List the recent discussions of the nodetypes again.'
+
+    def handle_noargs(self, **options):
+        verbosity = int(options.get('verbosity', 1))
+
+        rebuild_discussions()
+
+        if verbosity:
+            print '%i discussions listed.' % Discussion.objects.count()
@@ -0,0 +1,23 @@
+"""Rebuild command module for Gstudio's graph index"""
+from time import time
+
+from django.core.management.base import NoArgsCommand
+
+from gstudio.graphindex import rebuild_graph_index
+
+
+class Command(NoArgsCommand):
+    """Command object for rebuilding the in-memory
+    graph index of the running processes"""
+    help = 'Rebuild the graph index, in all the running processes.'
+
+    def handle_noargs(self, **options):
+        verbosity = int(options.get('verbosity', 1))
+
+        start = time()
+        index = rebuild_graph_index()
+
+        if verbosity:
+            print '%i edges between %i nodes indexed in %.2f seconds.' % (
+                len(index), len(set(index.forward.nodes) |
+                                set(index.backward.nodes)), time() - start)
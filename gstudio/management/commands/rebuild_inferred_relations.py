@@ -0,0 +1,21 @@
+"""Rebuild command module for Gstudio's inferred relations"""
+from django.core.management.base import NoArgsCommand
+
+from gstudio.models import Relationtype
+from gstudio.models import InferredRelation
+from gstudio.inference import rebuild_inferred_relations
+
+
+class Command(NoArgsCommand):
+    """Command object for recomputing the relations
+    inferred from the symmetric and transitive relation types"""
+    help = 'Recompute the relations inferred by symmetry and transitivity.'
+
+    def handle_noargs(self, **options):
+        verbosity = int(options.get('verbosity', 1))
+
+        for relationtype in Relationtype.objects.all():
+            rebuild_inferred_relations(relationtype)
+
+        if verbosity:
+            print '%i inferred relations.' % InferredRelation.objects.count()
@@ -0,0 +1,19 @@
+"""Rebuild command module for Gstudio's search index"""
+from django.core.management.base import NoArgsCommand
+
+from gstudio.models import SearchDocument
+from gstudio.searchindex import rebuild_search_index
+
+
+class Command(NoArgsCommand):
+    """Command object for indexing all the
+    nodetypes and gbobjects for the search"""
+    help = 'Rebuild the inverted index of the search.'
+
+    def handle_noargs(self, **options):
+        verbosity = int(options.get('verbosity', 1))
+
+        rebuild_search_index()
+
+        if verbosity:
+            print '%i nodes indexed.' % SearchDocument.objects.count()
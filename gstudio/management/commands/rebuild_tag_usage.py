@@ -0,0 +1,19 @@
+"""Rebuild command module for Gstudio's tag usage"""
+from django.core.management.base import NoArgsCommand
+
+from gstudio.models import TagUsage
+from gstudio.tagusage import rebuild_tag_usage
+
+
+class Command(NoArgsCommand):
+    """Command object for recounting the live
+    nodetypes and gbobjects of the tags on each site"""
+    help = 'Recompute the usage of the tags by the live nodes.'
+
+    def handle_noargs(self, **options):
+        verbosity = int(options.get('verbosity', 1))
+
+        rebuild_tag_usage()
+
+        if verbosity:
+            print '%i tag usages.' % TagUsage.objects.count()
@@ -0,0 +1,18 @@
+"""Rebuild command module for Gstudio's tree paths"""
+from django.core.management.base import NoArgsCommand
+
+from gstudio.treepaths import rebuild_tree_paths
+
+
+class Command(NoArgsCommand):
+    """Command object for recomputing the stored
+    tree paths of the metatypes and nodetypes"""
+    help = 'Recompute the tree paths of the metatypes and nodetypes.'
+
+    def handle_noargs(self, **options):
+        verbosity = int(options.get('verbosity', 1))
+
+        count = rebuild_tree_paths()
+
+        if verbosity:
+            print '%i tree paths updated.' % count
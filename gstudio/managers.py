@@ -1,6 +1,4 @@
 """Managers of gstudio"""
-from datetime import datetime
-
 from django.db import models
 from django.contrib.sites.models import Site
 
@@ -10,37 +8,64 @@ PUBLISHED = 2
 
 
 def tags_published():
-    """Return the published tags"""
-    from tagging.models import Tag
+    """Return the published tags, as counted by gstudio.tagusage"""
     from gstudio.models import Nodetype
-    tags_nodetype_published = Tag.objects.usage_for_queryset(
-        Nodetype.published.all())
-    # Need to do that until the issue #44 of django-tagging is fixed
-    return Tag.objects.filter(name__in=[t.name for t in tags_nodetype_published])
+    from gstudio.tagusage import published_tags
+    return published_tags(Nodetype)
 
 
 class AuthorPublishedManager(models.Manager):
     """Manager to retrieve published authors"""
 
     def get_query_set(self):
-        """Return published authors"""
-        now = datetime.now()
+        """Return the authors of live nodetypes on the current site,
+        as counted by gstudio.authorstats"""
         return super(AuthorPublishedManager, self).get_query_set().filter(
-            nodetypes__status=PUBLISHED,
-            nodetypes__start_publication__lte=now,
-            nodetypes__end_publication__gt=now,
-            nodetypes__sites=Site.objects.get_current()
-            ).distinct()
+            publication_stats__site=Site.objects.get_current())
 
 
 def nodetypes_published(queryset):
 
-    """Return only the nodetypes published"""
-    now = datetime.now()
-    return queryset.filter(status=PUBLISHED,
-                           start_publication__lte=now,
-                           end_publication__gt=now,
-                           sites=Site.objects.get_current())
+    """Return only the nodetypes published, live on the current site,
+    as flagged by gstudio.publication"""
+    return queryset.filter(is_live=True, sites=Site.objects.get_current())
+
+
+class NIDManager(models.Manager):
+    """Manager of the nodes, aware of their concrete models"""
+
+    def resolve_many(self, nodes):
+        """Return the nodes or ids given, downcasted to their concrete
+        models and in the same order, with one query per model"""
+        from django.contrib.contenttypes.models import ContentType
+        nodes = list(nodes)
+        ids = [isinstance(node, models.Model) and node.pk or
+               self.model._meta.pk.to_python(node) for node in nodes]
+        content_types = {}
+        unknown = []
+        for node, pk in zip(nodes, ids):
+            if getattr(node, 'content_type_id', None):
+                content_types[pk] = node.content_type_id
+            else:
+                unknown.append(pk)
+        if unknown:
+            content_types.update(self.filter(pk__in=unknown).values_list(
+                'pk', 'content_type'))
+
+        ids_by_type = {}
+        for pk, content_type_id in content_types.items():
+            ids_by_type.setdefault(content_type_id, []).append(pk)
+
+        resolved = {}
+        for content_type_id, type_ids in ids_by_type.items():
+            model = None
+            if content_type_id:
+                model = ContentType.objects.get_for_id(
+                    content_type_id).model_class()
+            model = model or self.model
+            resolved.update(model._base_manager.in_bulk(type_ids))
+
+        return [resolved[pk] for pk in ids if pk in resolved]
 
 
 class NodetypePublishedManager(models.Manager):
@@ -57,11 +82,12 @@ class NodetypePublishedManager(models.Manager):
             ).filter(sites=Site.objects.get_current())
 
     def search(self, pattern):
-        """Top level search method on nodetypes"""
-        try:
-            return self.advanced_search(pattern)
-        except:
-            return self.basic_search(pattern)
+        """Top level search method on nodetypes,
+        falling back to a basic search if the pattern is invalid"""
+        from gstudio.search import search_pattern
+        from gstudio.search import get_search_backend
+        return get_search_backend()(self.get_query_set(),
+                                    search_pattern(pattern))
 
     def advanced_search(self, pattern):
         """Advanced search on nodetypes"""
@@ -70,14 +96,7 @@ class NodetypePublishedManager(models.Manager):
 
     def basic_search(self, pattern):
         """Basic search on nodetypes"""
-        lookup = None
-        for pattern in pattern.split():
-            query_part = models.Q(content__icontains=pattern) | \
-                         models.Q(excerpt__icontains=pattern) | \
-                         models.Q(title__icontains=pattern)
-            if lookup is None:
-                lookup = query_part
-            else:
-                lookup |= query_part
-
-        return self.get_query_set().filter(lookup)
+        from gstudio.search import basic_pattern
+        from gstudio.search import get_search_backend
+        return get_search_backend()(self.get_query_set(),
+                                    basic_pattern(pattern))
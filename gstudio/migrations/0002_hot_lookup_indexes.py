@@ -0,0 +1,33 @@
+# encoding: utf-8
+from south.db import db
+from south.v2 import SchemaMigration
+from django.utils.importlib import import_module
+
+from gstudio.indexes import INDEXES
+from gstudio.indexes import index_name
+from gstudio.indexes import index_exists
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+
+        for table, columns in INDEXES:
+            if index_exists(table, index_name(table, columns), db.db_alias):
+                continue  # Created by the post_syncdb handler
+            db.execute('CREATE INDEX %s ON %s (%s)' % (
+                db.quote_name(index_name(table, columns)),
+                db.quote_name(table),
+                ', '.join([db.quote_name(column) for column in columns])))
+
+    def backwards(self, orm):
+
+        for table, columns in INDEXES:
+            db.execute(db.drop_index_string % {
+                'index_name': db.quote_name(index_name(table, columns)),
+                'table_name': db.quote_name(table)})
+
+    # Only indexes are added, the frozen models are unchanged
+    models = import_module('gstudio.migrations.0001_initial').Migration.models
+
+    complete_apps = ['gstudio']
@@ -0,0 +1,25 @@
+# encoding: utf-8
+from copy import deepcopy
+
+from south.db import db
+from south.v2 import SchemaMigration
+from django.utils.importlib import import_module
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+
+        # Adding field 'NID.content_type'
+        db.add_column('gstudio_nid', 'content_type', self.gf('django.db.models.fields.related.ForeignKey')(related_name='nids', null=True, to=orm['contenttypes.ContentType'], blank=True), keep_default=False)
+
+    def backwards(self, orm):
+
+        # Deleting field 'NID.content_type'
+        db.delete_column('gstudio_nid', 'content_type_id')
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0002_hot_lookup_indexes').Migration.models)
+    models['gstudio.nid']['content_type'] = ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'nids'", 'null': 'True', 'to': "orm['contenttypes.ContentType']", 'blank': 'True'})
+
+    complete_apps = ['gstudio']
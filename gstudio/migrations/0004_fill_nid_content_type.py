@@ -0,0 +1,46 @@
+# encoding: utf-8
+from copy import deepcopy
+
+from south.v2 import DataMigration
+from django.utils.importlib import import_module
+
+
+class Migration(DataMigration):
+
+    # The nodes of objectapp are typed too
+    depends_on = (('objectapp', '0001_initial'),)
+    no_dry_run = True
+
+    def forwards(self, orm):
+
+        # The deepest models first, a node belongs to the
+        # tables of all its ancestor models
+        NID = orm['gstudio.NID']
+        ContentType = orm['contenttypes.ContentType']
+        models = [model for model in orm.models.values()
+                  if issubclass(model, NID) and not model._meta.proxy]
+        models.sort(key=lambda model: len(model._meta.get_parent_list()),
+                    reverse=True)
+
+        for model in models:
+            content_type = ContentType.objects.get_or_create(
+                app_label=model._meta.app_label,
+                model=model._meta.object_name.lower(),
+                defaults={'name': model._meta.verbose_name_raw})[0]
+            NID.objects.filter(
+                content_type__isnull=True,
+                pk__in=model._base_manager.values('pk')).update(
+                content_type=content_type)
+
+    def backwards(self, orm):
+
+        # The types are dropped with their column
+        pass
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0003_nid_content_type').Migration.models)
+    models.update((name, deepcopy(model)) for name, model in import_module(
+        'objectapp.migrations.0001_initial').Migration.models.items()
+                  if name.startswith('objectapp.'))
+
+    complete_apps = ['gstudio']
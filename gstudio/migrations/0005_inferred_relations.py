@@ -0,0 +1,43 @@
+# encoding: utf-8
+from copy import deepcopy
+
+from south.db import db
+from south.v2 import SchemaMigration
+from django.utils.importlib import import_module
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+
+        # Adding model 'InferredRelation'
+        db.create_table('gstudio_inferredrelation', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('left_subject', self.gf('django.db.models.fields.related.ForeignKey')(related_name='inferred_left_subject_of', to=orm['gstudio.NID'])),
+            ('relationtype', self.gf('django.db.models.fields.related.ForeignKey')(related_name='inferred_relations', to=orm['gstudio.Relationtype'])),
+            ('right_subject', self.gf('django.db.models.fields.related.ForeignKey')(related_name='inferred_right_subject_of', to=orm['gstudio.NID'])),
+        ))
+        db.send_create_signal('gstudio', ['InferredRelation'])
+
+        # Adding unique constraint on 'InferredRelation', fields ['left_subject', 'relationtype', 'right_subject']
+        db.create_unique('gstudio_inferredrelation', ['left_subject_id', 'relationtype_id', 'right_subject_id'])
+
+    def backwards(self, orm):
+
+        # Removing unique constraint on 'InferredRelation', fields ['left_subject', 'relationtype', 'right_subject']
+        db.delete_unique('gstudio_inferredrelation', ['left_subject_id', 'relationtype_id', 'right_subject_id'])
+
+        # Deleting model 'InferredRelation'
+        db.delete_table('gstudio_inferredrelation')
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0004_fill_nid_content_type').Migration.models)
+    models['gstudio.inferredrelation'] = {
+        'Meta': {'unique_together': "(('left_subject', 'relationtype', 'right_subject'),)", 'object_name': 'InferredRelation'},
+        'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+        'left_subject': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'inferred_left_subject_of'", 'to': "orm['gstudio.NID']"}),
+        'relationtype': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'inferred_relations'", 'to': "orm['gstudio.Relationtype']"}),
+        'right_subject': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'inferred_right_subject_of'", 'to': "orm['gstudio.NID']"})
+    }
+
+    complete_apps = ['gstudio']
@@ -0,0 +1,45 @@
+# encoding: utf-8
+from copy import deepcopy
+
+from south.db import db
+from south.v2 import SchemaMigration
+from django.utils.importlib import import_module
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+
+        # Adding model 'RelatedNodetype'
+        db.create_table('gstudio_relatednodetype', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('nodetype', self.gf('django.db.models.fields.related.ForeignKey')(related_name='related_nodetypes', to=orm['gstudio.Nodetype'])),
+            ('related', self.gf('django.db.models.fields.related.ForeignKey')(related_name='related_to', to=orm['gstudio.Nodetype'])),
+            ('score', self.gf('django.db.models.fields.FloatField')()),
+            ('rank', self.gf('django.db.models.fields.PositiveIntegerField')()),
+        ))
+        db.send_create_signal('gstudio', ['RelatedNodetype'])
+
+        # Adding unique constraint on 'RelatedNodetype', fields ['nodetype', 'related']
+        db.create_unique('gstudio_relatednodetype', ['nodetype_id', 'related_id'])
+
+    def backwards(self, orm):
+
+        # Removing unique constraint on 'RelatedNodetype', fields ['nodetype', 'related']
+        db.delete_unique('gstudio_relatednodetype', ['nodetype_id', 'related_id'])
+
+        # Deleting model 'RelatedNodetype'
+        db.delete_table('gstudio_relatednodetype')
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0005_inferred_relations').Migration.models)
+    models['gstudio.relatednodetype'] = {
+        'Meta': {'ordering': "['nodetype', 'rank']", 'unique_together': "(('nodetype', 'related'),)", 'object_name': 'RelatedNodetype'},
+        'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+        'nodetype': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'related_nodetypes'", 'to': "orm['gstudio.Nodetype']"}),
+        'rank': ('django.db.models.fields.PositiveIntegerField', [], {}),
+        'related': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'related_to'", 'to': "orm['gstudio.Nodetype']"}),
+        'score': ('django.db.models.fields.FloatField', [], {})
+    }
+
+    complete_apps = ['gstudio']
@@ -0,0 +1,60 @@
+# encoding: utf-8
+from copy import deepcopy
+
+from south.db import db
+from south.v2 import SchemaMigration
+from django.utils.importlib import import_module
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+
+        # Adding model 'SearchDocument'
+        db.create_table('gstudio_searchdocument', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('node', self.gf('django.db.models.fields.related.OneToOneField')(related_name='search_document', unique=True, to=orm['gstudio.NID'])),
+            ('kind', self.gf('django.db.models.fields.CharField')(max_length=50, db_index=True)),
+            ('length', self.gf('django.db.models.fields.PositiveIntegerField')()),
+        ))
+        db.send_create_signal('gstudio', ['SearchDocument'])
+
+        # Adding model 'SearchPosting'
+        db.create_table('gstudio_searchposting', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('node', self.gf('django.db.models.fields.related.ForeignKey')(related_name='search_postings', to=orm['gstudio.NID'])),
+            ('field', self.gf('django.db.models.fields.CharField')(max_length=50, blank=True)),
+            ('term', self.gf('django.db.models.fields.CharField')(max_length=255, db_index=True)),
+            ('frequency', self.gf('django.db.models.fields.PositiveIntegerField')()),
+            ('positions', self.gf('django.db.models.fields.TextField')(blank=True)),
+        ))
+        db.send_create_signal('gstudio', ['SearchPosting'])
+
+    def backwards(self, orm):
+
+        # Deleting model 'SearchPosting'
+        db.delete_table('gstudio_searchposting')
+
+        # Deleting model 'SearchDocument'
+        db.delete_table('gstudio_searchdocument')
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0006_related_nodetypes').Migration.models)
+    models['gstudio.searchdocument'] = {
+        'Meta': {'object_name': 'SearchDocument'},
+        'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+        'kind': ('django.db.models.fields.CharField', [], {'max_length': '50', 'db_index': 'True'}),
+        'length': ('django.db.models.fields.PositiveIntegerField', [], {}),
+        'node': ('django.db.models.fields.related.OneToOneField', [], {'related_name': "'search_document'", 'unique': 'True', 'to': "orm['gstudio.NID']"})
+    }
+    models['gstudio.searchposting'] = {
+        'Meta': {'object_name': 'SearchPosting'},
+        'field': ('django.db.models.fields.CharField', [], {'max_length': '50', 'blank': 'True'}),
+        'frequency': ('django.db.models.fields.PositiveIntegerField', [], {}),
+        'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+        'node': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'search_postings'", 'to': "orm['gstudio.NID']"}),
+        'positions': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+        'term': ('django.db.models.fields.CharField', [], {'max_length': '255', 'db_index': 'True'})
+    }
+
+    complete_apps = ['gstudio']
@@ -0,0 +1,25 @@
+# encoding: utf-8
+from copy import deepcopy
+
+from south.db import db
+from south.v2 import SchemaMigration
+from django.utils.importlib import import_module
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+
+        # Adding field 'Nodetype.is_live'
+        db.add_column('gstudio_nodetype', 'is_live', self.gf('django.db.models.fields.BooleanField')(default=False, db_index=True), keep_default=False)
+
+    def backwards(self, orm):
+
+        # Deleting field 'Nodetype.is_live'
+        db.delete_column('gstudio_nodetype', 'is_live')
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0007_search_index').Migration.models)
+    models['gstudio.nodetype']['is_live'] = ('django.db.models.fields.BooleanField', [], {'default': 'False', 'db_index': 'True'})
+
+    complete_apps = ['gstudio']
@@ -0,0 +1,27 @@
+# encoding: utf-8
+from datetime import datetime
+
+from south.v2 import DataMigration
+from django.utils.importlib import import_module
+
+from gstudio.publication import live_q
+
+
+class Migration(DataMigration):
+
+    no_dry_run = True
+
+    def forwards(self, orm):
+
+        orm['gstudio.Nodetype'].objects.filter(
+            live_q(datetime.now())).update(is_live=True)
+
+    def backwards(self, orm):
+
+        # The flags are dropped with their column
+        pass
+
+    models = import_module(
+        'gstudio.migrations.0008_nodetype_is_live').Migration.models
+
+    complete_apps = ['gstudio']
@@ -0,0 +1,47 @@
+# encoding: utf-8
+from copy import deepcopy
+
+from south.db import db
+from south.v2 import SchemaMigration
+from django.utils.importlib import import_module
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+
+        # Adding model 'AuthorStats'
+        db.create_table('gstudio_authorstats', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('author', self.gf('django.db.models.fields.related.ForeignKey')(related_name='publication_stats', to=orm['auth.User'])),
+            ('site', self.gf('django.db.models.fields.related.ForeignKey')(related_name='author_stats', to=orm['sites.Site'])),
+            ('published_count', self.gf('django.db.models.fields.PositiveIntegerField')()),
+            ('first_publication', self.gf('django.db.models.fields.DateTimeField')()),
+            ('last_publication', self.gf('django.db.models.fields.DateTimeField')()),
+        ))
+        db.send_create_signal('gstudio', ['AuthorStats'])
+
+        # Adding unique constraint on 'AuthorStats', fields ['site', 'author']
+        db.create_unique('gstudio_authorstats', ['site_id', 'author_id'])
+
+    def backwards(self, orm):
+
+        # Removing unique constraint on 'AuthorStats', fields ['site', 'author']
+        db.delete_unique('gstudio_authorstats', ['site_id', 'author_id'])
+
+        # Deleting model 'AuthorStats'
+        db.delete_table('gstudio_authorstats')
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0009_fill_nodetype_is_live').Migration.models)
+    models['gstudio.authorstats'] = {
+        'Meta': {'unique_together': "(('site', 'author'),)", 'object_name': 'AuthorStats'},
+        'author': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'publication_stats'", 'to': "orm['auth.User']"}),
+        'first_publication': ('django.db.models.fields.DateTimeField', [], {}),
+        'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+        'last_publication': ('django.db.models.fields.DateTimeField', [], {}),
+        'published_count': ('django.db.models.fields.PositiveIntegerField', [], {}),
+        'site': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'author_stats'", 'to': "orm['sites.Site']"})
+    }
+
+    complete_apps = ['gstudio']
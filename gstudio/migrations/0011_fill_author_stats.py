@@ -0,0 +1,36 @@
+# encoding: utf-8
+from south.v2 import DataMigration
+from django.db.models import Max
+from django.db.models import Min
+from django.db.models import Count
+from django.utils.importlib import import_module
+
+
+class Migration(DataMigration):
+
+    no_dry_run = True
+
+    def forwards(self, orm):
+
+        rows = orm['gstudio.Nodetype'].authors.through.objects.filter(
+            nodetype__is_live=True).values(
+            'user', 'nodetype__sites').annotate(
+            count=Count('nodetype'), first=Min('nodetype__creation_date'),
+            last=Max('nodetype__creation_date')).order_by()
+        for row in rows:
+            if row['nodetype__sites'] is not None:
+                orm['gstudio.AuthorStats'].objects.create(
+                    author_id=row['user'], site_id=row['nodetype__sites'],
+                    published_count=row['count'],
+                    first_publication=row['first'],
+                    last_publication=row['last'])
+
+    def backwards(self, orm):
+
+        # The statistics are dropped with their table
+        pass
+
+    models = import_module(
+        'gstudio.migrations.0010_author_stats').Migration.models
+
+    complete_apps = ['gstudio']
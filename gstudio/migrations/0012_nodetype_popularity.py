@@ -0,0 +1,39 @@
+# encoding: utf-8
+from copy import deepcopy
+
+from south.db import db
+from south.v2 import SchemaMigration
+from django.utils.importlib import import_module
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+
+        # Adding model 'NodetypePopularity'
+        db.create_table('gstudio_nodetypepopularity', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('nodetype', self.gf('django.db.models.fields.related.OneToOneField')(related_name='popularity', unique=True, to=orm['gstudio.Nodetype'])),
+            ('comments_count', self.gf('django.db.models.fields.IntegerField')(default=0, db_index=True)),
+            ('day_count', self.gf('django.db.models.fields.IntegerField')(default=0, db_index=True)),
+            ('week_count', self.gf('django.db.models.fields.IntegerField')(default=0, db_index=True)),
+        ))
+        db.send_create_signal('gstudio', ['NodetypePopularity'])
+
+    def backwards(self, orm):
+
+        # Deleting model 'NodetypePopularity'
+        db.delete_table('gstudio_nodetypepopularity')
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0011_fill_author_stats').Migration.models)
+    models['gstudio.nodetypepopularity'] = {
+        'Meta': {'object_name': 'NodetypePopularity'},
+        'comments_count': ('django.db.models.fields.IntegerField', [], {'default': '0', 'db_index': 'True'}),
+        'day_count': ('django.db.models.fields.IntegerField', [], {'default': '0', 'db_index': 'True'}),
+        'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+        'nodetype': ('django.db.models.fields.related.OneToOneField', [], {'related_name': "'popularity'", 'unique': 'True', 'to': "orm['gstudio.Nodetype']"}),
+        'week_count': ('django.db.models.fields.IntegerField', [], {'default': '0', 'db_index': 'True'})
+    }
+
+    complete_apps = ['gstudio']
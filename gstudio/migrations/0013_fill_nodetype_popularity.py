@@ -0,0 +1,76 @@
+# encoding: utf-8
+from copy import deepcopy
+from datetime import datetime
+from datetime import timedelta
+
+from south.v2 import DataMigration
+from django.db.models import Count
+from django.utils.importlib import import_module
+
+
+def content_types(orm, base):
+    """Return the ids of the content types of a frozen
+    base model and of its subclasses"""
+    ids = []
+    for model in orm.models.values():
+        if issubclass(model, base):
+            ids.extend(orm['contenttypes.ContentType'].objects.filter(
+                app_label=model._meta.app_label,
+                model=model._meta.object_name.lower()).values_list(
+                'pk', flat=True))
+    return ids
+
+
+class Migration(DataMigration):
+
+    no_dry_run = True
+
+    def forwards(self, orm):
+
+        now = datetime.now()
+        Nodetype = orm['gstudio.Nodetype']
+        nodetypes = set(Nodetype.objects.values_list('pk', flat=True))
+        comments = orm['comments.Comment'].objects.filter(
+            content_type__in=content_types(orm, Nodetype), is_public=True)
+
+        counters = {}
+        for counter, counted in (
+            ('comments_count', comments),
+            ('day_count', comments.filter(
+                submit_date__gt=now - timedelta(days=1))),
+            ('week_count', comments.filter(
+                submit_date__gt=now - timedelta(days=7)))):
+            for pk, count in counted.values_list('object_pk').annotate(
+                count=Count('pk')).order_by():
+                if int(pk) in nodetypes:
+                    counters.setdefault(int(pk), {})[counter] = count
+
+        for pk, counts in counters.items():
+            orm['gstudio.NodetypePopularity'].objects.create(
+                nodetype_id=pk, **counts)
+
+    def backwards(self, orm):
+
+        # The counters are dropped with their table
+        pass
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0012_nodetype_popularity').Migration.models)
+    models['comments.comment'] = {
+        'Meta': {'ordering': "('submit_date',)", 'object_name': 'Comment', 'db_table': "'django_comments'"},
+        'comment': ('django.db.models.fields.TextField', [], {'max_length': '3000'}),
+        'content_type': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'content_type_set_for_comment'", 'to': "orm['contenttypes.ContentType']"}),
+        'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+        'ip_address': ('django.db.models.fields.IPAddressField', [], {'max_length': '15', 'null': 'True', 'blank': 'True'}),
+        'is_public': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+        'is_removed': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+        'object_pk': ('django.db.models.fields.TextField', [], {}),
+        'site': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['sites.Site']"}),
+        'submit_date': ('django.db.models.fields.DateTimeField', [], {'default': 'None'}),
+        'user': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'comment_comments'", 'null': 'True', 'to': "orm['auth.User']"}),
+        'user_email': ('django.db.models.fields.EmailField', [], {'max_length': '75', 'blank': 'True'}),
+        'user_name': ('django.db.models.fields.CharField', [], {'max_length': '50', 'blank': 'True'}),
+        'user_url': ('django.db.models.fields.URLField', [], {'max_length': '200', 'blank': 'True'})
+    }
+
+    complete_apps = ['gstudio']
@@ -0,0 +1,39 @@
+# encoding: utf-8
+from copy import deepcopy
+
+from south.db import db
+from south.v2 import SchemaMigration
+from django.utils.importlib import import_module
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+
+        # Adding model 'Discussion'
+        db.create_table('gstudio_discussion', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('comment', self.gf('django.db.models.fields.related.OneToOneField')(related_name='gstudio_discussion', unique=True, to=orm['comments.Comment'])),
+            ('nodetype', self.gf('django.db.models.fields.related.ForeignKey')(related_name='discussions_feed', to=orm['gstudio.Nodetype'])),
+            ('kind', self.gf('django.db.models.fields.CharField')(max_length=20)),
+            ('submit_date', self.gf('django.db.models.fields.DateTimeField')(db_index=True)),
+        ))
+        db.send_create_signal('gstudio', ['Discussion'])
+
+    def backwards(self, orm):
+
+        # Deleting model 'Discussion'
+        db.delete_table('gstudio_discussion')
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0013_fill_nodetype_popularity').Migration.models)
+    models['gstudio.discussion'] = {
+        'Meta': {'ordering': "['-submit_date']", 'object_name': 'Discussion'},
+        'comment': ('django.db.models.fields.related.OneToOneField', [], {'related_name': "'gstudio_discussion'", 'unique': 'True', 'to': "orm['comments.Comment']"}),
+        'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+        'kind': ('django.db.models.fields.CharField', [], {'max_length': '20'}),
+        'nodetype': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'discussions_feed'", 'to': "orm['gstudio.Nodetype']"}),
+        'submit_date': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True'})
+    }
+
+    complete_apps = ['gstudio']
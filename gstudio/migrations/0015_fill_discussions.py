@@ -0,0 +1,65 @@
+# encoding: utf-8
+from copy import deepcopy
+
+from south.v2 import DataMigration
+from django.utils.importlib import import_module
+
+from gstudio.settings import DISCUSSIONS_SIZE
+
+COMMENT = 'comment'
+LINKBACK = 'linkback'
+LINKBACK_FLAGS = ('pingback', 'trackback')
+MODERATOR_APPROVAL = 'moderator approval'
+
+content_types = import_module(
+    'gstudio.migrations.0013_fill_nodetype_popularity').content_types
+
+
+class Migration(DataMigration):
+
+    no_dry_run = True
+
+    def forwards(self, orm):
+
+        Nodetype = orm['gstudio.Nodetype']
+        nodetypes = set(Nodetype.objects.values_list('pk', flat=True))
+        listed = {COMMENT: 0, LINKBACK: 0}
+        for comment in orm['comments.Comment'].objects.filter(
+            content_type__in=content_types(orm, Nodetype),
+            is_public=True).order_by('-submit_date').iterator():
+            if min(listed.values()) >= DISCUSSIONS_SIZE:
+                break
+            if not comment.object_pk or \
+                   int(comment.object_pk) not in nodetypes:
+                continue
+            flags = set(comment.flags.values_list('flag', flat=True))
+            if flags.intersection(LINKBACK_FLAGS):
+                kind = LINKBACK
+            elif not flags or MODERATOR_APPROVAL in flags:
+                kind = COMMENT
+            else:
+                continue
+            if listed[kind] < DISCUSSIONS_SIZE:
+                orm['gstudio.Discussion'].objects.create(
+                    comment=comment, kind=kind,
+                    nodetype_id=int(comment.object_pk),
+                    submit_date=comment.submit_date)
+                listed[kind] += 1
+
+    def backwards(self, orm):
+
+        # The discussions are dropped with their table
+        pass
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0014_discussions').Migration.models)
+    models['comments.commentflag'] = {
+        'Meta': {'unique_together': "[('user', 'comment', 'flag')]", 'object_name': 'CommentFlag', 'db_table': "'django_comment_flags'"},
+        'comment': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'flags'", 'to': "orm['comments.Comment']"}),
+        'flag': ('django.db.models.fields.CharField', [], {'max_length': '30', 'db_index': 'True'}),
+        'flag_date': ('django.db.models.fields.DateTimeField', [], {'default': 'None'}),
+        'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+        'user': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'comment_flags'", 'to': "orm['auth.User']"})
+    }
+
+    complete_apps = ['gstudio']
@@ -0,0 +1,52 @@
+# encoding: utf-8
+from copy import deepcopy
+
+from south.db import db
+from south.v2 import SchemaMigration
+from django.utils.importlib import import_module
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+
+        # Adding model 'TagUsage'
+        db.create_table('gstudio_tagusage', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('tag', self.gf('django.db.models.fields.related.ForeignKey')(related_name='usages', to=orm['tagging.Tag'])),
+            ('content_type', self.gf('django.db.models.fields.related.ForeignKey')(to=orm['contenttypes.ContentType'])),
+            ('site', self.gf('django.db.models.fields.related.ForeignKey')(related_name='tag_usages', to=orm['sites.Site'])),
+            ('count', self.gf('django.db.models.fields.PositiveIntegerField')()),
+            ('last_used', self.gf('django.db.models.fields.DateTimeField')()),
+        ))
+        db.send_create_signal('gstudio', ['TagUsage'])
+
+        # Adding unique constraint on 'TagUsage', fields ['content_type', 'site', 'tag']
+        db.create_unique('gstudio_tagusage', ['content_type_id', 'site_id', 'tag_id'])
+
+    def backwards(self, orm):
+
+        # Removing unique constraint on 'TagUsage', fields ['content_type', 'site', 'tag']
+        db.delete_unique('gstudio_tagusage', ['content_type_id', 'site_id', 'tag_id'])
+
+        # Deleting model 'TagUsage'
+        db.delete_table('gstudio_tagusage')
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0015_fill_discussions').Migration.models)
+    models['tagging.tag'] = {
+        'Meta': {'ordering': "('name',)", 'object_name': 'Tag'},
+        'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+        'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '50', 'db_index': 'True'})
+    }
+    models['gstudio.tagusage'] = {
+        'Meta': {'unique_together': "(('content_type', 'site', 'tag'),)", 'object_name': 'TagUsage'},
+        'content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+        'count': ('django.db.models.fields.PositiveIntegerField', [], {}),
+        'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+        'last_used': ('django.db.models.fields.DateTimeField', [], {}),
+        'site': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'tag_usages'", 'to': "orm['sites.Site']"}),
+        'tag': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'usages'", 'to': "orm['tagging.Tag']"})
+    }
+
+    complete_apps = ['gstudio']
@@ -0,0 +1,59 @@
+# encoding: utf-8
+from copy import deepcopy
+
+from south.v2 import DataMigration
+from django.db.models import Max
+from django.db.models import Count
+from django.utils.importlib import import_module
+
+content_types = import_module(
+    'gstudio.migrations.0013_fill_nodetype_popularity').content_types
+
+
+class Migration(DataMigration):
+
+    # The tags of the gbobjects are counted on their is_live flag
+    depends_on = (('objectapp', '0003_fill_gbobject_is_live'),)
+    no_dry_run = True
+
+    def forwards(self, orm):
+
+        ContentType = orm['contenttypes.ContentType']
+        for base in (orm['gstudio.Nodetype'], orm['objectapp.Gbobject']):
+            content_type = ContentType.objects.get_or_create(
+                app_label=base._meta.app_label,
+                model=base._meta.object_name.lower(),
+                defaults={'name': base._meta.verbose_name_raw})[0]
+            items = orm['tagging.TaggedItem'].objects.filter(
+                content_type__in=content_types(orm, base))
+            for tag in items.values_list('tag', flat=True).distinct():
+                rows = base.objects.filter(
+                    is_live=True, pk__in=items.filter(tag=tag).values(
+                        'object_id')).values('sites').annotate(
+                    count=Count('pk'), last=Max('creation_date')).order_by()
+                for row in rows:
+                    if row['sites'] is not None:
+                        orm['gstudio.TagUsage'].objects.create(
+                            tag_id=tag, content_type=content_type,
+                            site_id=row['sites'], count=row['count'],
+                            last_used=row['last'])
+
+    def backwards(self, orm):
+
+        # The usages are dropped with their table
+        pass
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0016_tag_usage').Migration.models)
+    models.update((name, deepcopy(model)) for name, model in import_module(
+        'objectapp.migrations.0003_fill_gbobject_is_live'
+        ).Migration.models.items() if name.startswith('objectapp.'))
+    models['tagging.taggeditem'] = {
+        'Meta': {'unique_together': "(('tag', 'content_type', 'object_id'),)", 'object_name': 'TaggedItem'},
+        'content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+        'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+        'object_id': ('django.db.models.fields.PositiveIntegerField', [], {'db_index': 'True'}),
+        'tag': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'items'", 'to': "orm['tagging.Tag']"})
+    }
+
+    complete_apps = ['gstudio']
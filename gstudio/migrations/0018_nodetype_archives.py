@@ -0,0 +1,43 @@
+# encoding: utf-8
+from copy import deepcopy
+
+from south.db import db
+from south.v2 import SchemaMigration
+from django.utils.importlib import import_module
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+
+        # Adding model 'NodetypeArchive'
+        db.create_table('gstudio_nodetypearchive', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('site', self.gf('django.db.models.fields.related.ForeignKey')(related_name='nodetype_archives', to=orm['sites.Site'])),
+            ('day', self.gf('django.db.models.fields.DateField')(db_index=True)),
+            ('count', self.gf('django.db.models.fields.PositiveIntegerField')()),
+        ))
+        db.send_create_signal('gstudio', ['NodetypeArchive'])
+
+        # Adding unique constraint on 'NodetypeArchive', fields ['site', 'day']
+        db.create_unique('gstudio_nodetypearchive', ['site_id', 'day'])
+
+    def backwards(self, orm):
+
+        # Removing unique constraint on 'NodetypeArchive', fields ['site', 'day']
+        db.delete_unique('gstudio_nodetypearchive', ['site_id', 'day'])
+
+        # Deleting model 'NodetypeArchive'
+        db.delete_table('gstudio_nodetypearchive')
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0017_fill_tag_usage').Migration.models)
+    models['gstudio.nodetypearchive'] = {
+        'Meta': {'unique_together': "(('site', 'day'),)", 'object_name': 'NodetypeArchive'},
+        'count': ('django.db.models.fields.PositiveIntegerField', [], {}),
+        'day': ('django.db.models.fields.DateField', [], {'db_index': 'True'}),
+        'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+        'site': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'nodetype_archives'", 'to': "orm['sites.Site']"})
+    }
+
+    complete_apps = ['gstudio']
@@ -0,0 +1,36 @@
+# encoding: utf-8
+from datetime import time
+from datetime import datetime
+
+from south.v2 import DataMigration
+from django.db.models import Count
+from django.utils.importlib import import_module
+
+
+class Migration(DataMigration):
+
+    no_dry_run = True
+
+    def forwards(self, orm):
+
+        nodetypes = orm['gstudio.Nodetype'].objects.filter(is_live=True)
+        for date in nodetypes.dates('creation_date', 'day'):
+            day = date.date()
+            rows = nodetypes.filter(creation_date__range=(
+                datetime.combine(day, time.min),
+                datetime.combine(day, time.max))).values(
+                'sites').annotate(count=Count('pk')).order_by()
+            for row in rows:
+                if row['sites'] is not None:
+                    orm['gstudio.NodetypeArchive'].objects.create(
+                        site_id=row['sites'], day=day, count=row['count'])
+
+    def backwards(self, orm):
+
+        # The archives are dropped with their table
+        pass
+
+    models = import_module(
+        'gstudio.migrations.0018_nodetype_archives').Migration.models
+
+    complete_apps = ['gstudio']
@@ -0,0 +1,32 @@
+# encoding: utf-8
+from copy import deepcopy
+
+from south.db import db
+from south.v2 import SchemaMigration
+from django.utils.importlib import import_module
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+
+        # Adding field 'Metatype.tree_path'
+        db.add_column('gstudio_metatype', 'tree_path', self.gf('django.db.models.fields.CharField')(default='', max_length=1024, db_index=True, blank=True), keep_default=False)
+
+        # Adding field 'Nodetype.tree_path'
+        db.add_column('gstudio_nodetype', 'tree_path', self.gf('django.db.models.fields.CharField')(default='', max_length=1024, db_index=True, blank=True), keep_default=False)
+
+    def backwards(self, orm):
+
+        # Deleting field 'Metatype.tree_path'
+        db.delete_column('gstudio_metatype', 'tree_path')
+
+        # Deleting field 'Nodetype.tree_path'
+        db.delete_column('gstudio_nodetype', 'tree_path')
+
+    models = deepcopy(import_module(
+        'gstudio.migrations.0019_fill_nodetype_archives').Migration.models)
+    models['gstudio.metatype']['tree_path'] = ('django.db.models.fields.CharField', [], {'max_length': '1024', 'db_index': 'True', 'blank': 'True'})
+    models['gstudio.nodetype']['tree_path'] = ('django.db.models.fields.CharField', [], {'max_length': '1024', 'db_index': 'True', 'blank': 'True'})
+
+    complete_apps = ['gstudio']
@@ -0,0 +1,29 @@
+# encoding: utf-8
+from south.v2 import DataMigration
+from django.utils.importlib import import_module
+
+
+class Migration(DataMigration):
+
+    no_dry_run = True
+
+    def forwards(self, orm):
+
+        # The parents before their children
+        for base in (orm['gstudio.Metatype'], orm['gstudio.Nodetype']):
+            paths = {}
+            for pk, parent, slug in base.objects.order_by(
+                'tree_id', 'lft').values_list('pk', 'parent', 'slug'):
+                paths[pk] = parent in paths and \
+                            '%s/%s' % (paths[parent], slug) or slug
+                base.objects.filter(pk=pk).update(tree_path=paths[pk])
+
+    def backwards(self, orm):
+
+        # The paths are dropped with their columns
+        pass
+
+    models = import_module(
+        'gstudio.migrations.0020_tree_paths').Migration.models
+
+    complete_apps = ['gstudio']
@@ -3,23 +3,28 @@ import warnings
 from datetime import datetime
 from django.db import models
 from django.db.models import Q
-from django.utils.html import strip_tags
-from django.utils.html import linebreaks
+from django.db.models import F
 from django.contrib.auth.models import User
 from django.contrib.sites.models import Site
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import pre_save
+from django.db.models.signals import post_init
 from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from django.db.models.signals import post_delete
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_syncdb
+from django.core.signals import request_started
 from django.utils.importlib import import_module
 from django.contrib import comments
 from django.contrib.comments.models import CommentFlag
 from django.contrib.comments.moderation import moderator
 from django.utils.translation import ugettext_lazy as _
-from django.contrib.markup.templatetags.markup import markdown
-from django.contrib.markup.templatetags.markup import textile
-from django.contrib.markup.templatetags.markup import restructuredtext
 import mptt
 
 from djangoratings.fields import RatingField
 from tagging.fields import TagField
+from tagging.models import TaggedItem
 from gstudio.settings import UPLOAD_TO
 from gstudio.settings import MARKUP_LANGUAGE
 from gstudio.settings import NODETYPE_TEMPLATES
@@ -27,6 +32,7 @@ from gstudio.settings import NODETYPE_BASE_MODEL
 from gstudio.settings import MARKDOWN_EXTENSIONS
 from gstudio.settings import AUTO_CLOSE_COMMENTS_AFTER
 from gstudio.managers import nodetypes_published
+from gstudio.managers import NIDManager
 from gstudio.managers import NodetypePublishedManager
 from gstudio.managers import AuthorPublishedManager
 from gstudio.managers import DRAFT, HIDDEN, PUBLISHED
@@ -34,9 +40,60 @@ from gstudio.moderator import NodetypeCommentModerator
 from gstudio.url_shortener import get_url_shortener
 from gstudio.signals import ping_directories_handler
 from gstudio.signals import ping_external_urls_handler
+from gstudio.neighbourhood import get_rendered_nbh
+from gstudio.neighbourhood import nbh_author_handler
+from gstudio.neighbourhood import nbh_changed_handler
+from gstudio.neighbourhood import nbh_post_init_handler
+from gstudio.neighbourhood import nbh_m2m_changed_handler
+from gstudio.schema import get_resolver
+from gstudio.schema import clear_resolver_handler
+from gstudio.graphindex import graph_models
+from gstudio.graphindex import graph_post_init_handler
+from gstudio.graphindex import graph_post_save_handler
+from gstudio.graphindex import graph_post_delete_handler
+from gstudio.inference import inference_post_init_handler
+from gstudio.inference import inference_post_save_handler
+from gstudio.inference import inference_post_delete_handler
+from gstudio.comparison import similarity_models
+from gstudio.comparison import similarity_changed_handler
+from gstudio.searchindex import search_models
+from gstudio.searchindex import search_post_init_handler
+from gstudio.searchindex import search_post_save_handler
+from gstudio.searchindex import search_m2m_changed_handler
+from gstudio.searchindex import search_post_delete_handler
+from gstudio.searchindex import search_document_post_delete_handler
+from gstudio.completion import completion_models
+from gstudio.completion import completion_post_init_handler
+from gstudio.completion import completion_post_save_handler
+from gstudio.completion import completion_post_delete_handler
+from gstudio.publication import publication_pre_save_handler
+from gstudio.indexes import create_indexes_handler
+from gstudio.sampling import random_pool_changed_handler
+from gstudio.discussions import discussion_post_save_handler
+from gstudio.discussions import discussion_flag_changed_handler
+from gstudio.popularity import popularity_post_init_handler
+from gstudio.popularity import popularity_post_save_handler
+from gstudio.popularity import popularity_post_delete_handler
+from gstudio.authorstats import author_stats_pre_delete_handler
+from gstudio.authorstats import author_stats_post_delete_handler
+from gstudio.authorstats import author_stats_m2m_changed_handler
+from gstudio.rendering import get_rendered_content
+from gstudio.treepaths import tree_path_pre_save_handler
+from gstudio.fragments import fragment_models
+from gstudio.fragments import fragments_post_save_handler
+from gstudio.fragments import fragments_post_delete_handler
+from gstudio.fragments import fragments_m2m_changed_handler
+from gstudio.archives import archives_post_delete_handler
+from gstudio.archives import archives_m2m_changed_handler
+from gstudio.tagusage import tag_usage_item_changed_handler
+from gstudio.tagusage import tag_usage_pre_delete_handler
+from gstudio.tagusage import tag_usage_post_delete_handler
+from gstudio.tagusage import tag_usage_m2m_changed_handler
+from gstudio.snapshots import nodetype_models
+from gstudio.snapshots import snapshot_post_init_handler
+from gstudio.snapshots import snapshot_post_save_handler
 import json
 import reversion
-from reversion.models import Version
 from django.core import serializers
 
 NODETYPE_CHOICES = (
@@ -138,6 +195,11 @@ class NID(models.Model):
                             unique_for_date='creation_date',
                             max_length=255)
 
+    content_type = models.ForeignKey(ContentType, verbose_name=_('type'),
+                                     related_name='nids', editable=False,
+                                     blank=True, null=True)
+
+    objects = NIDManager()
 
     def get_serialized_dict(self):
         """
@@ -160,19 +222,11 @@ class NID(models.Model):
         """ 
         Returns the object reference the id belongs to.
         """
-        try:
-            """ 
-            ALGO:     get object id, go to version model, return for the given id.
-            """
-
-            # Retrieving only the relevant tupleset for the versioned objects
-            vrs = Version.objects.filter(type=0 , object_id=self.id)
-            # Returned value is a list, so splice it.                                                                                                     
-            vrs =  vrs[0]            
-        except:
-            return None
-        
-        return vrs.object
+        if self.content_type_id == ContentType.objects.get_for_model(
+            self).pk:
+            return self
+        nodes = NID.objects.resolve_many([self])
+        return nodes and nodes[0] or None
 
     @property
     def get_edit_url(self):
@@ -189,6 +243,12 @@ class NID(models.Model):
         version = Version.objects.get(id=self.id)
         return version.serialized_data
 
+    def save(self, *args, **kwargs):
+        """Record the concrete model of the node"""
+        if not self.content_type_id:
+            self.content_type = ContentType.objects.get_for_model(self)
+        super(NID, self).save(*args, **kwargs)
+
     def __unicode__(self):
         return self.title
 
@@ -231,6 +291,8 @@ class Metatype(Node):
     
     description = models.TextField(_('description'), blank=True, null=True)
     parent = models.ForeignKey('self', null=True, blank=True, verbose_name=_('parent metatype'), related_name='children')
+    tree_path = models.CharField(_('tree path'), max_length=1024,
+                                 db_index=True, editable=False, blank=True)
 
 
     def nodetypes_published(self):
@@ -264,87 +326,23 @@ class Metatype(Node):
     @property
     def get_possible_attributetypes(self):
         """
-        Gets the relations possible for this metatype
-        1. Recursively create a set of all the ancestors i.e. parent/subtypes of the MT. 
-        2. Get all the AT's linked to each ancestor 
+        Returns the attribute types inherited from all the ancestors
         """
-        #Step 1. 
-        ancestor_list = []
-        this_parent = self.parent
-        
-        # recursive thru parent field and append
-        while this_parent:
-            ancestor_list.append(this_parent)
-            this_parent = this_parent.parent
-            
-        #Step 2.
-        attrtypes = [] 
-                
-        for each in ancestor_list:
-            # retrieve all the AT's from each ancestor 
-            attrtypes.extend(Attributetype.objects.filter(subjecttype=each.id))
-                     
-        return attrtypes
-
+        return get_resolver().attributetypes(self)
 
     @property
     def get_possible_rels(self):
         """
-        Gets the relations possible for this metatype
-        1. Recursively create a set of all the ancestors i.e. parent/subtypes of the MT. 
-        2. Get all the R's linked to each ancestor 
+        Returns the relations of all the ancestors, as left and right roles
         """
-        #Step 1. 
-        ancestor_list = []
-        this_parent = self.parent
-        
-        # append
-        while this_parent:
-            ancestor_list.append(this_parent)
-            this_parent = this_parent.parent
-            
-        #Step 2.
-        rels = {}
-        rt_set = Relation.objects.all()
-        right_subset = []
-        left_subset = []
-        
-        for each in ancestor_list:
-            # retrieve all the RT's from each ancestor 
-            right_subset.extend(rt_set.filter(subject1=each.id))
-            left_subset.extend(rt_set.filter(subject2=each.id))
-         
-        rels['possible_leftroles'] = left_subset
-        rels['possible_rightroles'] = right_subset
-        
-        return rels
-
-
+        return get_resolver().relations(self)
 
     @property
     def get_possible_attributes(self):
         """
-        Gets the relations possible for this metatype
-        1. Recursively create a set of all the ancestors i.e. parent/subtypes of the MT. 
-        2. Get all the RT's linked to each ancestor 
+        Returns the attributes of all the ancestors
         """
-        #Step 1. 
-        ancestor_list = []
-        this_parent = self.parent
-        
-        # recursive thru parent field and append
-        while this_parent:
-            ancestor_list.append(this_parent)
-            this_parent = this_parent.parent
-            
-        #Step 2.
-        attrs = [] 
-                
-        for each in ancestor_list:
-            # retrieve all the AT's from each ancestor 
-            attrs.extend(Attribute.objects.filter(subject=each.id))
-                     
-        return attrs
+        return get_resolver().attributes(self)
 
     @property
     def get_rendered_nbh(self):
@@ -373,11 +371,10 @@ class Metatype(Node):
 
                   
     @property
-    def tree_path(self):
-        """Return metatype's tree path, by its ancestors"""
-        if self.parent:
-            return '%s/%s' % (self.parent.tree_path, self.slug)
-        return self.slug
+    def parent_tree_path(self):
+        """Return the tree path of the parent metatype,
+        from the stored tree path"""
+        return self.tree_path.rsplit('/', 1)[0]
 
     def __unicode__(self):
         return self.title
@@ -385,8 +382,8 @@ class Metatype(Node):
     @property
     def composed_sentence(self):
         "composes the relation as a sentence in triple format."
-        if self.parent:
-            return '%s is a kind of %s' % (self.title, self.parent.tree_path)
+        if self.parent_id:
+            return '%s is a kind of %s' % (self.title, self.parent_tree_path)
         return '%s is a root node'  % (self.slug)
     
 
@@ -421,6 +418,8 @@ class Nodetype(Node):
     parent = models.ForeignKey('self', null=True, blank=True,
                                verbose_name=_('is a kind of'),
                                related_name='children')
+    tree_path = models.CharField(_('tree path'), max_length=1024,
+                                 db_index=True, editable=False, blank=True)
 
     prior_nodes = models.ManyToManyField('self', null=True, blank=True,
                                verbose_name=_('its meaning depends on '),
@@ -460,6 +459,8 @@ class Nodetype(Node):
     end_publication = models.DateTimeField(_('end publication'),
                                            help_text=_('date end publish'),
                                            default=datetime(2042, 3, 15))
+    is_live = models.BooleanField(_('live'), default=False, db_index=True,
+                                  editable=False)
 
     sites = models.ManyToManyField(Site, verbose_name=_('sites publication'),
                                    related_name='nodetypes')
@@ -484,120 +485,31 @@ class Nodetype(Node):
 
     def get_possible_reltypes(self):
         """
-        Gets the relations possible for this metatype
-        1. Recursively create a set of all the ancestors i.e. parent/subtypes of the MT. 
-        2. Get all the RT's linked to each ancestor 
+        Returns the relation types inherited from all the ancestors,
+        as left and right roles
         """
-        #Step 1. 
-        ancestor_list = []
-        this_parent = self.parent
-        
-        # append
-        while this_parent:
-            ancestor_list.append(this_parent)
-            this_parent = this_parent.parent
-            
-        #Step 2.
-        reltypes = {}
-        rt_set = Relationtype.objects.all()
-        right_subset = []
-        left_subset = []
-        
-        for each in ancestor_list:
-            # retrieve all the RT's from each ancestor 
-            right_subset.extend(rt_set.filter(subjecttypeLeft=each.id))
-            left_subset.extend(rt_set.filter(subjecttypeRight=each.id))
-         
-        reltypes['possible_leftroles'] = left_subset
-        reltypes['possible_rightroles'] = right_subset
-        
-        return reltypes
-
+        return get_resolver().relationtypes(self)
 
     @property
     def get_possible_attributetypes(self):
         """
-        Gets the relations possible for this metatype
-        1. Recursively create a set of all the ancestors i.e. parent/subtypes of the MT. 
-        2. Get all the AT's linked to each ancestor 
+        Returns the attribute types inherited from all the ancestors
         """
-        #Step 1. 
-        ancestor_list = []
-        this_parent = self.parent
-        
-        # recursive thru parent field and append
-        while this_parent:
-            ancestor_list.append(this_parent)
-            this_parent = this_parent.parent
-            
-        #Step 2.
-        attrtypes = [] 
-                
-        for each in ancestor_list:
-            # retrieve all the AT's from each ancestor 
-            attrtypes.extend(Attributetype.objects.filter(subjecttype=each.id))
-                     
-        return attrtypes
-
+        return get_resolver().attributetypes(self)
 
     @property
     def get_possible_rels(self):
         """
-        Gets the relations possible for this metatype
-        1. Recursively create a set of all the ancestors i.e. parent/subtypes of the MT. 
-        2. Get all the R's linked to each ancestor 
+        Returns the relations of all the ancestors, as left and right roles
         """
-        #Step 1. 
-        ancestor_list = []
-        this_parent = self.parent
-        
-        # append
-        while this_parent:
-            ancestor_list.append(this_parent)
-            this_parent = this_parent.parent
-            
-        #Step 2.
-        rels = {}
-        rt_set = Relation.objects.all()
-        right_subset = []
-        left_subset = []
-        
-        for each in ancestor_list:
-            # retrieve all the RT's from each ancestor 
-            right_subset.extend(rt_set.filter(subject1=each.id))
-            left_subset.extend(rt_set.filter(subject2=each.id))
-         
-        rels['possible_leftroles'] = left_subset
-        rels['possible_rightroles'] = right_subset
-        
-        return rels
-
-
+        return get_resolver().relations(self)
 
     @property
     def get_possible_attributes(self):
         """
-        Gets the relations possible for this metatype
-        1. Recursively create a set of all the ancestors i.e. parent/subtypes of the MT. 
-        2. Get all the RT's linked to each ancestor 
+        Returns the attributes of all the ancestors
         """
-        #Step 1. 
-        ancestor_list = []
-        this_parent = self.parent
-        
-        # recursive thru parent field and append
-        while this_parent:
-            ancestor_list.append(this_parent)
-            this_parent = this_parent.parent
-            
-        #Step 2.
-        attrs = [] 
-                
-        for each in ancestor_list:
-            # retrieve all the AT's from each ancestor 
-            attrs.extend(Attribute.objects.filter(subject=each.id))
-                     
-        return attrs
+        return get_resolver().attributes(self)
 
     def get_graph_json(self):
 
@@ -637,32 +549,30 @@ class Nodetype(Node):
 
 
     @property
-    def tree_path(self):
-        """Return nodetype's tree path, by its ancestors"""
-        if self.parent:
-            return '%s/%s' % (self.parent.tree_path, self.slug)
-        return self.slug
+    def parent_tree_path(self):
+        """Return the tree path of the parent nodetype,
+        from the stored tree path"""
+        return self.tree_path.rsplit('/', 1)[0]
 
     @property
     def tree_path_sentence(self):
         """ Return the parent of the nodetype in a triple form """
-        if self.parent:
-            return '%s is a kind of %s' % (self.title, self.parent.tree_path)
+        if self.parent_id:
+            return '%s is a kind of %s' % (self.title, self.parent_tree_path)
         return '%s is a root node' % (self.title)
 
 
+    @property
+    def rendered_content(self):
+        """Return the content rendered once, with its
+        word count, images and links"""
+        return get_rendered_content(self.content, MARKUP_LANGUAGE,
+                                    MARKDOWN_EXTENSIONS)
+
     @property
     def html_content(self):
         """Return the content correctly formatted"""
-        if MARKUP_LANGUAGE == 'markdown':
-            return markdown(self.content, MARKDOWN_EXTENSIONS)
-        elif MARKUP_LANGUAGE == 'textile':
-            return textile(self.content)
-        elif MARKUP_LANGUAGE == 'restructuredtext':
-            return restructuredtext(self.content)
-        elif not '</p>' in self.content:
-            return linebreaks(self.content)
-        return self.content
+        return self.rendered_content.html
     @property
     def get_relations(self):
         """
@@ -685,10 +595,38 @@ class Nodetype(Node):
                 relations[relation]=predicate
         return relations
 
+    @property
+    def get_inferred_relations(self):
+        """
+        Returns the relations of the nodetype holding by symmetry or
+        transitivity, explicit ones included, by relation type name.
+        The relations of a symmetrical type are stored both ways, so
+        they are listed once, from their left subject.
+        """
+        relations = {}
+        inferred_relations = InferredRelation.objects.filter(
+            Q(left_subject=self.id) | Q(right_subject=self.id)).exclude(
+            left_subject=F('right_subject')).select_related(
+            'relationtype', 'left_subject', 'right_subject')
+        for each in inferred_relations:
+            if each.left_subject_id == self.id:
+                relations.setdefault(each.relationtype.title, []).append(
+                    each.right_subject)
+            elif not each.relationtype.is_symmetrical:
+                relations.setdefault(each.relationtype.inverse, []).append(
+                    each.left_subject)
+        return relations
+
     @property
     def get_rendered_nbh(self):
+        """
+        Returns the neighbourhood of the nodetype, from the cache
+        """
+        return get_rendered_nbh(self)
+
+    def compute_rendered_nbh(self):
         """          
-        Returns the neighbourhood of the nodetype
+        Computes the neighbourhood of the nodetype
         """
         nbh = {}
         nbh['title'] = self.title
@@ -739,8 +677,11 @@ class Nodetype(Node):
         relnvalue={}
         if self.get_relations:
             NTrelns=self.get_relations
+            # Downcast all the related nodes at once
+            refs = dict((node.pk, node) for node in
+                        NID.objects.resolve_many(NTrelns.values()))
             for value in NTrelns:
-                relnvalue[NTrelns[value].title]=NTrelns[value].ref.get_absolute_url()
+                relnvalue[NTrelns[value].title]=refs[NTrelns[value].pk].get_absolute_url()
                 relns[value]=relnvalue
         nbh['relations']=relns
         #get Attributes
@@ -782,7 +723,7 @@ class Nodetype(Node):
     @property
     def word_count(self):
         """Count the words of a nodetype"""
-        return len(strip_tags(self.html_content).split())
+        return self.rendered_content.word_count
 
     @property
     def is_actual(self):
@@ -851,15 +792,15 @@ class Nodetype(Node):
     @property
     def subtypeof_sentence(self):
         "composes the relation as a sentence in triple format."
-        if self.parent:
-            return '%s is a subtype of %s' % (self.title, self.parent.tree_path)
+        if self.parent_id:
+            return '%s is a subtype of %s' % (self.title, self.parent_tree_path)
         return '%s is a root node' % (self.title)
     composed_sentence = property(subtypeof_sentence)
 
     def subtypeof(self):
         "retuns the parent nodetype."
-        if self.parent:
-            return '%s' % (self.parent.tree_path)
+        if self.parent_id:
+            return self.parent_tree_path
         return None 
 
     @models.permalink
@@ -1242,6 +1183,178 @@ class Relation(Edge):
         return '%s as a %s' % (self.right_subject, self.relationtype) 
 
 
+class RelatedNodetype(models.Model):
+    """
+    Nodetypes similar to a nodetype by their content, ranked
+    by decreasing similarity. Computed by gstudio.comparison.
+    """
+    nodetype = models.ForeignKey(Nodetype, related_name='related_nodetypes', verbose_name=_('nodetype'))
+    related = models.ForeignKey(Nodetype, related_name='related_to', verbose_name=_('related nodetype'))
+    score = models.FloatField(_('score'))
+    rank = models.PositiveIntegerField(_('rank'))
+
+    class Meta:
+        ordering = ['nodetype', 'rank']
+        unique_together = (('nodetype', 'related'),)
+        verbose_name = _('related nodetype')
+        verbose_name_plural = _('related nodetypes')
+
+    def __unicode__(self):
+        return '%s ~ %s' % (self.nodetype, self.related)
+
+
+class SearchDocument(models.Model):
+    """
+    Node indexed by the search, with its kind
+    and its number of words.
+    Maintained by gstudio.searchindex.
+    """
+    node = models.OneToOneField(NID, related_name='search_document', verbose_name=_('node'))
+    kind = models.CharField(_('kind'), max_length=50, db_index=True)
+    length = models.PositiveIntegerField(_('length'))
+
+    class Meta:
+        verbose_name = _('search document')
+        verbose_name_plural = _('search documents')
+
+    def __unicode__(self):
+        return unicode(self.node_id)
+
+
+class SearchPosting(models.Model):
+    """
+    Occurrences of a term in a node, the terms of the
+    empty field being the words of its text.
+    Maintained by gstudio.searchindex.
+    """
+    node = models.ForeignKey(NID, related_name='search_postings', verbose_name=_('node'))
+    field = models.CharField(_('field'), max_length=50, blank=True)
+    term = models.CharField(_('term'), max_length=255, db_index=True)
+    frequency = models.PositiveIntegerField(_('frequency'))
+    positions = models.TextField(_('positions'), blank=True)
+
+    class Meta:
+        verbose_name = _('search posting')
+        verbose_name_plural = _('search postings')
+
+    def __unicode__(self):
+        return '%s:%s' % (self.field, self.term)
+
+
+class InferredRelation(models.Model):
+    """
+    Relations holding by the symmetry or the transitivity of
+    their relation type, explicit ones included. Maintained
+    by gstudio.inference, never edited by hand.
+    """
+    left_subject = models.ForeignKey(NID, related_name='inferred_left_subject_of', verbose_name=_('subject name'))
+    relationtype = models.ForeignKey(Relationtype, related_name='inferred_relations', verbose_name=_('relation name'))
+    right_subject = models.ForeignKey(NID, related_name='inferred_right_subject_of', verbose_name=_('object name'))
+
+    class Meta:
+        unique_together = (('left_subject', 'relationtype', 'right_subject'),)
+        verbose_name = _('inferred relation')
+        verbose_name_plural = _('inferred relations')
+
+    def __unicode__(self):
+        return '%s %s %s' % (self.left_subject, self.relationtype, self.right_subject)
+
+
+class AuthorStats(models.Model):
+    """
+    Number and dates of the live nodetypes of an author
+    on a site. Maintained by gstudio.authorstats.
+    """
+    author = models.ForeignKey(User, related_name='publication_stats', verbose_name=_('author'))
+    site = models.ForeignKey(Site, related_name='author_stats', verbose_name=_('site'))
+    published_count = models.PositiveIntegerField(_('published nodetypes'))
+    first_publication = models.DateTimeField(_('first publication'))
+    last_publication = models.DateTimeField(_('last publication'))
+
+    class Meta:
+        unique_together = (('site', 'author'),)
+        verbose_name = _('author statistics')
+        verbose_name_plural = _('author statistics')
+
+    def __unicode__(self):
+        return '%s on %s' % (self.author, self.site)
+
+
+class NodetypePopularity(models.Model):
+    """
+    Number of public comments of a nodetype, in all and
+    over the last day and week. Maintained by gstudio.popularity.
+    """
+    nodetype = models.OneToOneField(Nodetype, related_name='popularity', verbose_name=_('nodetype'))
+    comments_count = models.IntegerField(_('comments'), default=0, db_index=True)
+    day_count = models.IntegerField(_('comments of the day'), default=0, db_index=True)
+    week_count = models.IntegerField(_('comments of the week'), default=0, db_index=True)
+
+    class Meta:
+        verbose_name = _('nodetype popularity')
+        verbose_name_plural = _('nodetype popularities')
+
+    def __unicode__(self):
+        return '%s: %s' % (self.nodetype, self.comments_count)
+
+
+class Discussion(models.Model):
+    """
+    Recent public comment or linkback of a nodetype, listed
+    for the sidebars. Maintained by gstudio.discussions.
+    """
+    comment = models.OneToOneField(comments.get_model(), related_name='gstudio_discussion', verbose_name=_('comment'))
+    nodetype = models.ForeignKey(Nodetype, related_name='discussions_feed', verbose_name=_('nodetype'))
+    kind = models.CharField(_('kind'), max_length=20)
+    submit_date = models.DateTimeField(_('submit date'), db_index=True)
+
+    class Meta:
+        ordering = ['-submit_date']
+        verbose_name = _('discussion')
+        verbose_name_plural = _('discussions')
+
+    def __unicode__(self):
+        return '%s: %s' % (self.kind, self.comment_id)
+
+
+class NodetypeArchive(models.Model):
+    """
+    Number of the live nodetypes created on a day
+    on a site. Maintained by gstudio.archives.
+    """
+    site = models.ForeignKey(Site, related_name='nodetype_archives', verbose_name=_('site'))
+    day = models.DateField(_('day'), db_index=True)
+    count = models.PositiveIntegerField(_('count'))
+
+    class Meta:
+        unique_together = (('site', 'day'),)
+        verbose_name = _('nodetype archive')
+        verbose_name_plural = _('nodetype archives')
+
+    def __unicode__(self):
+        return '%s on %s: %s' % (self.day, self.site, self.count)
+
+
+class TagUsage(models.Model):
+    """
+    Number of the live nodetypes or gbobjects of a tag on a site,
+    and date of the last of them. Maintained by gstudio.tagusage.
+    """
+    tag = models.ForeignKey('tagging.Tag', related_name='usages', verbose_name=_('tag'))
+    content_type = models.ForeignKey(ContentType, verbose_name=_('content type'))
+    site = models.ForeignKey(Site, related_name='tag_usages', verbose_name=_('site'))
+    count = models.PositiveIntegerField(_('count'))
+    last_used = models.DateTimeField(_('last used'))
+
+    class Meta:
+        unique_together = (('content_type', 'site', 'tag'),)
+        verbose_name = _('tag usage')
+        verbose_name_plural = _('tag usages')
+
+    def __unicode__(self):
+        return '%s on %s: %s' % (self.tag_id, self.site, self.count)
+
+
 class Attribute(Edge):
     '''
     Attribute value store for default datatype varchar. Subject can be any of the
@@ -1700,6 +1813,157 @@ post_save.connect(ping_directories_handler, sender=Nodetype,
                   dispatch_uid='gstudio.nodetype.post_save.ping_directories')
 post_save.connect(ping_external_urls_handler, sender=Nodetype,
                   dispatch_uid='gstudio.nodetype.post_save.ping_external_urls')
-
-
-
+post_save.connect(nbh_changed_handler,
+                  dispatch_uid='gstudio.nid.post_save.nbh')
+pre_delete.connect(nbh_changed_handler,
+                   dispatch_uid='gstudio.nid.pre_delete.nbh')
+for model in (Nodetype, Objecttype, Relationtype, Attributetype,
+              Systemtype, Processtype):
+    post_init.connect(nbh_post_init_handler, sender=model,
+                      dispatch_uid='gstudio.%s.post_init.nbh' % \
+                      model._meta.module_name)
+post_save.connect(nbh_author_handler, sender=User,
+                  dispatch_uid='gstudio.user.post_save.nbh')
+for field_name in ('metatypes', 'prior_nodes', 'posterior_nodes', 'authors'):
+    m2m_changed.connect(nbh_m2m_changed_handler,
+                        sender=getattr(Nodetype, field_name).through,
+                        dispatch_uid='gstudio.nodetype.%s.m2m_changed.nbh' % \
+                        field_name)
+request_started.connect(clear_resolver_handler,
+                        dispatch_uid='gstudio.request_started.schema')
+post_save.connect(clear_resolver_handler,
+                  dispatch_uid='gstudio.post_save.schema')
+post_delete.connect(clear_resolver_handler,
+                    dispatch_uid='gstudio.post_delete.schema')
+for model in graph_models():
+    name = model._meta.module_name
+    post_init.connect(graph_post_init_handler, sender=model,
+                      dispatch_uid='gstudio.%s.post_init.graph' % name)
+    post_save.connect(graph_post_save_handler, sender=model,
+                      dispatch_uid='gstudio.%s.post_save.graph' % name)
+    post_delete.connect(graph_post_delete_handler, sender=model,
+                        dispatch_uid='gstudio.%s.post_delete.graph' % name)
+for model in (Relation, Relationtype):
+    name = model._meta.module_name
+    post_init.connect(inference_post_init_handler, sender=model,
+                      dispatch_uid='gstudio.%s.post_init.inference' % name)
+    post_save.connect(inference_post_save_handler, sender=model,
+                      dispatch_uid='gstudio.%s.post_save.inference' % name)
+post_delete.connect(inference_post_delete_handler, sender=Relation,
+                    dispatch_uid='gstudio.relation.post_delete.inference')
+for model in similarity_models():
+    name = model._meta.module_name
+    post_save.connect(similarity_changed_handler, sender=model,
+                      dispatch_uid='gstudio.%s.post_save.similarity' % name)
+    post_delete.connect(similarity_changed_handler, sender=model,
+                        dispatch_uid='gstudio.%s.post_delete.similarity' % \
+                        name)
+m2m_changed.connect(similarity_changed_handler,
+                    sender=Nodetype.sites.through,
+                    dispatch_uid='gstudio.nodetype.sites.m2m_changed.' \
+                    'similarity')
+for model in search_models():
+    name = model._meta.module_name
+    post_init.connect(search_post_init_handler, sender=model,
+                      dispatch_uid='gstudio.%s.post_init.search' % name)
+    post_save.connect(search_post_save_handler, sender=model,
+                      dispatch_uid='gstudio.%s.post_save.search' % name)
+    if issubclass(model, Attribute):
+        post_delete.connect(search_post_delete_handler, sender=model,
+                            dispatch_uid='gstudio.%s.post_delete.search' % \
+                            name)
+post_delete.connect(search_document_post_delete_handler,
+                    sender=SearchDocument,
+                    dispatch_uid='gstudio.searchdocument.post_delete.search')
+for field_name in ('metatypes', 'authors'):
+    m2m_changed.connect(search_m2m_changed_handler,
+                        sender=getattr(Nodetype, field_name).through,
+                        dispatch_uid='gstudio.nodetype.%s.m2m_changed.search' % \
+                        field_name)
+for model in completion_models():
+    name = model._meta.module_name
+    post_init.connect(completion_post_init_handler, sender=model,
+                      dispatch_uid='gstudio.%s.post_init.completion' % name)
+    post_save.connect(completion_post_save_handler, sender=model,
+                      dispatch_uid='gstudio.%s.post_save.completion' % name)
+    post_delete.connect(completion_post_delete_handler, sender=model,
+                        dispatch_uid='gstudio.%s.post_delete.completion' % \
+                        name)
+for model in [Metatype] + nodetype_models():
+    name = model._meta.module_name
+    post_init.connect(snapshot_post_init_handler, sender=model,
+                      dispatch_uid='gstudio.%s.post_init.snapshot' % name)
+    post_save.connect(snapshot_post_save_handler, sender=model,
+                      dispatch_uid='gstudio.%s.post_save.snapshot' % name)
+for model in nodetype_models():
+    name = model._meta.module_name
+    pre_save.connect(publication_pre_save_handler, sender=model,
+                     dispatch_uid='gstudio.%s.pre_save.publication' % name)
+    pre_delete.connect(author_stats_pre_delete_handler, sender=model,
+                       dispatch_uid='gstudio.%s.pre_delete.author_stats' % \
+                       name)
+    post_delete.connect(author_stats_post_delete_handler, sender=model,
+                        dispatch_uid='gstudio.%s.post_delete.author_stats' % \
+                        name)
+    pre_delete.connect(tag_usage_pre_delete_handler, sender=model,
+                       dispatch_uid='gstudio.%s.pre_delete.tag_usage' % name)
+    post_delete.connect(tag_usage_post_delete_handler, sender=model,
+                        dispatch_uid='gstudio.%s.post_delete.tag_usage' % name)
+    post_delete.connect(archives_post_delete_handler, sender=model,
+                        dispatch_uid='gstudio.%s.post_delete.archives' % name)
+for field_name in ('authors', 'sites'):
+    m2m_changed.connect(author_stats_m2m_changed_handler,
+                        sender=getattr(Nodetype, field_name).through,
+                        dispatch_uid='gstudio.nodetype.%s.m2m_changed.' \
+                        'author_stats' % field_name)
+m2m_changed.connect(archives_m2m_changed_handler,
+                    sender=Nodetype.sites.through,
+                    dispatch_uid='gstudio.nodetype.sites.m2m_changed.archives')
+m2m_changed.connect(tag_usage_m2m_changed_handler,
+                    sender=Nodetype.sites.through,
+                    dispatch_uid='gstudio.nodetype.sites.m2m_changed.tag_usage')
+post_save.connect(tag_usage_item_changed_handler, sender=TaggedItem,
+                  dispatch_uid='gstudio.taggeditem.post_save.tag_usage')
+post_delete.connect(tag_usage_item_changed_handler, sender=TaggedItem,
+                    dispatch_uid='gstudio.taggeditem.post_delete.tag_usage')
+for model in similarity_models():
+    name = model._meta.module_name
+    post_save.connect(random_pool_changed_handler, sender=model,
+                      dispatch_uid='gstudio.%s.post_save.random' % name)
+    post_delete.connect(random_pool_changed_handler, sender=model,
+                        dispatch_uid='gstudio.%s.post_delete.random' % name)
+m2m_changed.connect(random_pool_changed_handler,
+                    sender=Nodetype.sites.through,
+                    dispatch_uid='gstudio.nodetype.sites.m2m_changed.random')
+post_init.connect(popularity_post_init_handler, sender=comments.get_model(),
+                  dispatch_uid='gstudio.comment.post_init.popularity')
+post_save.connect(popularity_post_save_handler, sender=comments.get_model(),
+                  dispatch_uid='gstudio.comment.post_save.popularity')
+post_delete.connect(popularity_post_delete_handler,
+                    sender=comments.get_model(),
+                    dispatch_uid='gstudio.comment.post_delete.popularity')
+post_save.connect(discussion_post_save_handler, sender=comments.get_model(),
+                  dispatch_uid='gstudio.comment.post_save.discussion')
+post_save.connect(discussion_flag_changed_handler, sender=CommentFlag,
+                  dispatch_uid='gstudio.commentflag.post_save.discussion')
+post_delete.connect(discussion_flag_changed_handler, sender=CommentFlag,
+                    dispatch_uid='gstudio.commentflag.post_delete.discussion')
+for model in fragment_models():
+    name = model._meta.module_name
+    post_save.connect(fragments_post_save_handler, sender=model,
+                      dispatch_uid='gstudio.%s.post_save.fragments' % name)
+for model in nodetype_models() + fragment_models():
+    name = model._meta.module_name
+    post_delete.connect(fragments_post_delete_handler, sender=model,
+                        dispatch_uid='gstudio.%s.post_delete.fragments' % name)
+for field_name in ('sites', 'metatypes', 'authors'):
+    m2m_changed.connect(fragments_m2m_changed_handler,
+                        sender=getattr(Nodetype, field_name).through,
+                        dispatch_uid='gstudio.nodetype.%s.m2m_changed.' \
+                        'fragments' % field_name)
+for model in [Metatype] + nodetype_models():
+    pre_save.connect(tree_path_pre_save_handler, sender=model,
+                     dispatch_uid='gstudio.%s.pre_save.tree_path' % \
+                     model._meta.module_name)
+post_syncdb.connect(create_indexes_handler,
+                    dispatch_uid='gstudio.post_syncdb.indexes')
@@ -0,0 +1,157 @@
+"""Materialized neighbourhoods for Gstudio
+
+The rendered neighbourhood of a nodetype is stored in the cache,
+one entry per NID, and dropped by signal handlers each time
+one of the nodes it mentions is changed."""
+from django.core.cache import cache
+
+from gstudio.settings import NBH_CACHE_TIMEOUT
+
+NBH_CACHE_KEY = 'gstudio:nbh:%s'
+
+
+def nbh_cache_key(node_id):
+    """Return the cache key of a node's neighbourhood"""
+    return NBH_CACHE_KEY % node_id
+
+
+def get_rendered_nbh(nodetype):
+    """Return the rendered neighbourhood of a nodetype,
+    computing and storing it on a cache miss"""
+    key = nbh_cache_key(nodetype.pk)
+    nbh = cache.get(key)
+    if nbh is None:
+        nbh = nodetype.compute_rendered_nbh()
+        cache.set(key, nbh, NBH_CACHE_TIMEOUT)
+    return nbh
+
+
+def invalidate_nbh(node_ids):
+    """Drop the stored neighbourhoods of the given nodes"""
+    keys = [nbh_cache_key(node_id) for node_id in set(node_ids) if node_id]
+    if keys:
+        cache.delete_many(keys)
+
+
+def nbh_dependents(node):
+    """Return the ids of the nodes whose rendered
+    neighbourhood mentions the given node"""
+    from gstudio.models import Nodetype
+    from gstudio.models import Metatype
+    from gstudio.models import Relation
+    from gstudio.models import Attribute
+    from gstudio.models import Relationtype
+    from gstudio.models import Attributetype
+    from objectapp.models import Gbobject
+
+    ids = set([node.pk])
+
+    if isinstance(node, Relation):
+        ids.update([node.left_subject_id, node.right_subject_id])
+    elif isinstance(node, Attribute):
+        ids.add(node.subject_id)
+    elif isinstance(node, Metatype):
+        ids.update(node.member_types.values_list('pk', flat=True))
+    elif isinstance(node, Gbobject):
+        ids.update(node.objecttypes.values_list('pk', flat=True))
+
+    if isinstance(node, Nodetype):
+        # Parent, children and siblings
+        ids.add(node.parent_id)
+        ids.update(children_ids(node.pk))
+        ids.update(children_ids(node.parent_id))
+        ids.update(node.prior_nodes.values_list('pk', flat=True))
+        ids.update(node.posterior_nodes.values_list('pk', flat=True))
+        # Nodes related to this one
+        ids.update(Relation.objects.filter(left_subject=node.pk).values_list(
+            'right_subject', flat=True))
+        ids.update(Relation.objects.filter(right_subject=node.pk).values_list(
+            'left_subject', flat=True))
+
+    if isinstance(node, Relationtype):
+        ids.update([node.left_subjecttype_id, node.right_subjecttype_id])
+        for left, right in Relation.objects.filter(
+            relationtype=node.pk).values_list('left_subject', 'right_subject'):
+            ids.update([left, right])
+    elif isinstance(node, Attributetype):
+        ids.add(node.subjecttype_id)
+        ids.update(Attribute.objects.filter(attributetype=node.pk).values_list(
+            'subject', flat=True))
+
+    return ids
+
+
+def children_ids(parent_id):
+    """Return the ids of the children of a nodetype,
+    or of the root nodetypes if no parent is given"""
+    from gstudio.models import Nodetype
+    if parent_id:
+        children = Nodetype.objects.filter(parent=parent_id)
+    else:
+        children = Nodetype.objects.filter(parent__isnull=True)
+    return children.values_list('pk', flat=True)
+
+
+def nbh_post_init_handler(sender, **kwargs):
+    """Remember the parent of a loaded nodetype,
+    its former siblings have to be refreshed if it moves"""
+    nodetype = kwargs['instance']
+    nodetype._nbh_old_parent_id = nodetype.parent_id
+
+
+def nbh_changed_handler(sender, **kwargs):
+    """Refresh the neighbourhoods mentioning a node,
+    called after a save and before a deletion"""
+    from gstudio.models import NID
+    node = kwargs['instance']
+
+    if isinstance(node, NID):
+        ids = nbh_dependents(node)
+        old_parent_id = getattr(node, '_nbh_old_parent_id', None)
+        if old_parent_id != getattr(node, 'parent_id', None):
+            ids.add(old_parent_id)
+            ids.update(children_ids(old_parent_id))
+            node._nbh_old_parent_id = node.parent_id
+        invalidate_nbh(ids)
+
+
+def nbh_m2m_changed_handler(sender, **kwargs):
+    """Refresh the neighbourhoods when the members
+    of a many to many relation of a node change"""
+    from gstudio.models import NID
+    instance = kwargs['instance']
+    action = kwargs['action']
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    ids = set()
+    if isinstance(instance, NID):
+        ids.add(instance.pk)
+    if issubclass(kwargs['model'], NID):
+        if action == 'pre_clear':
+            ids.update(m2m_related_ids(instance, sender, kwargs['reverse']))
+        else:
+            ids.update(kwargs['pk_set'] or [])
+    invalidate_nbh(ids)
+
+
+def m2m_related_ids(instance, through, reverse):
+    """Return the ids currently linked to an instance
+    by the many to many relation using the through model"""
+    if reverse:
+        for related in instance._meta.get_all_related_many_to_many_objects():
+            if related.field.rel.through is through:
+                return getattr(instance, related.get_accessor_name(
+                    )).values_list('pk', flat=True)
+    else:
+        for field in instance._meta.many_to_many:
+            if field.rel.through is through:
+                return getattr(instance, field.name).values_list(
+                    'pk', flat=True)
+    return []
+
+
+def nbh_author_handler(sender, **kwargs):
+    """Refresh the neighbourhoods linking to a saved author"""
+    user = kwargs['instance']
+    invalidate_nbh(user.nodetypes.values_list('pk', flat=True))
@@ -0,0 +1,148 @@
+"""Keyset pagination for the nodetype lists of Gstudio
+
+The pages are sought from the (creation_date, id) of the last
+or the first nodetype of the current page, instead of counting
+the whole list and skipping the previous pages with an OFFSET.
+The total of the list is only estimated, when asked for."""
+import re
+from hashlib import md5
+from datetime import datetime
+
+from django.db import connections
+from django.db.models import Q
+from django.core.cache import cache
+from django.core.paginator import InvalidPage
+
+from gstudio.settings import PAGINATION_ESTIMATE
+
+CURSOR_FORMAT = '%Y%m%d%H%M%S%f'
+ESTIMATE_KEY = 'gstudio:pagination:estimate:%s'
+PLANNER_ROWS = re.compile(r'rows=(\d+)')
+
+
+def encode_cursor(nodetype):
+    """Return the cursor of a nodetype"""
+    return '%s-%s' % (nodetype.creation_date.strftime(CURSOR_FORMAT),
+                      nodetype.pk)
+
+
+def decode_cursor(cursor):
+    """Return the (creation_date, id) of a cursor"""
+    try:
+        stamp, pk = cursor.split('-', 1)
+        return datetime.strptime(stamp, CURSOR_FORMAT), int(pk)
+    except ValueError:
+        raise InvalidPage('Invalid cursor %s' % cursor)
+
+
+def estimate_count(queryset, timeout=PAGINATION_ESTIMATE):
+    """Return the estimated number of rows of a queryset, as planned
+    by PostgreSQL or counted once per timeout on other databases"""
+    compiler = queryset.query.get_compiler(queryset.db)
+    sql, params = compiler.as_sql()
+    connection = connections[queryset.db]
+    if 'postgresql' in connection.settings_dict['ENGINE']:
+        cursor = connection.cursor()
+        cursor.execute('EXPLAIN %s' % sql, params)
+        match = PLANNER_ROWS.search(cursor.fetchone()[0])
+        if match:
+            return int(match.group(1))
+
+    key = ESTIMATE_KEY % md5(repr((queryset.db, sql,
+                                   params))).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
+
+
+class KeysetPage(object):
+    """Page of nodetypes sought by keyset"""
+
+    def __init__(self, object_list, paginator, previous, next):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.previous = previous
+        self.next = next
+
+    def __repr__(self):
+        return '<Keyset page of %s objects>' % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next
+
+    def has_previous(self):
+        return self.previous
+
+    def has_other_pages(self):
+        return self.next or self.previous
+
+    @property
+    def number(self):
+        """Number of the page, only known for the first one"""
+        if not self.previous:
+            return 1
+
+    @property
+    def next_cursor(self):
+        """Cursor of the page of older nodetypes"""
+        if self.next:
+            return encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        """Cursor of the page of more recent nodetypes"""
+        if self.previous:
+            return encode_cursor(self.object_list[0])
+
+
+class KeysetPaginator(object):
+    """Paginator seeking the pages of nodetypes
+    ordered by (creation_date, id) descending"""
+
+    def __init__(self, queryset, per_page, estimate=PAGINATION_ESTIMATE):
+        self.queryset = queryset.order_by('-creation_date', '-id')
+        self.per_page = int(per_page)
+        self.estimate = estimate
+        self._count = None
+
+    @property
+    def count(self):
+        """Estimated number of nodetypes,
+        None if the estimates are disabled"""
+        if self.estimate and self._count is None:
+            self._count = estimate_count(self.queryset, self.estimate)
+        return self._count
+
+    def page(self, after=None, before=None):
+        """Return the page of the nodetypes older than
+        the 'after' cursor, or more recent than the 'before'
+        cursor, or the first page"""
+        if before:
+            creation_date, pk = decode_cursor(before)
+            object_list = list(self.queryset.filter(
+                Q(creation_date__gt=creation_date) |
+                Q(creation_date=creation_date, id__gt=pk)).order_by(
+                'creation_date', 'id')[:self.per_page + 1])
+            previous = len(object_list) > self.per_page
+            object_list = object_list[:self.per_page]
+            object_list.reverse()
+            return KeysetPage(object_list, self, previous, bool(object_list))
+
+        queryset = self.queryset
+        if after:
+            creation_date, pk = decode_cursor(after)
+            queryset = queryset.filter(
+                Q(creation_date__lt=creation_date) |
+                Q(creation_date=creation_date, id__lt=pk))
+        object_list = list(queryset[:self.per_page + 1])
+        return KeysetPage(object_list[:self.per_page], self,
+                          bool(after and object_list),
+                          len(object_list) > self.per_page)
@@ -0,0 +1,135 @@
+"""Popularity of the nodetypes of Gstudio
+
+The public comments of each nodetype are counted in the
+NodetypePopularity table, in all and over the last day and week.
+The counters are moved as the comments are posted, moderated and
+deleted, so the most commented nodetypes are read from an index.
+A comment only leaves the day and week windows when the counters
+are compacted, by the compact_popularity command run periodically."""
+from datetime import datetime
+from datetime import timedelta
+
+from django.db.models import F
+from django.db.models import Count
+from django.db.models import get_models
+from django.contrib import comments
+from django.contrib.contenttypes.models import ContentType
+
+WINDOWS = {'day': timedelta(days=1),
+           'week': timedelta(days=7)}
+
+COUNTERS = {'day': 'day_count',
+            'week': 'week_count',
+            'all': 'comments_count'}
+
+
+def nodetype_content_types():
+    """Return the ids of the content types of the nodetypes"""
+    from gstudio.models import Nodetype
+    return [ContentType.objects.get_for_model(model).pk
+            for model in get_models() if issubclass(model, Nodetype)]
+
+
+def counted_nodetype(comment):
+    """Return the id of the nodetype of a public comment,
+    None if the comment is not counted"""
+    if comment.is_public and comment.object_pk and \
+           comment.content_type_id in nodetype_content_types():
+        return int(comment.object_pk)
+
+
+def count_comment(nodetype, comment, delta, now=None):
+    """Add delta to the counters of a nodetype for a comment"""
+    from gstudio.models import NodetypePopularity
+    now = now or datetime.now()
+    counts = {'comments_count': delta}
+    for period, window in WINDOWS.items():
+        if comment.submit_date and comment.submit_date > now - window:
+            counts[COUNTERS[period]] = delta
+
+    popularity = NodetypePopularity.objects.filter(nodetype=nodetype)
+    if not popularity.update(**dict(
+        [(counter, F(counter) + count) for counter, count in counts.items()])):
+        NodetypePopularity.objects.create(nodetype_id=nodetype, **counts)
+
+
+def popular_nodetypes(queryset, period='all'):
+    """Return the nodetypes of a queryset having comments
+    in the period, ordered by their number of comments"""
+    counter = 'popularity__%s' % COUNTERS[period]
+    return queryset.filter(**{'%s__gt' % counter: 0}).order_by(
+        '-%s' % counter, '-pk')
+
+
+def windows_counts(now=None):
+    """Return the {period: {nodetype: count}} of the public
+    comments posted within the day and the week"""
+    now = now or datetime.now()
+    comments_counts = {}
+    for period, window in WINDOWS.items():
+        comments_counts[period] = dict(
+            [(int(pk), count) for pk, count in
+             comments.get_model().objects.filter(
+                 content_type__in=nodetype_content_types(), is_public=True,
+                 submit_date__gt=now - window).values_list(
+                 'object_pk').annotate(count=Count('pk')).order_by()])
+    return comments_counts
+
+
+def compact_popularity(now=None):
+    """Recount the day and week counters, removing the comments
+    out of their windows and the nodetypes not commented anymore"""
+    from gstudio.models import NodetypePopularity
+    comments_counts = windows_counts(now)
+    NodetypePopularity.objects.exclude(day_count=0, week_count=0).update(
+        day_count=0, week_count=0)
+    for period, counts in comments_counts.items():
+        for nodetype, count in counts.items():
+            NodetypePopularity.objects.filter(nodetype=nodetype).update(
+                **{COUNTERS[period]: count})
+    NodetypePopularity.objects.filter(comments_count__lte=0).delete()
+
+
+def rebuild_popularity(now=None):
+    """Recount all the counters from the comments"""
+    from gstudio.models import Nodetype
+    from gstudio.models import NodetypePopularity
+    NodetypePopularity.objects.all().delete()
+    nodetypes = set(Nodetype.objects.values_list('pk', flat=True))
+    for pk, count in comments.get_model().objects.filter(
+        content_type__in=nodetype_content_types(),
+        is_public=True).values_list('object_pk').annotate(
+        count=Count('pk')).order_by():
+        if int(pk) in nodetypes:
+            NodetypePopularity.objects.create(nodetype_id=int(pk),
+                                              comments_count=count)
+    compact_popularity(now)
+
+
+def popularity_post_init_handler(sender, **kwargs):
+    """Remember the counted nodetype of a loaded comment"""
+    instance = kwargs['instance']
+    instance._popularity_nodetype = instance.pk and \
+                                    counted_nodetype(instance)
+
+
+def popularity_post_save_handler(sender, **kwargs):
+    """Count a comment posted, or published or
+    unpublished by the moderation"""
+    instance = kwargs['instance']
+    nodetype = counted_nodetype(instance)
+    previous = getattr(instance, '_popularity_nodetype', None)
+    if previous != nodetype:
+        if previous is not None:
+            count_comment(previous, instance, -1)
+        if nodetype is not None:
+            count_comment(nodetype, instance, 1)
+    instance._popularity_nodetype = nodetype
+
+
+def popularity_post_delete_handler(sender, **kwargs):
+    """Uncount a deleted comment"""
+    instance = kwargs['instance']
+    nodetype = getattr(instance, '_popularity_nodetype', None)
+    if nodetype is not None:
+        count_comment(nodetype, instance, -1)
@@ -0,0 +1,130 @@
+"""Precomputed visibility of the nodetypes and gbobjects
+
+A node is live when it is published and within its publication
+window. The is_live flag is computed when the node is saved, then
+flipped by the publish_scheduled command at the start and at the
+end of the publication windows, so the published nodes are found
+with an indexed equality instead of comparisons with the time."""
+from datetime import datetime
+
+from django.db.models import Q
+from django.db.models import Min
+
+from gstudio.managers import PUBLISHED
+
+
+def is_live(node, now=None):
+    """Check if a node is published and within its publication window"""
+    now = now or datetime.now()
+    return node.status == PUBLISHED and \
+           node.start_publication <= now < node.end_publication
+
+
+def live_q(now):
+    """Creates the Q() object of the nodes live at a date"""
+    return Q(status=PUBLISHED, start_publication__lte=now,
+             end_publication__gt=now)
+
+
+def publication_models():
+    """Return the models having a publication window"""
+    from gstudio.models import Nodetype
+    from objectapp.models import Gbobject
+    return [Nodetype, Gbobject]
+
+
+def refresh_live(queryset, now=None):
+    """Flip the is_live flags of the nodes of a queryset
+    entering or leaving their publication window, updating
+    the statistics of their authors, the usage of their tags,
+    the archives of their days, their fragments, the similarity
+    store and the random pools, and return the number of nodes
+    flipped"""
+    from gstudio.models import Nodetype
+    from gstudio.sampling import reset_random_pools
+    from gstudio.comparison import bump_similarity_version
+    from gstudio.caching import bump_generation
+    from gstudio.fragments import GENERATION_KEY
+    from gstudio.archives import nodetypes_days
+    from gstudio.archives import update_archives
+    from gstudio.tagusage import nodes_tags
+    from gstudio.tagusage import usage_base
+    from gstudio.tagusage import update_tag_usage
+    from gstudio.authorstats import nodetypes_authors
+    from gstudio.authorstats import update_author_stats
+    now = now or datetime.now()
+    entering = list(queryset.filter(live_q(now), is_live=False).values_list(
+        'pk', flat=True))
+    leaving = list(queryset.filter(is_live=True).exclude(
+        live_q(now)).values_list('pk', flat=True))
+    flipped = queryset.filter(pk__in=entering).update(is_live=True) + \
+              queryset.filter(pk__in=leaving).update(is_live=False)
+    if flipped and issubclass(queryset.model, Nodetype):
+        update_author_stats(nodetypes_authors(entering + leaving))
+        update_archives(nodetypes_days(entering + leaving))
+        bump_generation(GENERATION_KEY % 'nodetype')
+        bump_similarity_version()
+        reset_random_pools()
+    if flipped:
+        base = usage_base(queryset.model)
+        update_tag_usage(base, nodes_tags(base, entering + leaving))
+    return flipped
+
+
+def redate_nodes(queryset, date):
+    """Move the nodes of a queryset to a creation date, updating
+    the statistics of their authors, the usage of their tags,
+    the archives of their old and new days and their fragments,
+    and return the number of nodes moved"""
+    from gstudio.models import Nodetype
+    from gstudio.caching import bump_generation
+    from gstudio.fragments import GENERATION_KEY
+    from gstudio.archives import nodetypes_days
+    from gstudio.archives import update_archives
+    from gstudio.tagusage import nodes_tags
+    from gstudio.tagusage import usage_base
+    from gstudio.tagusage import update_tag_usage
+    from gstudio.authorstats import nodetypes_authors
+    from gstudio.authorstats import update_author_stats
+    pks = list(queryset.values_list('pk', flat=True))
+    if issubclass(queryset.model, Nodetype):
+        days = nodetypes_days(pks) | set([date.date()])
+    moved = queryset.model.objects.filter(pk__in=pks).update(
+        creation_date=date)
+    if moved and issubclass(queryset.model, Nodetype):
+        update_author_stats(nodetypes_authors(pks))
+        update_archives(days)
+        bump_generation(GENERATION_KEY % 'nodetype')
+    if moved:
+        base = usage_base(queryset.model)
+        update_tag_usage(base, nodes_tags(base, pks))
+    return moved
+
+
+def update_live(now=None):
+    """Flip the is_live flags of all the nodes"""
+    now = now or datetime.now()
+    return sum([refresh_live(model.objects.all(), now)
+                for model in publication_models()])
+
+
+def next_transition(now=None):
+    """Return the next start or end of a publication window,
+    or None if no node will enter or leave its window"""
+    now = now or datetime.now()
+    dates = []
+    for model in publication_models():
+        dates.append(model.objects.filter(
+            status=PUBLISHED, start_publication__gt=now).aggregate(
+            date=Min('start_publication'))['date'])
+        dates.append(model.objects.filter(
+            is_live=True, end_publication__gt=now).aggregate(
+            date=Min('end_publication'))['date'])
+    dates = [date for date in dates if date is not None]
+    return dates and min(dates) or None
+
+
+def publication_pre_save_handler(sender, **kwargs):
+    """Compute the is_live flag of a node being saved"""
+    instance = kwargs['instance']
+    instance.is_live = is_live(instance)
@@ -0,0 +1,85 @@
+"""Rendered contents of the nodetypes and gbobjects of Gstudio
+
+The HTML of a content is rendered once by its markup language and
+kept in a bounded in-process LRU cache, keyed by the markup language,
+the markdown extensions and the SHA-1 of the content. The word count
+is computed with the HTML, the images and the links on first use,
+so the detail pages, the word counts of the admin, the enclosures of
+the feeds and the external URLs pinger share a single rendering."""
+from hashlib import sha1
+
+from BeautifulSoup import BeautifulSoup
+
+from django.utils.html import strip_tags
+from django.utils.html import linebreaks
+from django.utils.encoding import smart_str
+from django.contrib.markup.templatetags.markup import markdown
+from django.contrib.markup.templatetags.markup import textile
+from django.contrib.markup.templatetags.markup import restructuredtext
+
+from gstudio.caching import LRUCache
+from gstudio.settings import RENDERED_CONTENT_CACHE_SIZE
+
+
+def render_markup(content, markup_language, markdown_extensions):
+    """Return the content formatted by its markup language"""
+    if markup_language == 'markdown':
+        return markdown(content, markdown_extensions)
+    elif markup_language == 'textile':
+        return textile(content)
+    elif markup_language == 'restructuredtext':
+        return restructuredtext(content)
+    elif not '</p>' in content:
+        return linebreaks(content)
+    return content
+
+
+class RenderedContent(object):
+    """HTML of a content, with its word count,
+    the sources of its images and the targets of its links"""
+
+    def __init__(self, html):
+        self.html = html
+        self.word_count = len(strip_tags(html).split())
+        self._images = None
+        self._links = None
+
+    def parse(self):
+        """Extract the images and the links from the HTML,
+        parsed once and not kept"""
+        soup = BeautifulSoup(self.html)
+        self._images = tuple([img['src'] for img in
+                              soup.findAll('img', src=True)])
+        self._links = tuple([a['href'] for a in
+                             soup.findAll('a', href=True)])
+
+    @property
+    def images(self):
+        """Return the sources of the images"""
+        if self._images is None:
+            self.parse()
+        return self._images
+
+    @property
+    def links(self):
+        """Return the targets of the links"""
+        if self._links is None:
+            self.parse()
+        return self._links
+
+
+RENDERED_CONTENTS = LRUCache(RENDERED_CONTENT_CACHE_SIZE)
+
+
+def get_rendered_content(content, markup_language, markdown_extensions=''):
+    """Return the RenderedContent of a content,
+    rendering it only if it is not cached"""
+    content = content or ''
+    key = (markup_language, markdown_extensions,
+           sha1(smart_str(content)).hexdigest())
+    rendered = RENDERED_CONTENTS.get(key)
+    if rendered is None:
+        rendered = RenderedContent(render_markup(
+            content, markup_language, markdown_extensions))
+        RENDERED_CONTENTS.set(key, rendered)
+    return rendered
@@ -0,0 +1,95 @@
+"""Random sampling of the published nodetypes of Gstudio
+
+Only the chosen nodetypes are fetched. Their ids are drawn from
+a pool of the ids of the published nodetypes, cached until a
+nodetype changes or for RANDOM_POOL_TIMEOUT. Beyond RANDOM_POOL_SIZE
+nodetypes, the ids are found by probing their range with indexed
+lookups instead. A seed makes the
+sample reproducible, so a fragment rendered with it can be cached;
+the 'minute' seed changes the sample once per minute."""
+import random
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db.models import Max
+from django.db.models import Min
+from django.contrib.sites.models import Site
+
+from gstudio.settings import RANDOM_POOL_SIZE
+from gstudio.settings import RANDOM_POOL_TIMEOUT
+
+POOL_KEY = 'gstudio:random:pools'
+PROBES_PER_NODETYPE = 3
+
+
+def get_generator(seed=None):
+    """Return a random generator for a seed, 'minute'
+    seeding it with the current minute"""
+    if seed == 'minute':
+        seed = datetime.now().strftime('%Y%m%d%H%M')
+    if seed is None:
+        return random.Random()
+    return random.Random(seed)
+
+
+def get_pool(queryset):
+    """Return the (ids, bounds) of the nodetypes of a queryset,
+    ids being None when there are more than RANDOM_POOL_SIZE of them,
+    cached per site for RANDOM_POOL_TIMEOUT"""
+    site = Site.objects.get_current().pk
+    pools = cache.get(POOL_KEY) or {}
+    if not site in pools:
+        ids = list(queryset.order_by('pk').values_list(
+            'pk', flat=True)[:RANDOM_POOL_SIZE + 1])
+        bounds = None
+        if len(ids) > RANDOM_POOL_SIZE:
+            ids = None
+            bounds = queryset.aggregate(low=Min('pk'), high=Max('pk'))
+            bounds = (bounds['low'], bounds['high'])
+        pools[site] = (ids, bounds)
+        cache.set(POOL_KEY, pools, RANDOM_POOL_TIMEOUT)
+    return pools[site]
+
+
+def probe_ids(queryset, number, bounds, generator):
+    """Return up to number ids of the nodetypes of a queryset,
+    each being the first id after a random point of the bounds"""
+    ids = []
+    low, high = bounds
+    queryset = queryset.order_by('pk').values_list('pk', flat=True)
+    for i in range(number * PROBES_PER_NODETYPE):
+        if len(ids) == number:
+            break
+        point = generator.randint(low, high)
+        found = list(queryset.filter(pk__gte=point)[:1]) or \
+                list(queryset.filter(pk__lt=point).order_by('-pk')[:1])
+        if found and found[0] not in ids:
+            ids.append(found[0])
+    return ids
+
+
+def sample_nodetypes(number, seed=None):
+    """Return number random published nodetypes, in random order"""
+    from gstudio.models import Nodetype
+    if number <= 0:
+        return []
+    queryset = Nodetype.published.all()
+    generator = get_generator(seed)
+    ids, bounds = get_pool(queryset)
+    if ids is not None:
+        ids = generator.sample(ids, min(number, len(ids)))
+    else:
+        ids = probe_ids(queryset, number, bounds, generator)
+    nodetypes = queryset.in_bulk(ids)
+    return [nodetypes[pk] for pk in ids if pk in nodetypes]
+
+
+def reset_random_pools():
+    """Forget the pools of ids of the nodetypes"""
+    cache.delete(POOL_KEY)
+
+
+def random_pool_changed_handler(sender, **kwargs):
+    """Forget the pools of ids after a nodetype
+    or its sites have been saved or deleted"""
+    reset_random_pools()
@@ -0,0 +1,173 @@
+"""Ancestor-aware schema resolution for Gstudio
+
+The attribute types, relation types, attributes and relations
+inherited by a node are resolved from its whole ancestor chain
+with the MPTT fields, in a constant number of queries, and
+memoized for the duration of the current request."""
+from threading import local
+
+from django.db.models import Q
+
+RESOLVERS = local()
+
+
+def get_resolver():
+    """Return the schema resolver of the current thread"""
+    resolver = getattr(RESOLVERS, 'resolver', None)
+    if resolver is None:
+        resolver = RESOLVERS.resolver = SchemaResolver()
+    return resolver
+
+
+def clear_resolver_handler(sender, **kwargs):
+    """Forget the memoized schemas, at the beginning
+    of a request or when the gnowledge base changes"""
+    get_resolver().clear()
+
+
+def ancestors_lookup(nodes):
+    """Return the lookup matching the ancestors of tree nodes"""
+    lookup = Q(pk__in=[])
+    for node in nodes:
+        lookup |= Q(tree_id=node.tree_id, lft__lt=node.lft,
+                    rght__gt=node.rght)
+    return lookup
+
+
+class SchemaResolver(object):
+    """Resolve the schema inherited by the nodes
+    from their ancestors, with a memo"""
+
+    def __init__(self):
+        self.memo = {}
+
+    def clear(self):
+        """Empty the memo"""
+        self.memo = {}
+
+    def memoize(self, kind, node, compute):
+        """Return the memoized value of kind for a node,
+        computing it if needed"""
+        key = (kind, node._meta.app_label, node._meta.module_name, node.pk)
+        if not key in self.memo:
+            self.memo[key] = compute(node)
+        return self.memo[key]
+
+    def ancestors(self, node):
+        """Return the ancestors of a node, nearest first.
+        The ancestors of a gbobject are its objecttypes
+        followed by their own ancestors."""
+        return list(self.memoize('ancestors', node, self.compute_ancestors))
+
+    def compute_ancestors(self, node):
+        """Fetch the ancestors of a node"""
+        if not node.pk:
+            return []
+        if hasattr(node, 'objecttypes'):
+            members = list(node.objecttypes.all())
+            if not members:
+                return []
+            model = members[0]._meta.get_field('parent').rel.to
+            ancestors = model.objects.filter(ancestors_lookup(
+                members)).exclude(pk__in=[m.pk for m in members]).order_by(
+                'tree_id', '-lft')
+            return members + list(ancestors)
+
+        model = node._meta.get_field('parent').rel.to
+        if type(node) is not model:
+            # The subclasses registered in MPTT shadow the tree
+            # fields with their own copies, so use the tree model's
+            node = model.objects.get(pk=node.pk)
+        return list(model.objects.filter(ancestors_lookup(
+            [node])).order_by('-lft'))
+
+    def ancestor_ids(self, node):
+        """Return the ids of the ancestors of a node, nearest first"""
+        return [ancestor.pk for ancestor in self.ancestors(node)]
+
+    def ordered(self, items, field, node):
+        """Sort items linked to the ancestors by the field,
+        nearest ancestor first"""
+        order = dict((pk, index) for index, pk in
+                     enumerate(self.ancestor_ids(node)))
+        return sorted(items, key=lambda item: order[getattr(item, field)])
+
+    def attributetypes(self, node):
+        """Return the attribute types inherited by a node"""
+        return list(self.memoize('attributetypes', node,
+                                 self.compute_attributetypes))
+
+    def compute_attributetypes(self, node):
+        """Fetch the attribute types inherited by a node"""
+        from gstudio.models import Attributetype
+        ids = self.ancestor_ids(node)
+        if not ids:
+            return []
+        return self.ordered(Attributetype.objects.filter(
+            subjecttype__in=ids), 'subjecttype_id', node)
+
+    def attributes(self, node):
+        """Return the attributes of the ancestors of a node"""
+        return list(self.memoize('attributes', node,
+                                 self.compute_attributes))
+
+    def compute_attributes(self, node):
+        """Fetch the attributes of the ancestors of a node"""
+        from gstudio.models import Attribute
+        ids = self.ancestor_ids(node)
+        if not ids:
+            return []
+        return self.ordered(Attribute.objects.filter(subject__in=ids),
+                            'subject_id', node)
+
+    def relations(self, node):
+        """Return the relations of the ancestors of a node,
+        by role"""
+        return self.copy_roles(self.memoize('relations', node,
+                                            self.compute_relations))
+
+    def compute_relations(self, node):
+        """Fetch the relations of the ancestors of a node"""
+        from gstudio.models import Relation
+        return self.split_roles(node, Relation, 'left_subject_id',
+                                'right_subject_id')
+
+    def relationtypes(self, node):
+        """Return the relation types inherited by a node,
+        by role"""
+        return self.copy_roles(self.memoize('relationtypes', node,
+                                            self.compute_relationtypes))
+
+    def compute_relationtypes(self, node):
+        """Fetch the relation types inherited by a node"""
+        from gstudio.models import Relationtype
+        return self.split_roles(node, Relationtype, 'left_subjecttype_id',
+                                'right_subjecttype_id')
+
+    def split_roles(self, node, model, left_field, right_field):
+        """Fetch in one query the instances of model having an
+        ancestor of the node on one of their sides.
+        When the ancestor is on the left side the instance
+        is a possible right role, and vice versa."""
+        roles = {'possible_leftroles': [],
+                 'possible_rightroles': []}
+        ids = self.ancestor_ids(node)
+        if not ids:
+            return roles
+
+        left_lookup = '%s__in' % left_field[:-3]
+        right_lookup = '%s__in' % right_field[:-3]
+        items = list(model.objects.filter(Q(**{left_lookup: ids}) |
+                                          Q(**{right_lookup: ids})))
+        ids = set(ids)
+        roles['possible_rightroles'] = self.ordered(
+            [item for item in items if getattr(item, left_field) in ids],
+            left_field, node)
+        roles['possible_leftroles'] = self.ordered(
+            [item for item in items if getattr(item, right_field) in ids],
+            right_field, node)
+        return roles
+
+    def copy_roles(self, roles):
+        """Copy a dict of roles, to protect the memo"""
+        return dict((role, list(items)) for role, items in roles.items())
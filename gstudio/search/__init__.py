@@ -0,0 +1,240 @@
+"""Search module with complex query parsing for Gstudio
+
+The patterns are parsed with packrat enabled, plain keywords skip
+the grammar, and the parsed patterns are kept in a LRU cache."""
+import re
+import warnings
+
+from pyparsing import Word
+from pyparsing import alphas
+from pyparsing import WordEnd
+from pyparsing import Combine
+from pyparsing import opAssoc
+from pyparsing import Optional
+from pyparsing import OneOrMore
+from pyparsing import StringEnd
+from pyparsing import printables
+from pyparsing import quotedString
+from pyparsing import removeQuotes
+from pyparsing import ParseResults
+from pyparsing import ParserElement
+from pyparsing import CaselessLiteral
+from pyparsing import ParseBaseException
+from pyparsing import operatorPrecedence
+
+from django.utils.importlib import import_module
+from django.core.exceptions import ImproperlyConfigured
+
+from gstudio.caching import LRUCache
+from gstudio.settings import STOP_WORDS
+from gstudio.settings import SEARCH_BACKEND
+from gstudio.settings import SEARCH_PATTERN_CACHE_SIZE
+
+METAS = ('metatype', 'objecttype', 'author', 'tag', 'attr')
+KEYWORDS = re.compile(r'^[\w\s]+$')
+OPERATORS = ('and', 'or')
+
+ParserElement.enablePackrat()
+
+
+class Term(object):
+    """Term of a search pattern, searched in the text of
+    the nodes or in one of their metas"""
+
+    def __init__(self, search, meta=None, wildcards=None):
+        self.search = search
+        self.meta = meta
+        self.wildcards = wildcards
+
+    def __repr__(self):
+        return '<Term %s:%r %s>' % (self.meta, self.search, self.wildcards)
+
+
+class Operation(object):
+    """Operation of a search pattern, 'and', 'or' or 'not',
+    over terms and operations. An empty 'and' matches all."""
+
+    def __init__(self, operator, *operands):
+        self.operator = operator
+        self.operands = operands
+
+    def __repr__(self):
+        return '<Operation %s %s>' % (self.operator, self.operands)
+
+
+EMPTY = Operation('and')
+
+
+def combine(operator, left, right):
+    """Combine two parts of a search pattern"""
+    if left is EMPTY:
+        return right
+    if right is EMPTY:
+        return left
+    return Operation(operator, left, right)
+
+
+def negate(node):
+    """Negate a part of a search pattern"""
+    if node is EMPTY:
+        return EMPTY
+    return Operation('not', node)
+
+
+def createTerm(token):
+    """Creates the Term() object"""
+    meta = getattr(token, 'meta', '').lower() or None
+    query = getattr(token, 'query', '')
+    wildcards = None
+
+    if isinstance(query, basestring):  # Unicode -> Quoted string
+        search = query
+    else:  # List -> No quoted string (possible wildcards)
+        if len(query) == 1:
+            search = query[0]
+        elif len(query) == 3:
+            wildcards = 'BOTH'
+            search = query[1]
+        elif len(query) == 2:
+            if query[0] == '*':
+                wildcards = 'START'
+                search = query[1]
+            else:
+                wildcards = 'END'
+                search = query[0]
+
+    return make_term(search, meta, wildcards)
+
+
+def make_term(search, meta=None, wildcards=None):
+    """Return the Term() object of a search, or EMPTY
+    if the search is ignored"""
+    # Ignore connective words (of, a, an...) and STOP_WORDS
+    if (len(search) < 3 and not search.isdigit()) or \
+           search in STOP_WORDS:
+        return EMPTY
+
+    if meta and not meta in METAS:
+        raise ValueError('Unknown meta %s' % meta)
+    return Term(search, meta, wildcards)
+
+
+def unionTerms(token):
+    """Appends all the Term() objects"""
+    query = EMPTY
+    operation = 'and'
+    negation = False
+
+    for t in token:
+        if type(t) is ParseResults:  # See tokens recursively
+            query = combine('and', query, unionTerms(t))
+        else:
+            if t in ('or', 'and'):  # Set the new op and go to next token
+                operation = t
+            elif t == '-':  # Next tokens needs to be negated
+                negation = True
+            else:  # Append to query the token
+                if negation:
+                    t = negate(t)
+                query = combine(operation, query, t)
+    return query
+
+
+NO_BRTS = printables.replace('(', '').replace(')', '')
+SINGLE = Word(NO_BRTS.replace('*', ''))
+WILDCARDS = Optional('*') + SINGLE + Optional('*') + WordEnd(wordChars=NO_BRTS)
+QUOTED = quotedString.setParseAction(removeQuotes)
+
+OPER_AND = CaselessLiteral('and')
+OPER_OR = CaselessLiteral('or')
+OPER_NOT = '-'
+
+TERM = Combine(Optional(Word(alphas).setResultsName('meta') + ':') +
+               (QUOTED.setResultsName('query') |
+                WILDCARDS.setResultsName('query')))
+TERM.setParseAction(createTerm)
+
+EXPRESSION = operatorPrecedence(TERM, [
+    (OPER_NOT, 1, opAssoc.RIGHT),
+    (OPER_OR, 2, opAssoc.LEFT),
+    (Optional(OPER_AND, default='and'), 2, opAssoc.LEFT)])
+EXPRESSION.setParseAction(unionTerms)
+
+QUERY = OneOrMore(EXPRESSION) + StringEnd()
+QUERY.setParseAction(unionTerms)
+
+
+PATTERNS = LRUCache(SEARCH_PATTERN_CACHE_SIZE)
+
+
+def keywords_pattern(pattern):
+    """Return the terms of a pattern made of plain keywords,
+    all of them matching, or None for other patterns"""
+    if not KEYWORDS.match(pattern):
+        return None
+    words = pattern.split()
+    if [word for word in words if word.lower() in OPERATORS]:
+        return None
+    query = EMPTY
+    for word in words:
+        query = combine('and', query, make_term(word))
+    return query
+
+
+def parse_pattern(pattern):
+    """Parse the grammar of a pattern into terms and operations,
+    raising ParseBaseException or ValueError if invalid"""
+    pattern = ' '.join(pattern.split())
+    query = PATTERNS.get(pattern)
+    if query is None:
+        try:
+            query = keywords_pattern(pattern) or \
+                    QUERY.parseString(pattern)[0]
+        except (ParseBaseException, ValueError), e:
+            query = e
+        PATTERNS.set(pattern, query)
+    if isinstance(query, Exception):
+        raise query
+    return query
+
+
+def search_pattern(pattern):
+    """Parse a pattern, falling back to its keywords
+    any of them matching if it is invalid"""
+    try:
+        return parse_pattern(pattern)
+    except (ParseBaseException, ValueError):
+        return basic_pattern(pattern)
+
+
+def basic_pattern(pattern):
+    """Return the terms of a pattern, any of them matching"""
+    query = EMPTY
+    for search in pattern.split():
+        query = combine('or', query, Term(search))
+    return query
+
+
+def get_search_backend():
+    """Return the selected search backend"""
+    from gstudio.search.backends.database import backend as default_backend
+    try:
+        backend_module = import_module(SEARCH_BACKEND)
+        backend = getattr(backend_module, 'backend')
+    except (ImportError, AttributeError):
+        warnings.warn('%s backend cannot be imported' % SEARCH_BACKEND,
+                      RuntimeWarning)
+        backend = default_backend
+    except ImproperlyConfigured, e:
+        warnings.warn(str(e), RuntimeWarning)
+        backend = default_backend
+
+    return backend
+
+
+def advanced_search(pattern):
+    """Parse the grammar of a pattern
+    and build a queryset with it"""
+    from gstudio.models import Nodetype
+    return get_search_backend()(Nodetype.published.all(),
+                                parse_pattern(pattern))
@@ -0,0 +1,72 @@
+"""Database search backend for Gstudio"""
+from django.db.models import Q
+
+from gstudio.search import Term
+
+LOOKUPS = {'BOTH': 'icontains',
+           'START': 'iendswith',
+           'END': 'istartswith',
+           None: 'iexact'}
+RELATIONS = {'metatype': 'metatypes',
+             'objecttype': 'objecttypes'}
+
+
+def named_q(relation, search, wildcards):
+    """Creates the Q() object matching the title
+    or the slug of the related nodes"""
+    lookup = LOOKUPS[wildcards]
+    return Q(**{'%s__title__%s' % (relation, lookup): search}) | \
+           Q(**{'%s__slug__%s' % (relation, lookup): search})
+
+
+def term_q(term, model=None):
+    """Creates the Q() object of a term, matching
+    nothing if the model lacks the relation searched"""
+    search = term.search
+    wildcards = term.wildcards
+
+    if not term.meta:
+        return Q(content__icontains=search) | \
+               Q(excerpt__icontains=search) | \
+               Q(title__icontains=search)
+
+    if term.meta in RELATIONS:
+        relation = RELATIONS[term.meta]
+        if model is not None and not hasattr(model, relation):
+            return Q(pk__in=[])
+        return named_q(relation, search, wildcards)
+    elif term.meta == 'author':
+        return Q(**{'authors__username__%s' % LOOKUPS[wildcards]: search})
+    elif term.meta == 'tag':  # TODO: tags ignore wildcards
+        return Q(tags__icontains=search)
+    elif term.meta == 'attr':  # The wildcards apply to the value
+        name, equal, value = search.partition('=')
+        if not equal:
+            return Q(**{'subject_of__attributetype__title__%s' %
+                        LOOKUPS[wildcards]: name})
+        return Q(subject_of__attributetype__title__iexact=name,
+                 **{'subject_of__svalue__%s' % LOOKUPS[wildcards]: value})
+
+
+def build_q(node, term_q=term_q):
+    """Creates the Q() object of a parsed pattern,
+    with the Q() objects of its terms"""
+    if isinstance(node, Term):
+        return term_q(node)
+    if node.operator == 'not':
+        return ~build_q(node.operands[0], term_q)
+    if not node.operands:
+        return Q()
+    query = build_q(node.operands[0], term_q)
+    for operand in node.operands[1:]:
+        if node.operator == 'or':
+            query |= build_q(operand, term_q)
+        else:
+            query &= build_q(operand, term_q)
+    return query
+
+
+def backend(queryset, node):
+    """Filter the queryset with LIKE lookups"""
+    return queryset.filter(build_q(
+        node, lambda term: term_q(term, queryset.model))).distinct()
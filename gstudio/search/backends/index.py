@@ -0,0 +1,170 @@
+"""Inverted index search backend for Gstudio
+
+The terms of a pattern are looked up in the postings stored by
+gstudio.searchindex, instead of LIKE scans over the nodes, and
+the nodes are ordered by the BM25 score of the words searched."""
+from math import log
+
+from django.db.models import Q
+from django.db.models import Count
+from django.db import connection
+
+from gstudio.search import Term
+from gstudio.searchindex import TEXT
+from gstudio.searchindex import tokenize
+from gstudio.searchindex import search_stats
+from gstudio.search.backends.database import build_q
+from gstudio.search.backends.database import term_q as database_term_q
+
+K1 = 1.2
+B = 0.75
+# Bounds the nodes whose positions are read to match a phrase, and so
+# the ids matching it, under the SQLite variables limit. A phrase
+# whose rarest word is more frequent is matched by its words only.
+PHRASE_LIMIT = 400
+WILDCARD_LOOKUPS = {'BOTH': 'term__contains',
+                    'START': 'term__endswith',
+                    'END': 'term__startswith'}
+RANK_SQL = 'SELECT COALESCE(SUM((CASE %(term)s %(weights)s ELSE 0 END) * ' \
+           '%(frequency)s * %(k1_1)r / (%(frequency)s + %(k1)r * ' \
+           '(1 - %(b)r + %(b)r * %(length)s / %(average)r))), 0) ' \
+           'FROM %(postings)s INNER JOIN %(documents)s ' \
+           'ON %(document)s = %(node)s WHERE %(node)s = %(pk)s ' \
+           'AND %(field)s = %%s AND %(term)s IN (%(terms)s)'
+
+
+def postings(field, search, wildcards=None):
+    """Return the postings of a term of a field,
+    expanded by its wildcards"""
+    from gstudio.models import SearchPosting
+    lookup = WILDCARD_LOOKUPS.get(wildcards, 'term')
+    return SearchPosting.objects.filter(**{'field': field, lookup: search})
+
+
+def words_q(words):
+    """Creates the Q() object matching the nodes
+    having all the words in their text"""
+    q = Q()
+    for word in set(words):
+        q &= Q(pk__in=postings(TEXT, word).values('node'))
+    return q
+
+
+def phrase_q(words):
+    """Creates the Q() object matching the nodes where the words
+    follow each other, reading the positions of the words in the
+    nodes having the rarest of them only"""
+    from gstudio.models import SearchPosting
+
+    frequencies = dict(SearchPosting.objects.filter(
+        field=TEXT, term__in=set(words)).values_list('term').annotate(
+        Count('node')))
+    if len(frequencies) < len(set(words)):
+        return Q(pk__in=[])
+    rarest = min(words, key=frequencies.get)
+    if frequencies[rarest] > PHRASE_LIMIT:
+        return words_q(words)
+
+    positions = {}
+    for node, word, word_positions in SearchPosting.objects.filter(
+        field=TEXT, term__in=set(words),
+        node__in=postings(TEXT, rarest).values('node')).values_list(
+        'node', 'term', 'positions'):
+        positions.setdefault(node, {})[word] = set(
+            [int(position) for position in word_positions.split(',')])
+    ids = []
+    for node, word_positions in positions.items():
+        if len(word_positions) < len(set(words)):
+            continue
+        for start in word_positions[words[0]]:
+            if all([start + i in word_positions[word]
+                    for i, word in enumerate(words)]):
+                ids.append(node)
+                break
+    return Q(pk__in=ids)
+
+
+def term_q(term):
+    """Creates the Q() object of a term, matching the
+    nodes with its postings"""
+    if term.meta == 'tag':  # Tags are searched as before, in substrings
+        return Q(pk__in=postings(term.meta, term.search.lower(),
+                                 'BOTH').values('node'))
+    if term.meta == 'attr' and not '=' in term.search and \
+           not term.wildcards:  # Any value of the attribute
+        return Q(pk__in=postings(term.meta, term.search.lower() + '=',
+                                 'END').values('node'))
+    if term.meta:
+        return Q(pk__in=postings(term.meta, term.search.lower(),
+                                 term.wildcards).values('node'))
+    words = tokenize(term.search)
+    if not words:  # Punctuation is not indexed
+        return database_term_q(term)
+    if len(words) == 1:
+        return Q(pk__in=postings(TEXT, words[0],
+                                 term.wildcards).values('node'))
+    return phrase_q(words)
+
+
+def ranked_words(node):
+    """Return the words searched by the terms which are not negated"""
+    if isinstance(node, Term):
+        if node.meta or node.wildcards:
+            return set()
+        return set(tokenize(node.search))
+    if node.operator == 'not':
+        return set()
+    words = set()
+    for operand in node.operands:
+        words.update(ranked_words(operand))
+    return words
+
+
+def rank(queryset, words):
+    """Order the queryset by the BM25 score of the words"""
+    from gstudio.models import SearchPosting
+    from gstudio.models import SearchDocument
+
+    if not words:
+        return queryset
+    count, average = search_stats()
+    if not average:
+        return queryset
+    words = sorted(words)
+    frequencies = dict(SearchPosting.objects.filter(
+        field=TEXT, term__in=words).values_list('term').annotate(
+        Count('node')))
+    weights = []
+    for word in words:
+        frequency = frequencies.get(word, 0)
+        weights.append(log(1 + (count - frequency + 0.5) /
+                           (frequency + 0.5)))
+
+    qn = connection.ops.quote_name
+    column = lambda model, name: '%s.%s' % (
+        qn(model._meta.db_table), qn(model._meta.get_field(name).column))
+    select = RANK_SQL % {
+        'term': column(SearchPosting, 'term'),
+        'weights': ' '.join(['WHEN %%s THEN %r' % weight
+                             for weight in weights]),
+        'frequency': column(SearchPosting, 'frequency'),
+        'k1_1': K1 + 1, 'k1': K1, 'b': B,
+        'length': column(SearchDocument, 'length'),
+        'average': average,
+        'postings': qn(SearchPosting._meta.db_table),
+        'documents': qn(SearchDocument._meta.db_table),
+        'document': column(SearchDocument, 'node'),
+        'node': column(SearchPosting, 'node'),
+        'pk': '%s.%s' % (qn(queryset.model._meta.db_table),
+                         qn(queryset.model._meta.pk.column)),
+        'field': column(SearchPosting, 'field'),
+        'terms': ', '.join(['%s'] * len(words))}
+    return queryset.extra(select={'search_rank': select},
+                          select_params=words + [TEXT] + words,
+                          order_by=['-search_rank'])
+
+
+def backend(queryset, node):
+    """Filter the queryset with the postings of
+    the inverted index and rank it with BM25"""
+    return rank(queryset.filter(build_q(node, term_q)), ranked_words(node))
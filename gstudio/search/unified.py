@@ -0,0 +1,65 @@
+"""Unified search over all the nodes indexed by Gstudio
+
+A single query over the NID table finds the published nodetypes
+and gbobjects, the relations and the attributes matching a pattern
+in the inverted index, ranked together with BM25, optionally
+restricted to some kinds of nodes. The kind of the nodes found
+is their facet."""
+from operator import or_
+
+from django.db.models import Q
+from django.db.models import Count
+
+from gstudio.search import search_pattern
+from gstudio.searchindex import KINDS
+from gstudio.searchindex import tokenize
+from gstudio.search.backends.index import rank
+from gstudio.search.backends.index import ranked_words
+from gstudio.search.backends.index import term_q as index_term_q
+from gstudio.search.backends.database import build_q
+
+
+def term_q(term):
+    """Creates the Q() object of a term over all the nodes,
+    matching their titles if the term has no words"""
+    if not term.meta and not tokenize(term.search):
+        return Q(title__icontains=term.search)
+    return index_term_q(term)
+
+
+def searchable_q(kinds=KINDS):
+    """Creates the Q() object of the published nodes of the kinds"""
+    from gstudio.models import Nodetype
+    from objectapp.models import Gbobject
+
+    published = {'nodetype': Nodetype.published.values('pk'),
+                 'gbobject': Gbobject.published.values('pk')}
+    lookups = [kind in published and Q(pk__in=published[kind]) or
+               Q(search_document__kind=kind) for kind in kinds]
+    if not lookups:
+        return Q(pk__in=[])
+    return reduce(or_, lookups)
+
+
+def matching_nodes(node, kinds=KINDS):
+    """Return the published nodes of the kinds
+    matching a parsed pattern, unordered"""
+    from gstudio.models import NID
+    return NID.objects.filter(searchable_q(kinds)).filter(
+        build_q(node, term_q))
+
+
+def search_nodes(pattern, kinds=KINDS):
+    """Return the published nodes of the kinds matching a pattern,
+    ranked by BM25, or by creation date if no words are searched"""
+    node = search_pattern(pattern)
+    return rank(matching_nodes(node, kinds).order_by('-creation_date'),
+                ranked_words(node))
+
+
+def search_facets(pattern, kinds=KINDS):
+    """Return the {kind: count} of the nodes matching a pattern"""
+    from gstudio.models import SearchDocument
+    return dict(SearchDocument.objects.filter(
+        node__in=matching_nodes(search_pattern(pattern), kinds).values(
+        'pk')).values_list('kind').annotate(Count('pk')))
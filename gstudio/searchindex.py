@@ -0,0 +1,282 @@
+"""Inverted index of the nodes searched by Gstudio
+
+The words of the nodetypes, gbobjects, relations and attributes are
+stored in the SearchPosting table, one row per node and word with
+the positions of the word, next to the metatypes, objecttypes,
+authors, tags and 'name=value' attributes of the node stored as
+whole terms of their own field. The kind of each node is kept in its
+SearchDocument. The postings of a node are rewritten each time it
+is saved."""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models import Avg
+from django.db.models import Count
+from django.db import transaction
+from django.core.cache import cache
+from django.utils.html import strip_tags
+
+from tagging.utils import parse_tag_input
+
+from gstudio.settings import SEARCH_STATS_TIMEOUT
+
+TEXT = ''
+WORD = re.compile(r'\w+', re.UNICODE)
+TERM_MAX_LENGTH = 255
+KINDS = ('nodetype', 'gbobject', 'relation', 'attribute')
+STATS_KEY = 'gstudio:search_stats'
+
+
+def tokenize(text):
+    """Return the lowercased words of a text"""
+    return [word[:TERM_MAX_LENGTH] for word in WORD.findall(text.lower())]
+
+
+def node_kind(instance):
+    """Return the kind of a node to index, or None"""
+    from gstudio.models import Nodetype
+    from gstudio.models import Relation
+    from gstudio.models import Attribute
+    from objectapp.models import Gbobject
+
+    for kind, model in zip(KINDS, (Nodetype, Gbobject, Relation, Attribute)):
+        if isinstance(instance, model):
+            return kind
+    return None
+
+
+def is_indexed(instance):
+    """Tell if an instance is a node to index"""
+    return node_kind(instance) is not None
+
+
+def search_models():
+    """Return the models whose changes are indexed,
+    with their subclasses"""
+    from django.contrib.auth.models import User
+    from gstudio.models import Metatype
+    from gstudio.models import Nodetype
+    from gstudio.models import Relation
+    from gstudio.models import Attribute
+
+    models = []
+    pending = [User, Metatype, Nodetype, Relation, Attribute]
+    while pending:
+        model = pending.pop(0)
+        if not model in models:
+            models.append(model)
+            pending.extend(model.__subclasses__())
+    return models
+
+
+def node_text(node):
+    """Return the text of a node, the sentence
+    of a relation or of an attribute"""
+    if node_kind(node) in ('relation', 'attribute'):
+        return unicode(node)
+    return ' '.join([node.title, node.excerpt or '',
+                     strip_tags(node.content or '')])
+
+
+def attribute_term(attribute):
+    """Return the 'name=value' term of an attribute"""
+    return ('%s=%s' % (attribute.attributetype.title,
+                       attribute.svalue)).lower()[:TERM_MAX_LENGTH]
+
+
+def node_fields(node):
+    """Return the {field: terms} of a node, besides its words"""
+    if node_kind(node) in ('relation', 'attribute'):
+        return {}
+    fields = {'author': set([user.username.lower()
+                             for user in node.authors.all()]),
+              'tag': set([tag.lower()[:TERM_MAX_LENGTH]
+                          for tag in parse_tag_input(node.tags)]),
+              'attr': set([attribute_term(attribute) for attribute in
+                           node.subject_of.select_related('attributetype')])}
+    for field, accessor in (('metatype', 'metatypes'),
+                            ('objecttype', 'objecttypes')):
+        if hasattr(node, accessor):
+            fields[field] = set()
+            for member in getattr(node, accessor).all():
+                fields[field].update([member.title.lower(),
+                                      member.slug.lower()])
+    return fields
+
+
+def index_node(node):
+    """Replace the postings of a node"""
+    from gstudio.models import SearchPosting
+    from gstudio.models import SearchDocument
+
+    words = tokenize(node_text(node))
+    positions = {}
+    for position, word in enumerate(words):
+        positions.setdefault(word, []).append(str(position))
+    rows = [(node.pk, TEXT, word, len(word_positions),
+             ','.join(word_positions))
+            for word, word_positions in positions.items()]
+    for field, terms in node_fields(node).items():
+        rows.extend([(node.pk, field, term, 1, '') for term in terms])
+
+    SearchPosting.objects.filter(node=node.pk).delete()
+    qn = connection.ops.quote_name
+    if rows:
+        connection.cursor().executemany(
+            'INSERT INTO %s (%s) VALUES (%%s, %%s, %%s, %%s, %%s)' % (
+                qn(SearchPosting._meta.db_table), ', '.join([
+                    qn(SearchPosting._meta.get_field(name).column)
+                    for name in ('node', 'field', 'term',
+                                 'frequency', 'positions')])),
+            rows)
+        transaction.commit_unless_managed()
+
+    kind = node_kind(node)
+    document, created = SearchDocument.objects.get_or_create(
+        node_id=node.pk, defaults={'length': len(words), 'kind': kind})
+    if created:
+        cache.delete(STATS_KEY)
+    elif (document.length, document.kind) != (len(words), kind):
+        if document.length != len(words):
+            cache.delete(STATS_KEY)
+        document.length = len(words)
+        document.kind = kind
+        document.save()
+
+
+def search_stats():
+    """Return the number of indexed nodes and their average
+    length, kept in the cache until a document changes"""
+    stats = cache.get(STATS_KEY)
+    if stats is None:
+        from gstudio.models import SearchDocument
+        documents = SearchDocument.objects.aggregate(count=Count('pk'),
+                                                     average=Avg('length'))
+        stats = (documents['count'], float(documents['average'] or 0))
+        cache.set(STATS_KEY, stats, SEARCH_STATS_TIMEOUT)
+    return stats
+
+
+def rebuild_search_index():
+    """Index all the nodetypes, gbobjects, relations and attributes"""
+    from gstudio.models import Nodetype
+    from gstudio.models import Relation
+    from gstudio.models import Attribute
+    from objectapp.models import Gbobject
+
+    for model in (Nodetype, Gbobject, Relation, Attribute):
+        for node in model.objects.all().iterator():
+            index_node(node)
+
+
+def index_subjects(ids):
+    """Index the nodes of the ids given, which
+    are the subjects of changed attributes"""
+    from gstudio.models import NID
+    for node in NID.objects.resolve_many(set(ids) - set([None])):
+        if node_kind(node) in ('nodetype', 'gbobject'):
+            index_node(node)
+
+
+def indexed_names(instance):
+    """Return the names of an instance indexed
+    with the nodes it is linked to"""
+    from django.contrib.auth.models import User
+    if isinstance(instance, User):
+        return (instance.username,)
+    return (instance.title, instance.slug)
+
+
+def linked_nodes(instance):
+    """Return the nodes indexed with the names of an instance"""
+    from django.contrib.auth.models import User
+    from gstudio.models import NID
+    from gstudio.models import Metatype
+    from gstudio.models import Nodetype
+    from gstudio.models import Relation
+    from gstudio.models import Attribute
+    if isinstance(instance, User):
+        return list(instance.nodetypes.all()) + \
+               list(instance.gbobjects.all())
+    if isinstance(instance, Metatype):
+        return instance.member_types.all()
+
+    nodes = []
+    if isinstance(instance, Nodetype):
+        nodes.extend(instance.member_objects.all())
+    nodes.extend(Relation.objects.filter(
+        Q(left_subject=instance.pk) | Q(right_subject=instance.pk) |
+        Q(relationtype=instance.pk)))
+    attributes = Attribute.objects.filter(
+        Q(subject=instance.pk) | Q(attributetype=instance.pk))
+    nodes.extend(attributes)
+    nodes.extend([node for node in NID.objects.resolve_many(
+        attributes.filter(attributetype=instance.pk).values_list(
+        'subject', flat=True)) if node_kind(node) in ('nodetype', 'gbobject')])
+    return nodes
+
+
+def search_post_init_handler(sender, **kwargs):
+    """Remember the indexed names of a loaded instance,
+    and the subject of a loaded attribute"""
+    instance = kwargs['instance']
+    instance._search_names = indexed_names(instance)
+    if node_kind(instance) == 'attribute':
+        instance._search_subject = instance.subject_id
+
+
+def search_post_save_handler(sender, **kwargs):
+    """Index a saved node, and the nodes linked
+    to a renamed metatype, nodetype or user"""
+    instance = kwargs['instance']
+    if is_indexed(instance):
+        index_node(instance)
+    if node_kind(instance) == 'attribute':
+        index_subjects([instance.subject_id, getattr(
+            instance, '_search_subject', None)])
+        instance._search_subject = instance.subject_id
+
+    names = indexed_names(instance)
+    old_names = not kwargs['created'] and \
+                getattr(instance, '_search_names', None) or names
+    instance._search_names = names
+    if old_names != names:
+        for node in linked_nodes(instance):
+            index_node(node)
+
+
+def search_post_delete_handler(sender, **kwargs):
+    """Index the subject of a deleted attribute"""
+    index_subjects([kwargs['instance'].subject_id])
+
+
+def search_m2m_changed_handler(sender, **kwargs):
+    """Index the nodes whose metatypes, objecttypes
+    or authors have changed"""
+    from gstudio.neighbourhood import m2m_related_ids
+
+    instance = kwargs['instance']
+    action = kwargs['action']
+    if not kwargs['reverse']:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            index_node(instance)
+        return
+
+    if action == 'pre_clear':
+        instance._search_cleared = list(m2m_related_ids(instance, sender,
+                                                        True))
+        return
+    if action in ('post_add', 'post_remove'):
+        ids = kwargs['pk_set'] or []
+    elif action == 'post_clear':
+        ids = getattr(instance, '_search_cleared', [])
+    else:
+        return
+    for node in kwargs['model'].objects.filter(pk__in=list(ids)):
+        index_node(node)
+
+
+def search_document_post_delete_handler(sender, **kwargs):
+    """Forget the statistics of the documents when one is deleted"""
+    cache.delete(STATS_KEY)
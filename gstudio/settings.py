@@ -10,6 +10,8 @@ SAVE_PING_EXTERNAL_URLS = getattr(settings, 'GSTUDIO_PING_EXTERNAL_URLS', True)
 COPYRIGHT = getattr(settings, 'GSTUDIO_COPYRIGHT', 'Gstudio')
 
 PAGINATION = getattr(settings, 'GSTUDIO_PAGINATION', 10)
+PAGINATION_KEYSET = getattr(settings, 'GSTUDIO_PAGINATION_KEYSET', False)
+PAGINATION_ESTIMATE = getattr(settings, 'GSTUDIO_PAGINATION_ESTIMATE', 0)
 ALLOW_EMPTY = getattr(settings, 'GSTUDIO_ALLOW_EMPTY', True)
 ALLOW_FUTURE = getattr(settings, 'GSTUDIO_ALLOW_FUTURE', True)
 
@@ -53,8 +55,23 @@ FEEDS_MAX_ITEMS = getattr(settings, 'GSTUDIO_FEEDS_MAX_ITEMS', 15)
 PINGBACK_CONTENT_LENGTH = getattr(settings,
                                   'GSTUDIO_PINGBACK_CONTENT_LENGTH', 300)
 
+NBH_CACHE_TIMEOUT = getattr(settings, 'GSTUDIO_NBH_CACHE_TIMEOUT',
+                            60 * 60 * 24)
+
+FRAGMENT_CACHE_TIMEOUT = getattr(settings, 'GSTUDIO_FRAGMENT_CACHE_TIMEOUT',
+                                 60 * 60)
+
+GRAPH_MAX_DEPTH = getattr(settings, 'GSTUDIO_GRAPH_MAX_DEPTH', 3)
+GRAPH_MAX_NODES = getattr(settings, 'GSTUDIO_GRAPH_MAX_NODES', 500)
+GRAPH_MAX_EDGES = getattr(settings, 'GSTUDIO_GRAPH_MAX_EDGES', 2000)
+GRAPH_INDEX_COMPACT_AFTER = getattr(settings,
+                                    'GSTUDIO_GRAPH_INDEX_COMPACT_AFTER', 1000)
+
 F_MIN = getattr(settings, 'GSTUDIO_F_MIN', 0.1)
 F_MAX = getattr(settings, 'GSTUDIO_F_MAX', 1.0)
+SIMILAR_NODETYPES = getattr(settings, 'GSTUDIO_SIMILAR_NODETYPES', 10)
+SIMILARITY_CACHE_TIMEOUT = getattr(settings,
+                                   'GSTUDIO_SIMILARITY_CACHE_TIMEOUT', 3600)
 
 SPAM_CHECKER_BACKENDS = getattr(settings, 'GSTUDIO_SPAM_CHECKER_BACKENDS',
                                 ())
@@ -62,6 +79,25 @@ SPAM_CHECKER_BACKENDS = getattr(settings, 'GSTUDIO_SPAM_CHECKER_BACKENDS',
 URL_SHORTENER_BACKEND = getattr(settings, 'GSTUDIO_URL_SHORTENER_BACKEND',
                                 'gstudio.url_shortener.backends.default')
 
+SEARCH_BACKEND = getattr(settings, 'GSTUDIO_SEARCH_BACKEND',
+                         'gstudio.search.backends.index')
+SEARCH_PATTERN_CACHE_SIZE = getattr(settings,
+                                    'GSTUDIO_SEARCH_PATTERN_CACHE_SIZE', 512)
+SEARCH_STATS_TIMEOUT = getattr(settings, 'GSTUDIO_SEARCH_STATS_TIMEOUT',
+                               60 * 60)
+RENDERED_CONTENT_CACHE_SIZE = getattr(settings,
+                                      'GSTUDIO_RENDERED_CONTENT_CACHE_SIZE',
+                                      256)
+
+COMPLETION_LIMIT = getattr(settings, 'GSTUDIO_COMPLETION_LIMIT', 10)
+
+PUBLICATION_INTERVAL = getattr(settings, 'GSTUDIO_PUBLICATION_INTERVAL', 300)
+
+RANDOM_POOL_SIZE = getattr(settings, 'GSTUDIO_RANDOM_POOL_SIZE', 10000)
+RANDOM_POOL_TIMEOUT = getattr(settings, 'GSTUDIO_RANDOM_POOL_TIMEOUT', 300)
+
+DISCUSSIONS_SIZE = getattr(settings, 'GSTUDIO_DISCUSSIONS_SIZE', 1000)
+
 STOP_WORDS = getattr(settings, 'GSTUDIO_STOP_WORDS',
                      ('able', 'about', 'across', 'after', 'all', 'almost',
                       'also', 'among', 'and', 'any', 'are', 'because', 'been',
@@ -1,13 +1,13 @@
 """Sitemaps for Gstudio"""
+from django.contrib.sites.models import Site
 from django.contrib.sitemaps import Sitemap
 from django.core.urlresolvers import reverse
 
-from tagging.models import TaggedItem
-
 from gstudio.models import Nodetype
 from gstudio.models import Author
 from gstudio.models import Metatype
-from gstudio.managers import tags_published
+from gstudio.models import AuthorStats
+from gstudio.tagusage import tags_usage
 
 
 class NodetypeSitemap(Sitemap):
@@ -66,15 +66,15 @@ class AuthorSitemap(Sitemap):
     changefreq = 'monthly'
 
     def items(self):
-        """Return published authors"""
+        """Return published authors, caching their last publication"""
+        self.cache_authors = dict(AuthorStats.objects.filter(
+            site=Site.objects.get_current()).values_list(
+            'author', 'last_publication'))
         return Author.published.all()
 
     def lastmod(self, obj):
         """Return last modification of an author"""
-        nodetypes = obj.nodetypes_published()
-        if not nodetypes:
-            return None
-        return nodetypes[0].creation_date
+        return self.cache_authors.get(obj.pk)
 
     def location(self, obj):
         """Return url of an author"""
@@ -90,20 +90,17 @@ class TagSitemap(Sitemap):
         len_nodetypes = float(Nodetype.published.count())
         self.cache_tags = {}
         for tag in tags:
-            nodetypes = TaggedItem.objects.get_by_model(
-                Nodetype.published.all(), tag)
-            self.cache_tags[tag.pk] = (nodetypes, nodetypes.count() / len_nodetypes)
+            self.cache_tags[tag.pk] = (tag.last_used, tag.count / len_nodetypes)
 
     def items(self):
         """Return all tags with coeff"""
-        tags = tags_published()
+        tags = tags_usage(Nodetype)
         self.cache(tags)
         return tags
 
     def lastmod(self, obj):
         """Return last modification of a tag"""
-        nodetypes = self.cache_tags[obj.pk][0]
-        return nodetypes[0].creation_date
+        return self.cache_tags[obj.pk][0]
 
     def priority(self, obj):
         """Compute priority with cached coeffs"""
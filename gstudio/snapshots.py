@@ -0,0 +1,71 @@
+"""Snapshots of the loaded nodes of Gstudio
+
+The denormalized tables and caches of the nodes are updated when a
+saved node differs from the node loaded, on a few of its fields.
+Instead of a post_init and a post_save handler of each of them per
+model, a single post_init handler keeps these fields in one snapshot
+of the node, and a single post_save handler gives the snapshot to the
+update functions listed by snapshot_updates."""
+
+SNAPSHOT_FIELDS = ('is_live', 'creation_date', 'featured',
+                   'status', 'tree_path')
+
+
+def nodetype_models():
+    """Return the Nodetype model and its subclasses"""
+    from gstudio.models import Nodetype
+    from gstudio.models import Objecttype
+    from gstudio.models import Processtype
+    from gstudio.models import Systemtype
+    from gstudio.models import Relationtype
+    from gstudio.models import Attributetype
+    return [Nodetype, Objecttype, Relationtype, Attributetype,
+            Systemtype, Processtype]
+
+
+def snapshot_updates(model):
+    """Return the functions updating the denormalizations
+    of the nodes of a model from their snapshot"""
+    from gstudio.models import Nodetype
+    from gstudio.models import Metatype
+    from gstudio.archives import archives_saved
+    from gstudio.tagusage import tag_usage_saved
+    from gstudio.fragments import fragments_saved
+    from gstudio.treepaths import tree_path_saved
+    from gstudio.authorstats import author_stats_saved
+
+    if issubclass(model, Nodetype):
+        return (author_stats_saved, tag_usage_saved, archives_saved,
+                fragments_saved, tree_path_saved)
+    if issubclass(model, Metatype):
+        return (tree_path_saved,)
+    return (tag_usage_saved,)
+
+
+def take_snapshot(instance):
+    """Return the fields of a node read by the denormalizations"""
+    return dict([(field, getattr(instance, field, None))
+                 for field in SNAPSHOT_FIELDS])
+
+
+def changed(instance, previous, *fields):
+    """Tell if some fields of a node differ from its snapshot,
+    always the case without a snapshot"""
+    return previous is None or [previous[field] for field in fields] != \
+           [getattr(instance, field, None) for field in fields]
+
+
+def snapshot_post_init_handler(sender, **kwargs):
+    """Take the snapshot of a loaded node"""
+    instance = kwargs['instance']
+    instance._snapshot = take_snapshot(instance)
+
+
+def snapshot_post_save_handler(sender, **kwargs):
+    """Update the denormalizations of a saved node
+    from its snapshot, then take a new one"""
+    instance = kwargs['instance']
+    previous = getattr(instance, '_snapshot', None)
+    for update in snapshot_updates(sender):
+        update(sender, instance, kwargs.get('created'), previous)
+    instance._snapshot = take_snapshot(instance)
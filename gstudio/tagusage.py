@@ -0,0 +1,159 @@
+"""Usage of the tags of the nodetypes and gbobjects of Gstudio
+
+The number of live nodes of each tag on each site, with the date of
+the last of them, are stored in the TagUsage table, apart for the
+nodetypes and for the gbobjects. The rows of a tag are recomputed
+when it is added to or removed from a node, and the rows of the tags
+of a node when it is saved, deleted, flipped by the publication
+scheduler or published on other sites, so the published tags are
+read with their counts and their dates in a single indexed query."""
+from django.db.models import Max
+from django.db.models import Count
+from django.db.models import get_models
+from django.contrib.sites.models import Site
+from django.contrib.contenttypes.models import ContentType
+
+from tagging.models import Tag
+from tagging.models import TaggedItem
+
+from gstudio.snapshots import changed
+
+
+def tag_usage_models():
+    """Return the base models of the nodes whose tags are counted"""
+    from gstudio.models import Nodetype
+    from objectapp.models import Gbobject
+    return [Nodetype, Gbobject]
+
+
+def usage_base(model):
+    """Return the base model counting the tags of a model"""
+    for base in tag_usage_models():
+        if issubclass(model, base):
+            return base
+
+
+def tagged_content_types(base):
+    """Return the ids of the content types of a base model
+    and of its subclasses"""
+    return [ContentType.objects.get_for_model(model).pk
+            for model in get_models() if issubclass(model, base)]
+
+
+def nodes_tags(base, nodes):
+    """Return the ids of the tags of the nodes of a base model"""
+    return set(TaggedItem.objects.filter(
+        content_type__in=tagged_content_types(base),
+        object_id__in=list(nodes)).values_list('tag', flat=True))
+
+
+def update_tag_usage(base, tags):
+    """Recompute the usage of the tags by the nodes of a base model"""
+    from gstudio.models import TagUsage
+    tags = list(set(tags))
+    if not tags:
+        return
+    content_type = ContentType.objects.get_for_model(base)
+    TagUsage.objects.filter(content_type=content_type,
+                            tag__in=tags).delete()
+    items = TaggedItem.objects.filter(
+        content_type__in=tagged_content_types(base))
+    for tag in tags:
+        rows = base.objects.filter(
+            is_live=True, pk__in=items.filter(tag=tag).values(
+                'object_id')).values('sites').annotate(
+            count=Count('pk'), last=Max('creation_date')).order_by()
+        for row in rows:
+            if row['sites'] is not None:
+                TagUsage.objects.create(
+                    tag_id=tag, content_type=content_type,
+                    site_id=row['sites'], count=row['count'],
+                    last_used=row['last'])
+
+
+def rebuild_tag_usage():
+    """Recompute the usage of all the tags"""
+    from gstudio.models import TagUsage
+    TagUsage.objects.all().delete()
+    for base in tag_usage_models():
+        update_tag_usage(base, TaggedItem.objects.filter(
+            content_type__in=tagged_content_types(base)).values_list(
+            'tag', flat=True).distinct())
+
+
+def published_tags(base):
+    """Return the tags of the live nodes of a base model
+    on the current site"""
+    return Tag.objects.filter(
+        usages__content_type=ContentType.objects.get_for_model(base),
+        usages__site=Site.objects.get_current())
+
+
+def tags_usage(base):
+    """Return the tags of the live nodes of a base model on the
+    current site by name, with their count and last_used date"""
+    from gstudio.models import TagUsage
+    tags = []
+    for usage in TagUsage.objects.filter(
+        content_type=ContentType.objects.get_for_model(base),
+        site=Site.objects.get_current()).select_related(
+        'tag').order_by('tag__name'):
+        tag = usage.tag
+        tag.count = usage.count
+        tag.last_used = usage.last_used
+        tags.append(tag)
+    return tags
+
+
+def tag_usage_item_changed_handler(sender, **kwargs):
+    """Update the usage of a tag added to or removed from a node"""
+    instance = kwargs['instance']
+    for base in tag_usage_models():
+        if instance.content_type_id in tagged_content_types(base):
+            update_tag_usage(base, [instance.tag_id])
+
+
+def tag_usage_saved(sender, instance, created, previous):
+    """Update the usage of the tags of a node saved
+    live or not anymore, or with a new date"""
+    if not created and changed(instance, previous,
+                               'is_live', 'creation_date'):
+        base = usage_base(sender)
+        update_tag_usage(base, nodes_tags(base, [instance.pk]))
+
+
+def tag_usage_pre_delete_handler(sender, **kwargs):
+    """Remember the tags of a node being deleted"""
+    instance = kwargs['instance']
+    instance._tag_usage_tags = nodes_tags(usage_base(sender), [instance.pk])
+
+
+def tag_usage_post_delete_handler(sender, **kwargs):
+    """Update the usage of the tags of a deleted node"""
+    instance = kwargs['instance']
+    update_tag_usage(usage_base(sender),
+                     getattr(instance, '_tag_usage_tags', []))
+
+
+def tag_usage_m2m_changed_handler(sender, **kwargs):
+    """Update the usage of the tags of the nodes
+    published on other sites, from either side"""
+    instance = kwargs['instance']
+    pk_set = kwargs['pk_set']
+    base = [base for base in tag_usage_models()
+            if sender is base.sites.through][0]
+    if isinstance(instance, base):
+        tags = nodes_tags(base, [instance.pk])
+    elif pk_set is not None:
+        tags = nodes_tags(base, pk_set)
+    else:
+        tags = nodes_tags(base, base.objects.filter(
+            sites=instance).values_list('pk', flat=True))
+
+    # The rows removed are only known before the change
+    if kwargs['action'].startswith('pre_'):
+        instance._tag_usage_tags = tags
+        return
+    tags |= getattr(instance, '_tag_usage_tags', set())
+    instance._tag_usage_tags = set()
+    update_tag_usage(base, tags)
@@ -1,20 +1,12 @@
 """Template tags and filters for Gstudio"""
 from hashlib import md5
-from random import sample
 from urllib import urlencode
 from datetime import datetime
 
-from django.db.models import Q
-from django.db import connection
 from django.template import Node
 from django.template import Library
 from django.template import TemplateSyntaxError
-from django.contrib.comments.models import CommentFlag
-from django.contrib.contenttypes.models import ContentType
-from django.utils.encoding import smart_unicode
-from django.contrib.comments import get_model as get_comment_model
 
-from tagging.models import Tag
 from tagging.utils import calculate_cloud
 
 from gstudio.models import Nodetype
@@ -24,20 +16,25 @@ from gstudio.models import Metatype
 from gstudio.gnowql import get_node
 
 from gstudio.managers import tags_published
-from gstudio.comparison import VectorBuilder
-from gstudio.comparison import pearson_score
+from gstudio.tagusage import tags_usage
+from gstudio.settings import SIMILAR_NODETYPES
+from gstudio.archives import archive_dates
+from gstudio.pagination import KeysetPage
+from gstudio.sampling import sample_nodetypes
+from gstudio.popularity import popular_nodetypes
+from gstudio.discussions import COMMENT
+from gstudio.discussions import LINKBACK
+from gstudio.discussions import recent_discussions
+from gstudio.comparison import get_related_nodetypes
+from gstudio.comparison import compute_related_nodetypes
 from gstudio.templatetags.zcalendar import GstudioCalendar
+from gstudio.templatetags.zfragments import fragment_tag
 from gstudio.templatetags.zbreadcrumbs import retrieve_breadcrumbs
 
 register = Library()
 
-VECTORS = None
-VECTORS_FACTORY = lambda: VectorBuilder(Nodetype.published.all(),
-                                        ['title', 'excerpt', 'content'])
-CACHE_NODETYPES_RELATED = {}
 
-
-@register.inclusion_tag('gstudio/tags/dummy.html')
+@fragment_tag(register, ['metatype', 'nodetype'])
 def get_metatypes(template='gstudio/tags/metatypes.html'):
     """Return the metatypes"""
     return {'template': template,
@@ -50,21 +47,21 @@ def get_metatypes(template='gstudio/tags/metatypes.html'):
 #            'subtypes': Nodetype.tree.all()}
 
 
-@register.inclusion_tag('gstudio/tags/dummy.html')
+@fragment_tag(register, ['authorstats'])
 def get_authors(template='gstudio/tags/authors.html'):
     """Return the published authors"""
     return {'template': template,
             'authors': Author.published.all()}
 
 
-@register.inclusion_tag('gstudio/tags/dummy.html')
+@fragment_tag(register, ['nodetype'])
 def get_recent_nodetypes(number=5, template='gstudio/tags/recent_nodetypes.html'):
     """Return the most recent nodetypes"""
     return {'template': template,
             'nodetypes': Nodetype.published.all()[:number]}
 
 
-@register.inclusion_tag('gstudio/tags/dummy.html')
+@fragment_tag(register, ['nodetype'])
 def get_featured_nodetypes(number=5,
                          template='gstudio/tags/featured_nodetypes.html'):
     """Return the featured nodetypes"""
@@ -73,114 +70,79 @@ def get_featured_nodetypes(number=5,
 
 
 @register.inclusion_tag('gstudio/tags/dummy.html')
-def get_random_nodetypes(number=5, template='gstudio/tags/random_nodetypes.html'):
-    """Return random nodetypes"""
-    nodetypes = Nodetype.published.all()
-    if number > len(nodetypes):
-        number = len(nodetypes)
+def get_random_nodetypes(number=5, template='gstudio/tags/random_nodetypes.html',
+                         seed=None):
+    """Return random nodetypes, the same ones for a same seed,
+    or for the current minute if the seed is 'minute'"""
     return {'template': template,
-            'nodetypes': sample(nodetypes, number)}
+            'nodetypes': sample_nodetypes(number, seed)}
 
 
 @register.inclusion_tag('gstudio/tags/dummy.html')
-def get_popular_nodetypes(number=5, template='gstudio/tags/popular_nodetypes.html'):
-    """Return popular  nodetypes"""
-    ctype = ContentType.objects.get_for_model(Nodetype)
-    query = """SELECT object_pk, COUNT(*) AS score
-    FROM %s
-    WHERE content_type_id = %%s
-    AND is_public = '1'
-    GROUP BY object_pk
-    ORDER BY score DESC""" % get_comment_model()._meta.db_table
-
-    cursor = connection.cursor()
-    cursor.execute(query, [ctype.id])
-    object_ids = [int(row[0]) for row in cursor.fetchall()]
-
-    # Use ``in_bulk`` here instead of an ``id__in`` filter, because ``id__in``
-    # would clobber the ordering.
-    object_dict = Nodetype.published.in_bulk(object_ids)
-
+def get_popular_nodetypes(number=5, template='gstudio/tags/popular_nodetypes.html',
+                          period='all'):
+    """Return the nodetypes most commented in all,
+    or over the last 'day' or 'week'"""
     return {'template': template,
-            'nodetypes': [object_dict[object_id]
-                        for object_id in object_ids
-                        if object_id in object_dict][:number]}
+            'nodetypes': list(popular_nodetypes(
+                Nodetype.published.all(), period)[:number])}
 
 
 @register.inclusion_tag('gstudio/tags/dummy.html', takes_context=True)
 def get_similar_nodetypes(context, number=5,
                         template='gstudio/tags/similar_nodetypes.html',
                         flush=False):
-    """Return similar nodetypes"""
-    global VECTORS
-    global CACHE_NODETYPES_RELATED
-
-    if VECTORS is None or flush:
-        VECTORS = VECTORS_FACTORY()
-        CACHE_NODETYPES_RELATED = {}
-
-    def compute_related(object_id, dataset):
-        """Compute related nodetypes to a nodetype with a dataset"""
-        object_vector = None
-        for nodetype, e_vector in dataset.items():
-            if nodetype.pk == object_id:
-                object_vector = e_vector
-
-        if not object_vector:
-            return []
-
-        nodetype_related = {}
-        for nodetype, e_vector in dataset.items():
-            if nodetype.pk != object_id:
-                score = pearson_score(object_vector, e_vector)
-                if score:
-                    nodetype_related[nodetype] = score
-
-        related = sorted(nodetype_related.items(), key=lambda(k, v): (v, k))
-        return [rel[0] for rel in related]
-
+    """Return similar nodetypes, as stored by
+    the compute_related_nodetypes command and cached"""
     object_id = context['object'].pk
-    columns, dataset = VECTORS()
-    key = '%s-%s' % (object_id, VECTORS.key)
-    if not key in CACHE_NODETYPES_RELATED.keys():
-        CACHE_NODETYPES_RELATED[key] = compute_related(object_id, dataset)
+    if flush:
+        compute_related_nodetypes([object_id],
+                                  max(number, SIMILAR_NODETYPES))
 
-    nodetypes = CACHE_NODETYPES_RELATED[key][:number]
+    nodetypes = get_related_nodetypes(object_id, number)
     return {'template': template,
             'nodetypes': nodetypes}
 
 
-@register.inclusion_tag('gstudio/tags/dummy.html')
+@fragment_tag(register, ['nodetypearchive'])
 def get_archives_nodetypes(template='gstudio/tags/archives_nodetypes.html'):
     """Return archives nodetypes"""
     return {'template': template,
-            'archives': Nodetype.published.dates('creation_date', 'month',
-                                              order='DESC')}
+            'archives': archive_dates('month', order='DESC')}
 
 
-@register.inclusion_tag('gstudio/tags/dummy.html')
+@fragment_tag(register, ['nodetypearchive'])
 def get_archives_nodetypes_tree(
     template='gstudio/tags/archives_nodetypes_tree.html'):
     """Return archives nodetypes as a Tree"""
     return {'template': template,
-            'archives': Nodetype.published.dates('creation_date', 'day',
-                                              order='ASC')}
+            'archives': archive_dates('day', order='ASC')}
 
 
-@register.inclusion_tag('gstudio/tags/dummy.html', takes_context=True)
-def get_calendar_nodetypes(context, year=None, month=None,
-                         template='gstudio/tags/calendar.html'):
-    """Return an HTML calendar of nodetypes"""
+def calendar_arguments(context, year=None, month=None,
+                       template='gstudio/tags/calendar.html'):
+    """Return the year, the month and the template of the
+    calendar of nodetypes, the month defaulting to the one
+    of the context"""
     if not year or not month:
         date_month = context.get('month') or context.get('day') or \
                      getattr(context.get('object'), 'creation_date', None) or \
                      datetime.today()
         year, month = date_month.timetuple()[:2]
+    return year, month, template
+
 
+@fragment_tag(register, ['nodetypearchive'], takes_context=True,
+              vary=calendar_arguments)
+def get_calendar_nodetypes(context, year=None, month=None,
+                         template='gstudio/tags/calendar.html'):
+    """Return an HTML calendar of nodetypes"""
+    year, month, template = calendar_arguments(context, year, month,
+                                               template)
     calendar = GstudioCalendar()
     current_month = datetime(year, month, 1)
 
-    dates = list(Nodetype.published.dates('creation_date', 'month'))
+    dates = archive_dates('month')
 
     if not current_month in dates:
         dates.append(current_month)
@@ -199,50 +161,35 @@ def get_calendar_nodetypes(context, year=None, month=None,
 @register.inclusion_tag('gstudio/tags/dummy.html')
 def get_recent_comments(number=5, template='gstudio/tags/recent_comments.html'):
     """Return the most recent comments"""
-    # Using map(smart_unicode... fix bug related to issue #8554
-    nodetype_published_pks = map(smart_unicode,
-                              Nodetype.published.values_list('id', flat=True))
-    content_type = ContentType.objects.get_for_model(Nodetype)
-
-    comments = get_comment_model().objects.filter(
-        Q(flags=None) | Q(flags__flag=CommentFlag.MODERATOR_APPROVAL),
-        content_type=content_type, object_pk__in=nodetype_published_pks,
-        is_public=True).order_by('-submit_date')[:number]
-
     return {'template': template,
-            'comments': comments}
+            'comments': recent_discussions(COMMENT, number)}
 
 
 @register.inclusion_tag('gstudio/tags/dummy.html')
 def get_recent_linkbacks(number=5,
                          template='gstudio/tags/recent_linkbacks.html'):
     """Return the most recent linkbacks"""
-    nodetype_published_pks = map(smart_unicode,
-                              Nodetype.published.values_list('id', flat=True))
-    content_type = ContentType.objects.get_for_model(Nodetype)
-
-    linkbacks = get_comment_model().objects.filter(
-        content_type=content_type,
-        object_pk__in=nodetype_published_pks,
-        flags__flag__in=['pingback', 'trackback'],
-        is_public=True).order_by(
-        '-submit_date')[:number]
-
     return {'template': template,
-            'linkbacks': linkbacks}
+            'linkbacks': recent_discussions(LINKBACK, number)}
 
 
 @register.inclusion_tag('gstudio/tags/dummy.html', takes_context=True)
 def gstudio_pagination(context, page, begin_pages=3, end_pages=3,
                       before_pages=2, after_pages=2,
-                      template='gstudio/tags/pagination.html'):
+                      template='gstudio/tags/pagination.html',
+                      keyset_template='gstudio/tags/keyset_pagination.html'):
     """Return a Digg-like pagination, by splitting long list of page
-    into 3 blocks of pages"""
+    into 3 blocks of pages, or the previous and next links
+    of a page sought by keyset"""
     GET_string = ''
     for key, value in context['request'].GET.items():
-        if key != 'page':
+        if key not in ('page', 'after', 'before'):
             GET_string += '&%s=%s' % (key, value)
 
+    if isinstance(page, KeysetPage):
+        return {'template': keyset_template, 'page': page,
+                'GET_string': GET_string}
+
     begin = page.paginator.page_range[:begin_pages]
     end = page.paginator.page_range[-end_pages:]
     middle = page.paginator.page_range[max(page.number - before_pages - 1, 0):
@@ -326,10 +273,8 @@ def get_tags(parser, token):
     return TagsNode(bits[2])
 
 
-@register.inclusion_tag('gstudio/tags/dummy.html')
+@fragment_tag(register, ['tagusage'])
 def get_tag_cloud(steps=6, template='gstudio/tags/tag_cloud.html'):
     """Return a cloud of published tags"""
-    tags = Tag.objects.usage_for_queryset(
-        Nodetype.published.all(), counts=True)
     return {'template': template,
-            'tags': calculate_cloud(tags, steps)}
+            'tags': calculate_cloud(tags_usage(Nodetype), steps)}
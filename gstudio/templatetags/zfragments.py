@@ -0,0 +1,66 @@
+"""Fragment module for Gstudio templatetags"""
+from inspect import getargspec
+
+from django.template import Node
+from django.template import Context
+from django.template import Variable
+from django.template import TemplateSyntaxError
+from django.template.loader import get_template
+
+from gstudio.fragments import render_fragment
+
+
+class FragmentNode(Node):
+    """Node rendering an inclusion tag through the fragment cache"""
+
+    def __init__(self, func, file_name, dependencies,
+                 takes_context, vary, variables):
+        self.func = func
+        self.file_name = file_name
+        self.dependencies = dependencies
+        self.takes_context = takes_context
+        self.vary = vary
+        self.variables = variables
+
+    def render(self, context):
+        args = [variable.resolve(context) for variable in self.variables]
+        if self.takes_context:
+            args.insert(0, context)
+        key_args = self.vary and self.vary(*args) or args
+
+        def render():
+            data = self.func(*args)
+            html = get_template(self.file_name).render(
+                Context(data, autoescape=context.autoescape))
+            return html, data
+
+        return render_fragment(self.func.__name__, key_args,
+                               self.dependencies, render)
+
+
+def fragment_tag(register, dependencies, file_name='gstudio/tags/dummy.html',
+                 takes_context=False, vary=None):
+    """Register an inclusion tag rendered as a cached fragment,
+    depending on the dependencies and varying on its arguments,
+    or on what vary returns for them"""
+
+    def decorator(func):
+        params, varargs, varkw, defaults = getargspec(func)
+        if takes_context:
+            params = params[1:]
+        required = len(params) - len(defaults or ())
+
+        def compile_func(parser, token):
+            bits = token.split_contents()
+            if not required <= len(bits) - 1 <= len(params):
+                raise TemplateSyntaxError(
+                    '%s takes from %s to %s arguments' % (
+                        bits[0], required, len(params)))
+            return FragmentNode(func, file_name, dependencies,
+                                takes_context, vary,
+                                [Variable(bit) for bit in bits[1:]])
+
+        register.tag(func.__name__, compile_func)
+        return func
+
+    return decorator
@@ -25,7 +25,29 @@ from gstudio.tests.templatetags import TemplateTagsTestCase  # ~0.4s
 from gstudio.tests.moderator import NodetypeCommentModeratorTestCase  # ~0.1s
 from gstudio.tests.spam_checker import SpamCheckerTestCase
 from gstudio.tests.url_shortener import URLShortenerTestCase
+from gstudio.tests.neighbourhood import NeighbourhoodTestCase
+from gstudio.tests.schema import SchemaResolverTestCase
+from gstudio.tests.nid import NIDTestCase
+from gstudio.tests.egonet import EgonetTestCase
+from gstudio.tests.graphindex import GraphIndexTestCase
+from gstudio.tests.inference import InferenceTestCase
+from gstudio.tests.search import SearchIndexTestCase
+from gstudio.tests.search import UnifiedSearchTestCase
+from gstudio.tests.pagination import KeysetPaginationTestCase
+from gstudio.tests.completion import CompletionIndexTestCase
+from gstudio.tests.publication import PublicationTestCase
+from gstudio.tests.queryplans import QueryPlansTestCase
+from gstudio.tests.authorstats import AuthorStatsTestCase
+from gstudio.tests.popularity import PopularityTestCase
+from gstudio.tests.sampling import SamplingTestCase
+from gstudio.tests.discussions import DiscussionsTestCase
+from gstudio.tests.tagusage import TagUsageTestCase
+from gstudio.tests.archives import ArchivesTestCase
+from gstudio.tests.fragments import FragmentsTestCase
+from gstudio.tests.treepaths import TreePathsTestCase
+from gstudio.tests.rendering import RenderingTestCase
 from gstudio.signals import disconnect_gstudio_signals
+from objectapp.signals import disconnect_objectapp_signals
 # TOTAL ~ 6.6s
 
 
@@ -43,10 +65,22 @@ def suite():
                   TemplateTagsTestCase, QuickNodetypeTestCase,
                   URLShortenerTestCase, NodetypeCommentModeratorTestCase,
                   GstudioCustomDetailViews, SpamCheckerTestCase,
-                  NodetypeAdminTestCase, MetatypeAdminTestCase)
+                  NodetypeAdminTestCase, MetatypeAdminTestCase,
+                  NeighbourhoodTestCase, SchemaResolverTestCase,
+                  NIDTestCase, EgonetTestCase, GraphIndexTestCase,
+                  InferenceTestCase, SearchIndexTestCase,
+                  UnifiedSearchTestCase, KeysetPaginationTestCase,
+                  CompletionIndexTestCase, PublicationTestCase,
+                  AuthorStatsTestCase,
+                  PopularityTestCase, SamplingTestCase,
+                  DiscussionsTestCase, TagUsageTestCase,
+                  ArchivesTestCase, FragmentsTestCase,
+                  TreePathsTestCase, RenderingTestCase)
 
     if 'django_xmlrpc' in settings.INSTALLED_APPS:
         test_cases += (PingBackTestCase, MetaWeblogTestCase)
+    if getattr(settings, 'GSTUDIO_TEST_QUERY_PLANS', False):
+        test_cases += (QueryPlansTestCase,)  # ~100k rows per test
 
     for test_class in test_cases:
         tests = loader.loadTestsFromTestCase(test_class)
@@ -55,3 +89,4 @@ def suite():
     return suite
 
 disconnect_gstudio_signals()
+disconnect_objectapp_signals()
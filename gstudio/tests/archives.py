@@ -0,0 +1,102 @@
+"""Test cases for Gstudio's date archives"""
+from datetime import datetime
+from datetime import timedelta
+
+from django.test import TestCase
+from django.contrib.sites.models import Site
+
+from gstudio.models import Objecttype
+from gstudio.models import NodetypeArchive
+from gstudio.managers import DRAFT
+from gstudio.managers import PUBLISHED
+from gstudio.publication import update_live
+from gstudio.publication import redate_nodes
+from gstudio.archives import archive_dates
+from gstudio.archives import rebuild_archives
+
+
+class ArchivesTestCase(TestCase):
+    """Test cases for the date archives of the nodetypes"""
+    urls = 'gstudio.tests.urls'
+
+    def setUp(self):
+        self.now = datetime.now()
+        self.site = Site.objects.get_current()
+        self.other_site = Site.objects.create(domain='http://domain.com',
+                                              name='Domain.com')
+        self.first = self.create_nodetype(
+            'first', creation_date=datetime(2010, 1, 1, 10))
+        self.second = self.create_nodetype(
+            'second', creation_date=datetime(2010, 1, 1, 20))
+        self.third = self.create_nodetype(
+            'third', creation_date=datetime(2011, 3, 15))
+
+    def create_nodetype(self, slug, **kwargs):
+        params = {'title': slug, 'slug': slug, 'content': slug,
+                  'status': PUBLISHED,
+                  'start_publication': self.now - timedelta(days=1)}
+        params.update(kwargs)
+        nodetype = Objecttype.objects.create(**params)
+        nodetype.sites.add(self.site)
+        return nodetype
+
+    def counts(self, site=None):
+        return list(NodetypeArchive.objects.filter(
+            site=site or self.site).order_by('day').values_list(
+            'day', 'count'))
+
+    def test_archive_dates(self):
+        self.assertEquals(self.counts(),
+                          [(datetime(2010, 1, 1).date(), 2),
+                           (datetime(2011, 3, 15).date(), 1)])
+        self.assertEquals(archive_dates('month', order='DESC'),
+                          [datetime(2011, 3, 1), datetime(2010, 1, 1)])
+        self.assertEquals(archive_dates('day', day__year=2011),
+                          [datetime(2011, 3, 15)])
+
+    def test_save_and_delete(self):
+        self.second.status = DRAFT
+        self.second.save()
+        self.assertEquals(self.counts()[0][1], 1)
+        self.first.creation_date = datetime(2011, 3, 15, 12)
+        self.first.save()
+        self.assertEquals(archive_dates('day'), [datetime(2011, 3, 15)])
+        self.third.delete()
+        self.assertEquals(self.counts(),
+                          [(datetime(2011, 3, 15).date(), 1)])
+
+    def test_sites_and_scheduler(self):
+        self.first.sites.add(self.other_site)
+        self.assertEquals(self.counts(self.other_site),
+                          [(datetime(2010, 1, 1).date(), 1)])
+        self.site.nodetypes.clear()
+        self.assertEquals(archive_dates('month'), [])
+        self.create_nodetype('fourth', creation_date=datetime(2012, 1, 1),
+                             start_publication=self.now + timedelta(days=1))
+        self.assertEquals(archive_dates('month'), [])
+        update_live(self.now + timedelta(days=2))
+        self.assertEquals(archive_dates('month'), [datetime(2012, 1, 1)])
+
+    def test_redate_nodes(self):
+        self.assertEquals(redate_nodes(Objecttype.objects.filter(
+            creation_date__year=2010), datetime(2011, 3, 15, 12)), 2)
+        self.assertEquals(self.counts(),
+                          [(datetime(2011, 3, 15).date(), 3)])
+
+    def test_date_based_views(self):
+        response = self.client.get('/2010/')
+        self.assertEquals(response.context['date_list'],
+                          [datetime(2010, 1, 1)])
+        self.assertEquals(response.context['year'], '2010')
+        self.assertEquals(len(response.context['object_list']), 2)
+        response = self.client.get('/2010/01/')
+        self.assertEquals(len(response.context['object_list']), 2)
+        self.assertEquals(list(response.context['date_list']),
+                          [datetime(2010, 1, 1)])
+        response = self.client.get('/2010/13/')
+        self.assertEquals(response.status_code, 404)
+
+    def test_rebuild_archives(self):
+        NodetypeArchive.objects.all().delete()
+        rebuild_archives()
+        self.assertEquals(len(self.counts()), 2)
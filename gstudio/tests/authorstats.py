@@ -0,0 +1,93 @@
+"""Test cases for Gstudio's author statistics"""
+from datetime import datetime
+from datetime import timedelta
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.contrib.sites.models import Site
+
+from gstudio.models import Author
+from gstudio.models import Objecttype
+from gstudio.models import AuthorStats
+from gstudio.managers import DRAFT
+from gstudio.managers import PUBLISHED
+from gstudio.publication import update_live
+from gstudio.authorstats import rebuild_author_stats
+
+
+class AuthorStatsTestCase(TestCase):
+    """Test cases for the statistics of the authors"""
+
+    def setUp(self):
+        self.now = datetime.now()
+        self.site = Site.objects.get_current()
+        self.other_site = Site.objects.create(domain='http://domain.com',
+                                              name='Domain.com')
+        self.webmaster = User.objects.create_user(
+            username='webmaster', email='webmaster@example.com')
+        self.contributor = User.objects.create_user(
+            username='contributor', email='contributor@example.com')
+        self.first = self.create_nodetype(
+            'first', creation_date=datetime(2010, 1, 1))
+        self.second = self.create_nodetype(
+            'second', creation_date=datetime(2011, 1, 1))
+        self.first.authors.add(self.webmaster)
+        self.second.authors.add(self.webmaster, self.contributor)
+
+    def create_nodetype(self, slug, **kwargs):
+        params = {'title': slug, 'slug': slug, 'content': slug,
+                  'status': PUBLISHED,
+                  'start_publication': self.now - timedelta(days=1)}
+        params.update(kwargs)
+        nodetype = Objecttype.objects.create(**params)
+        nodetype.sites.add(self.site)
+        return nodetype
+
+    def stats(self, author, site=None):
+        stats = AuthorStats.objects.get(author=author,
+                                        site=site or self.site)
+        return (stats.published_count, stats.first_publication,
+                stats.last_publication)
+
+    def test_m2m_changes(self):
+        self.assertEquals(self.stats(self.webmaster),
+                          (2, datetime(2010, 1, 1), datetime(2011, 1, 1)))
+        self.assertEquals(self.stats(self.contributor),
+                          (1, datetime(2011, 1, 1), datetime(2011, 1, 1)))
+        self.second.authors.remove(self.contributor)
+        self.assertEquals(Author.published.count(), 1)
+        self.second.sites.add(self.other_site)
+        self.assertEquals(self.stats(self.webmaster, self.other_site),
+                          (1, datetime(2011, 1, 1), datetime(2011, 1, 1)))
+        self.site.nodetypes.clear()
+        self.assertEquals(Author.published.count(), 0)
+        self.contributor.nodetypes.add(self.first)
+        self.first.sites.add(self.site)
+        self.assertEquals(self.stats(self.contributor),
+                          (1, datetime(2010, 1, 1), datetime(2010, 1, 1)))
+
+    def test_save_and_delete(self):
+        self.second.status = DRAFT
+        self.second.save()
+        self.assertEquals(self.stats(self.webmaster),
+                          (1, datetime(2010, 1, 1), datetime(2010, 1, 1)))
+        self.assertEquals([author.username for author in
+                           Author.published.all()], ['webmaster'])
+        self.first.delete()
+        self.assertEquals(Author.published.count(), 0)
+
+    def test_publication_scheduler(self):
+        third = self.create_nodetype(
+            'third', creation_date=datetime(2012, 1, 1),
+            start_publication=self.now + timedelta(days=1))
+        third.authors.add(self.contributor)
+        self.assertEquals(self.stats(self.contributor)[0], 1)
+        update_live(self.now + timedelta(days=2))
+        self.assertEquals(self.stats(self.contributor),
+                          (2, datetime(2011, 1, 1), datetime(2012, 1, 1)))
+
+    def test_rebuild_author_stats(self):
+        AuthorStats.objects.all().delete()
+        rebuild_author_stats()
+        self.assertEquals(AuthorStats.objects.count(), 2)
+        self.assertEquals(self.stats(self.webmaster)[0], 2)
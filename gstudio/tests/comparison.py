@@ -1,15 +1,38 @@
 """Test cases for Gstudio's comparison"""
+from datetime import datetime
+
 from django.test import TestCase
+from django.core.cache import cache
+from django.contrib.sites.models import Site
+from django.core.management import call_command
 
 from gstudio.models import Nodetype
+from gstudio.models import RelatedNodetype
+from gstudio.managers import PUBLISHED
 from gstudio.comparison import pearson_score
 from gstudio.comparison import VectorBuilder
 from gstudio.comparison import ClusteredModel
+from gstudio.comparison import STORE_KEY
+from gstudio.comparison import STORE_CHUNK
+from gstudio.comparison import STORE_FIELDS
+from gstudio.comparison import DocumentStore
+from gstudio.comparison import SimilarityEngine
+from gstudio.comparison import load_document_store
+from gstudio.comparison import get_similarity_engine
+from gstudio.comparison import get_related_nodetypes
+from gstudio.comparison import get_similarity_version
+from gstudio.comparison import compute_related_nodetypes
 
 
 class ComparisonTestCase(TestCase):
     """Test cases for comparison tools"""
 
+    def setUp(self):
+        cache.delete(STORE_KEY)
+
+    def tearDown(self):
+        cache.delete(STORE_KEY)
+
     def test_pearson_score(self):
         self.assertEquals(pearson_score([42], [42]), 0.0)
         self.assertEquals(pearson_score([0, 1, 2], [0, 1, 2]), 0.0)
@@ -48,3 +71,124 @@ class ComparisonTestCase(TestCase):
                                     'second', '2', 'first'])
         self.assertEquals(dataset.values(), [[1, 1, 1, 1, 1, 0, 0, 1],
                                              [0, 0, 0, 0, 0, 1, 1, 0]])
+
+    def create_published(self, slug, content):
+        nodetype = Nodetype.objects.create(title=slug, slug=slug,
+                                           content=content,
+                                           status=PUBLISHED)
+        nodetype.sites.add(Site.objects.get_current())
+        return nodetype
+
+    def test_similarity_engine(self):
+        first = self.create_published('first', 'a b c d')
+        second = self.create_published('second', 'a b c e')
+        third = self.create_published('third', 'e f g h')
+        store = DocumentStore(['content'])
+        store.refresh(Nodetype.published)
+        engine = SimilarityEngine(store)
+        scores = engine.correlations(range(len(engine.ids)))
+        for i in range(len(engine.ids)):
+            for j in range(len(engine.ids)):
+                self.assertAlmostEquals(
+                    scores[i, j], 1.0 - pearson_score(
+                        engine.matrix[i].toarray()[0],
+                        engine.matrix[j].toarray()[0]))
+        related = engine.related(first.pk, 5)
+        self.assertEquals([pk for pk, score in related],
+                          [second.pk, third.pk])
+        self.assertTrue(related[0][1] > related[1][1])
+        self.assertEquals(engine.related(first.pk, 1), related[:1])
+        self.assertEquals(dict(engine.all_related(5))[first.pk], related)
+        self.assertEquals(engine.related(0, 5), [])
+
+    def test_similarity_engine_without_documents(self):
+        store = DocumentStore(['content'])
+        store.refresh(Nodetype.published)
+        engine = SimilarityEngine(store)
+        self.assertEquals(engine.ids, [])
+        self.assertEquals(engine.related(1, 5), [])
+        self.assertEquals(list(engine.all_related(5)), [])
+
+    def test_compute_related_nodetypes(self):
+        first = self.create_published('first', 'a b c d')
+        second = self.create_published('second', 'a b c e')
+        self.create_published('third', 'e f g h')
+        call_command('compute_related_nodetypes', verbosity=0)
+        self.assertEquals(RelatedNodetype.objects.count(), 6)
+        related = RelatedNodetype.objects.filter(nodetype=first)
+        self.assertEquals([(r.related, r.rank) for r in related],
+                          [(second, 0), (related[1].related, 1)])
+
+    def test_document_store(self):
+        first = self.create_published('first', 'a b c d')
+        second = self.create_published('second', 'a b c e')
+        store = DocumentStore(['content'])
+        refresh = lambda: store.refresh(Nodetype.published)
+        self.assertNumQueries(2, refresh)
+        frequencies = lambda: dict(
+            (word, store.frequencies[column])
+            for word, column in store.vocabulary.items()
+            if store.frequencies[column])
+        self.assertEquals(frequencies(), {'a': 2, 'b': 2, 'c': 2,
+                                          'd': 1, 'e': 1})
+        self.assertNumQueries(0, refresh)
+
+        version = get_similarity_version()
+        first.content = 'a a f'
+        first.last_update = datetime(2020, 1, 1)
+        first.save()
+        self.assertNotEquals(get_similarity_version(), version)
+        self.assertTrue(refresh())
+        self.assertEquals(frequencies(), {'a': 2, 'b': 1, 'c': 1,
+                                          'e': 1, 'f': 1})
+        self.assertEquals(store.documents[first.pk][1],
+                          {store.vocabulary['a']: 2,
+                           store.vocabulary['f']: 1})
+
+        second.delete()
+        self.assertTrue(refresh())
+        self.assertEquals(frequencies(), {'a': 1, 'f': 1})
+        self.assertEquals(store.documents.keys(), [first.pk])
+
+        second = self.create_published('second', 'b')
+        self.assertNumQueries(2, refresh)
+        second.save()
+        self.assertNumQueries(1, refresh)
+
+    def test_document_store_prune(self):
+        store = DocumentStore(['content'])
+        store.add(1, None, 'a b c d')
+        store.add(2, None, 'a e')
+        store.remove(1)
+        store.prune()
+        self.assertEquals(sorted(store.vocabulary), ['a', 'e'])
+        self.assertEquals(store.frequencies, [1, 1])
+        self.assertEquals(store.word_counts(2), {'a': 1, 'e': 1})
+        self.assertEquals(store.dump([0, 1]), {0: {2: (None, {'a': 1,
+                                                              'e': 1})},
+                                               1: {}})
+
+    def test_get_similarity_engine(self):
+        first = self.create_published('first', 'a b c d')
+        self.assertEquals(get_similarity_engine().ids,
+                          load_document_store(STORE_FIELDS).documents.keys())
+        self.assertNumQueries(0, get_similarity_engine)
+        second = self.create_published('second', 'a b c e')
+        self.assertEquals(len(get_similarity_engine().ids), 2)
+        store = load_document_store(STORE_FIELDS)
+        self.assertEquals(store.word_counts(second.pk),
+                          {'a': 1, 'b': 1, 'c': 1, 'e': 1})
+        self.assertEquals(sorted(cache.get(STORE_KEY)['chunks']), sorted(
+            set([first.pk // STORE_CHUNK, second.pk // STORE_CHUNK])))
+
+    def test_get_related_nodetypes(self):
+        first = self.create_published('first', 'a b c d')
+        second = self.create_published('second', 'a b c e')
+        self.assertEquals(get_related_nodetypes(first.pk, 5), [])
+        compute_related_nodetypes([first.pk])
+        self.assertEquals(get_related_nodetypes(first.pk, 5), [second])
+        self.assertNumQueries(0, lambda: get_related_nodetypes(first.pk, 5))
+        second.title = 'Second'
+        second.save()
+        self.assertEquals(get_related_nodetypes(first.pk, 5)[0].title,
+                          'Second')
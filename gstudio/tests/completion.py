@@ -0,0 +1,134 @@
+"""Test cases for Gstudio's completion index"""
+import json
+
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.core.management import call_command
+
+from gstudio.models import Metatype
+from gstudio.models import Objecttype
+from gstudio import completion
+from gstudio.completion import INDEX
+from gstudio.completion import GENERATION_KEY
+from gstudio.completion import CompletionIndex
+from gstudio.completion import completion_keys
+from gstudio.completion import get_completion_index
+from gstudio.completion import rebuild_completion_index
+from gstudio.caching import get_generation
+from gstudio.caching import publish_change
+from gstudio.caching import bump_generation
+from gstudio.views.ajaxviews import complete
+
+
+class CompletionIndexTestCase(TestCase):
+    """Test cases for the in-memory completion index"""
+
+    def setUp(self):
+        INDEX['index'] = None
+        self.animal = Objecttype.objects.create(
+            title='Animal', slug='animal', content='Animal',
+            plural='Animals', altnames='beast, "living being"')
+        self.ant = Objecttype.objects.create(
+            title='Ant', slug='ant', content='Ant', rating_score=8)
+        self.metatype = Metatype.objects.create(title='Anatomy',
+                                                slug='anatomy')
+
+    def tearDown(self):
+        INDEX['index'] = None
+
+    def titles(self, prefix, limit=10):
+        return [title for pk, title in
+                get_completion_index().complete(prefix, limit)]
+
+    def test_completion_keys(self):
+        self.assertEquals(completion_keys(u'The  Cat', 'kitty, "tom cat"',
+                                          None),
+                          set([u'the cat', u'kitty', u'tom cat']))
+
+    def test_complete(self):
+        self.assertEquals(self.titles('an'), ['Ant', 'Anatomy', 'Animal'])
+        self.assertEquals(self.titles('AN', 1), ['Ant'])
+        self.assertEquals(self.titles('anim'), ['Animal'])
+        self.assertEquals(self.titles('living b'), ['Animal'])
+        self.assertEquals(self.titles('be'), ['Animal'])
+        self.assertEquals(self.titles('bird'), [])
+        self.assertEquals(self.titles(' '), [])
+
+    def test_blocks(self):
+        self.assertEquals(completion.COMPLETION_BLOCK, 128)
+        completion.COMPLETION_BLOCK = 2
+        try:
+            index = CompletionIndex([(i, 'Node %02i' % i,
+                                      set(['node %02i' % i]), i % 3)
+                                     for i in range(10)])
+            self.assertEquals(len(index.blocks), 5)
+            self.assertEquals([pk for pk, title in
+                               index.complete('node', 4)], [2, 5, 8, 1])
+            self.assertEquals([pk for pk, title in
+                               index.complete('node 0', 3)], [2, 5, 8])
+            for i in range(10, 20):
+                index.add(i, 'Node %02i' % i, set(['node %02i' % i]), 5)
+            self.assertEquals([pk for pk, title in
+                               index.complete('node 1', 2)], [10, 11])
+            for i in range(15):
+                index.remove(i)
+            self.assertEquals(len(index), 5)
+            self.assertEquals([pk for pk, title in
+                               index.complete('node', 10)],
+                              [15, 16, 17, 18, 19])
+            self.assertEquals(sorted(sum(index.blocks, [])),
+                              sum(index.blocks, []))
+        finally:
+            completion.COMPLETION_BLOCK = 128
+
+    def test_signals(self):
+        index = get_completion_index()
+        self.animal.title = 'Beast'
+        self.animal.altnames = ''
+        self.animal.plural = ''
+        self.animal.save()
+        self.assertEquals(self.titles('anim'), [])
+        self.assertEquals(self.titles('bea'), ['Beast'])
+        self.metatype.delete()
+        self.assertEquals(self.titles('ana'), [])
+        self.assertTrue(get_completion_index() is index)
+
+    def test_other_processes(self):
+        index = get_completion_index()
+        generation = get_generation(GENERATION_KEY)
+        self.ant.title = 'Antelope'
+        self.ant.save()
+        self.assertTrue(get_completion_index() is index)
+        self.assertNotEquals(get_generation(GENERATION_KEY), generation)
+
+        # Changes published by another process
+        publish_change(GENERATION_KEY, (self.ant.pk, (
+            'Anteater', set(['anteater']), 0)))
+        self.assertEquals(self.titles('ante'), ['Anteater'])
+        publish_change(GENERATION_KEY, (self.ant.pk, None))
+        self.assertEquals(self.titles('ante'), [])
+        self.assertTrue(get_completion_index() is index)
+
+        # A change of another process missing from the cache
+        bump_generation(GENERATION_KEY)
+        Objecttype.objects.create(title='Anchor', slug='anchor',
+                                  content='Anchor')
+        self.assertTrue(INDEX['index'] is None)
+        self.assertEquals(self.titles('anc'), ['Anchor'])
+
+    def test_rebuild(self):
+        index = get_completion_index()
+        self.assertTrue(rebuild_completion_index() is not index)
+        self.assertTrue(get_completion_index() is get_completion_index())
+        call_command('rebuild_completion_index', verbosity=0)
+
+    def test_complete_view(self):
+        request = RequestFactory().get('/ajax/complete', {'q': 'an',
+                                                          'limit': 150})
+        response = complete(request)
+        self.assertEquals(response['Content-Type'], 'application/json')
+        self.assertEquals(json.loads(response.content)[0],
+                          {'id': self.ant.pk, 'title': 'Ant'})
+        request = RequestFactory().get('/ajax/complete', {'q': 'an',
+                                                          'limit': 'x'})
+        self.assertEquals(len(json.loads(complete(request).content)), 3)
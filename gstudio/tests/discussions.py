@@ -0,0 +1,75 @@
+"""Test cases for Gstudio's recent discussions"""
+from datetime import datetime
+from datetime import timedelta
+
+from django.test import TestCase
+from django.contrib import comments
+from django.contrib.auth.models import User
+from django.contrib.sites.models import Site
+
+from gstudio.models import Nodetype
+from gstudio.models import Discussion
+from gstudio.managers import PUBLISHED
+from gstudio.discussions import COMMENT
+from gstudio.discussions import LINKBACK
+from gstudio.discussions import trim_discussions
+from gstudio.discussions import recent_discussions
+from gstudio.discussions import rebuild_discussions
+
+
+class DiscussionsTestCase(TestCase):
+    """Test cases for the recent discussions of the nodetypes"""
+
+    def setUp(self):
+        self.now = datetime.now()
+        self.site = Site.objects.get_current()
+        self.user = User.objects.create_user(username='webmaster',
+                                             email='webmaster@example.com')
+        self.nodetype = Nodetype.objects.create(
+            title='Nodetype', slug='nodetype', content='Nodetype',
+            status=PUBLISHED)
+        self.nodetype.sites.add(self.site)
+
+    def comment(self, hours=0, **kwargs):
+        return comments.get_model().objects.create(
+            comment='Comment', site=self.site, content_object=self.nodetype,
+            submit_date=self.now - timedelta(hours=hours), **kwargs)
+
+    def recent(self, kind, number=5):
+        return [comment.pk for comment in recent_discussions(kind, number)]
+
+    def test_recent_discussions(self):
+        first = self.comment(hours=2)
+        second = self.comment(hours=1)
+        hidden = self.comment(is_public=False)
+        self.assertEquals(self.recent(COMMENT), [second.pk, first.pk])
+        self.assertEquals(self.recent(COMMENT, 1), [second.pk])
+        self.assertNumQueries(1, lambda: self.recent(COMMENT))
+
+        flag = second.flags.create(user=self.user, flag='pingback')
+        self.assertEquals(self.recent(COMMENT), [first.pk])
+        self.assertEquals(self.recent(LINKBACK), [second.pk])
+        flag.delete()
+        self.assertEquals(self.recent(LINKBACK), [])
+        first.flags.create(user=self.user, flag='removal suggestion')
+        self.assertEquals(self.recent(COMMENT), [second.pk])
+
+        hidden.is_public = True
+        hidden.save()
+        self.assertEquals(self.recent(COMMENT), [hidden.pk, second.pk])
+        hidden.delete()
+        second.flags.create(user=self.user, flag='trackback')
+        second.delete()
+        self.assertEquals(Discussion.objects.count(), 0)
+
+    def test_trim_and_rebuild(self):
+        for i in range(5):
+            self.comment(hours=i)
+        trim_discussions(COMMENT, 3)
+        self.assertEquals(Discussion.objects.count(), 3)
+        rebuild_discussions(2)
+        self.assertEquals(Discussion.objects.count(), 2)
+        self.assertEquals(
+            [discussion.submit_date for discussion in
+             Discussion.objects.all()],
+            [self.now, self.now - timedelta(hours=1)])
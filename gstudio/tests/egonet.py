@@ -0,0 +1,107 @@
+"""Test cases for Gstudio's egonets"""
+import json
+
+from django.test import TestCase
+from django.test.client import RequestFactory
+
+from gstudio.models import Metatype
+from gstudio.models import Relation
+from gstudio.models import Attribute
+from gstudio.models import Objecttype
+from gstudio.models import Relationtype
+from gstudio.models import Attributetype
+from gstudio.egonet import egonet
+from gstudio.graphindex import INDEX
+from gstudio.graphindex import get_graph_index
+from gstudio.views.graphs import graph_egonet_json
+
+
+class EgonetTestCase(TestCase):
+    """Test cases for the breadth first egonets"""
+
+    def setUp(self):
+        INDEX['index'] = None
+        self.metatype = Metatype.objects.create(title='Metatype',
+                                                slug='metatype')
+        self.thing = Objecttype.objects.create(
+            title='Thing', slug='thing', content='Thing')
+        self.animal = Objecttype.objects.create(
+            title='Animal', slug='animal', content='Animal',
+            parent=self.thing)
+        self.animal.metatypes.add(self.metatype)
+        self.plant = Objecttype.objects.create(
+            title='Plant', slug='plant', content='Plant')
+        self.eats = Relationtype.objects.create(
+            title='eats', slug='eats', inverse='is eaten by',
+            content='eats', left_subjecttype=self.animal,
+            right_subjecttype=self.plant)
+        self.relation = Relation.objects.create(
+            title='animal eats plant', slug='animal-eats-plant',
+            left_subject=self.animal, relationtype=self.eats,
+            right_subject=self.plant)
+        self.legs = Attributetype.objects.create(
+            title='legs', slug='legs', content='legs',
+            subjecttype=self.animal)
+        self.attribute = Attribute.objects.create(
+            title='animal legs', slug='animal-legs', subject=self.plant,
+            attributetype=self.legs, svalue='0')
+
+    def tearDown(self):
+        INDEX['index'] = None
+
+    def test_egonet(self):
+        nodes, edges = egonet(self.animal)
+        self.assertEquals(nodes[0], self.animal.pk)
+        self.assertEquals(set(nodes), set([self.animal.pk, self.thing.pk,
+                                           self.plant.pk, self.metatype.pk]))
+        self.assertEquals(edges['eats'], [{'from': self.animal.pk,
+                                           'to': self.plant.pk, 'value': 1}])
+        self.assertEquals(edges['contains_subtypes'],
+                          [{'from': self.thing.pk, 'to': self.animal.pk,
+                            'value': 1}])
+        self.assertEquals(edges['contains_members'],
+                          [{'from': self.metatype.pk, 'to': self.animal.pk,
+                            'value': 1}])
+
+        nodes, edges = egonet(self.animal, depth=2)
+        self.assertTrue(self.attribute.pk in nodes)
+        self.assertEquals(edges['legs'], [{'from': self.plant.pk,
+                                           'to': self.attribute.pk,
+                                           'value': 1}])
+
+    def test_egonet_queries_per_hop(self):
+        get_graph_index()
+        self.assertNumQueries(3, lambda: egonet(self.animal, depth=1))
+        self.assertNumQueries(6, lambda: egonet(self.animal, depth=2))
+        self.assertNumQueries(8, lambda: egonet(self.animal, depth=2,
+                                                inferred=True))
+
+    def test_egonet_follows_the_graph_index(self):
+        get_graph_index()
+        self.relation.right_subject = self.thing
+        self.relation.save()
+        nodes, edges = egonet(self.animal)
+        self.assertEquals(edges['eats'], [{'from': self.animal.pk,
+                                           'to': self.thing.pk, 'value': 1}])
+        self.assertFalse(self.plant.pk in nodes)
+
+    def test_egonet_filters_and_limits(self):
+        nodes, edges = egonet(self.animal, relationtypes=['unknown'])
+        self.assertFalse('eats' in edges)
+        self.assertFalse(self.plant.pk in nodes)
+        nodes, edges = egonet(self.animal, depth=3, max_nodes=2)
+        self.assertEquals(len(nodes), 2)
+        nodes, edges = egonet(self.animal, depth=3, max_edges=1)
+        self.assertEquals(sum([len(items) for items in edges.values()]), 1)
+
+    def test_graph_egonet_json(self):
+        request = RequestFactory().get('/', {'depth': '2'})
+        response = graph_egonet_json(request, str(self.animal.pk))
+        self.assertEquals(response['Content-Type'], 'application/json')
+        graph = json.loads(response.content)
+        self.assertEquals(graph['node_metadata'][0],
+                          {'_id': str(self.animal.pk), 'title': 'Animal',
+                           'screen_name': 'Animal',
+                           'url': self.animal.get_absolute_url()})
+        self.assertEquals(len(graph['node_metadata']), 5)
+        self.assertEquals(len(graph['eats']), 1)
@@ -0,0 +1,55 @@
+"""Test cases for Gstudio's cached fragments"""
+from django.test import TestCase
+from django.template import Context
+from django.template import Template
+from django.core.cache import cache
+from django.contrib.sites.models import Site
+
+from gstudio.models import Nodetype
+from gstudio.models import Metatype
+from gstudio.managers import DRAFT
+from gstudio.managers import PUBLISHED
+
+
+class FragmentsTestCase(TestCase):
+    """Test cases for the fragments of the template tags"""
+    urls = 'gstudio.tests.urls'
+
+    def setUp(self):
+        cache.clear()
+        self.nodetype = Nodetype.objects.create(
+            title='First', slug='first', content='First', status=PUBLISHED)
+        self.nodetype.sites.add(Site.objects.get_current())
+
+    def tearDown(self):
+        cache.clear()
+
+    def render(self, tag):
+        return Template('{% load gstudio_tags %}' + tag).render(Context())
+
+    def test_cached_fragment(self):
+        html = self.render('{% get_recent_nodetypes 5 %}')
+        self.assertTrue('First' in html)
+        self.assertNumQueries(
+            0, lambda: self.render('{% get_recent_nodetypes 5 %}'))
+        self.assertFalse('First' in
+                         self.render('{% get_recent_nodetypes 0 %}'))
+        self.render('{% get_calendar_nodetypes 2010 1 %}')
+        self.assertNumQueries(
+            0, lambda: self.render('{% get_calendar_nodetypes 2010 1 %}'))
+
+    def test_precise_invalidation(self):
+        self.render('{% get_recent_nodetypes 5 %}')
+        self.render('{% get_metatypes %}')
+        self.nodetype.title = 'Renamed'
+        self.nodetype.save()
+        self.assertNumQueries(0, lambda: self.render('{% get_metatypes %}'))
+        self.assertTrue('Renamed' in
+                        self.render('{% get_recent_nodetypes 5 %}'))
+
+        self.nodetype.status = DRAFT
+        self.nodetype.save()
+        self.assertFalse('Renamed' in
+                         self.render('{% get_recent_nodetypes 5 %}'))
+        Metatype.objects.create(title='Metatype 1', slug='metatype-1')
+        self.assertTrue('Metatype 1' in self.render('{% get_metatypes %}'))
@@ -0,0 +1,166 @@
+"""Test cases for Gstudio's graph index"""
+from django.test import TestCase
+from django.core.management import call_command
+
+from gstudio.models import Relation
+from gstudio.models import Attribute
+from gstudio.models import Objecttype
+from gstudio.models import Relationtype
+from gstudio.models import Attributetype
+from gstudio.graphindex import CSR
+from gstudio.graphindex import INDEX
+from gstudio.graphindex import PARENT
+from gstudio.graphindex import FORWARD
+from gstudio.graphindex import BACKWARD
+from gstudio.graphindex import GraphIndex
+from gstudio.graphindex import GENERATION_KEY
+from gstudio.graphindex import graph_edges
+from gstudio.graphindex import get_graph_index
+from gstudio.graphindex import rebuild_graph_index
+from gstudio.caching import get_generation
+from gstudio.caching import publish_change
+from gstudio.caching import bump_generation
+
+
+class GraphIndexTestCase(TestCase):
+    """Test cases for the in-memory graph index"""
+
+    def setUp(self):
+        INDEX['index'] = None
+        self.thing = Objecttype.objects.create(
+            title='Thing', slug='thing', content='Thing')
+        self.animal = Objecttype.objects.create(
+            title='Animal', slug='animal', content='Animal',
+            parent=self.thing)
+        self.cat = Objecttype.objects.create(
+            title='Cat', slug='cat', content='Cat', parent=self.animal)
+        self.plant = Objecttype.objects.create(
+            title='Plant', slug='plant', content='Plant')
+        self.part_of = Relationtype.objects.create(
+            title='part of', slug='part-of', inverse='has part',
+            content='part of', left_subjecttype=self.thing,
+            right_subjecttype=self.thing, is_transitive=True)
+        self.eats = Relationtype.objects.create(
+            title='eats', slug='eats', inverse='is eaten by',
+            content='eats', left_subjecttype=self.animal,
+            right_subjecttype=self.plant)
+        self.relation = Relation.objects.create(
+            title='animal eats plant', slug='animal-eats-plant',
+            left_subject=self.animal, relationtype=self.eats,
+            right_subject=self.plant)
+
+    def tearDown(self):
+        INDEX['index'] = None
+
+    def test_csr(self):
+        csr = CSR([(3, 1, 4), (1, 2, 3), (3, 0, 5), (1, 2, 2)])
+        self.assertEquals(list(csr.nodes), [1, 3])
+        self.assertEquals(list(csr.offsets), [0, 2, 4])
+        self.assertEquals(csr.edges(1), [(2, 2), (2, 3)])
+        self.assertEquals(csr.edges(3), [(0, 5), (1, 4)])
+        self.assertEquals(csr.edges(2), [])
+        self.assertEquals(len(csr), 4)
+
+    def test_build(self):
+        index = get_graph_index()
+        self.assertEquals(index.edges(self.animal.pk, FORWARD),
+                          [(PARENT, self.cat.pk),
+                           (self.eats.pk, self.plant.pk)])
+        self.assertEquals(index.neighbours(self.animal.pk),
+                          [self.cat.pk, self.plant.pk, self.thing.pk])
+        self.assertEquals(index.neighbours(self.animal.pk, [PARENT],
+                                           BACKWARD), [self.thing.pk])
+        self.assertEquals(index.expand(self.cat.pk, 2),
+                          {self.cat.pk: 0, self.animal.pk: 1,
+                           self.thing.pk: 2, self.plant.pk: 2})
+        self.assertEquals(index.shortest_path(self.cat.pk, self.plant.pk),
+                          [self.cat.pk, self.animal.pk, self.plant.pk])
+        self.assertEquals(index.shortest_path(self.cat.pk, self.plant.pk,
+                                              [PARENT]), None)
+
+    def test_closure(self):
+        wheel = Objecttype.objects.create(title='Wheel', slug='wheel',
+                                          content='Wheel')
+        car = Objecttype.objects.create(title='Car', slug='car',
+                                        content='Car')
+        for left, right in ((wheel, car), (car, self.thing)):
+            Relation.objects.create(
+                title='part', slug='part-%s' % left.slug, left_subject=left,
+                relationtype=self.part_of, right_subject=right)
+        index = get_graph_index()
+        self.assertEquals(index.closure(wheel.pk, self.part_of),
+                          [car.pk, self.thing.pk])
+        self.assertEquals(index.closure(self.thing.pk, self.part_of,
+                                        BACKWARD), [car.pk, wheel.pk])
+        self.assertEquals(index.closure(self.animal.pk, self.eats),
+                          [self.plant.pk])
+
+    def test_delta_log(self):
+        index = get_graph_index()
+        self.relation.right_subject = self.thing
+        self.relation.save()
+        legs = Attributetype.objects.create(
+            title='legs', slug='legs', content='legs',
+            subjecttype=self.animal)
+        attribute = Attribute.objects.create(
+            title='cat legs', slug='cat-legs', subject=self.cat,
+            attributetype=legs, svalue='4')
+        self.cat.parent = self.thing
+        self.cat.save()
+        Relation.objects.create(
+            title='cat eats plant', slug='cat-eats-plant',
+            left_subject=self.cat, relationtype=self.eats,
+            right_subject=self.plant)
+        self.assertEquals(len(index.log), 6)
+        self.assertEquals(index.neighbours(self.animal.pk, direction=FORWARD),
+                          [self.thing.pk])
+        self.assertEquals(sorted(index.neighbours(self.cat.pk,
+                                                  direction=FORWARD)),
+                          sorted([self.plant.pk, attribute.pk]))
+        self.assertEquals(index.neighbours(self.thing.pk, [PARENT]),
+                          [self.animal.pk, self.cat.pk])
+
+        attribute.delete()
+        self.assertEquals(index.neighbours(self.cat.pk, direction=FORWARD),
+                          [self.plant.pk])
+        edges = sorted(index.iter_edges())
+        index.compact()
+        self.assertEquals(sorted(index.iter_edges()), edges)
+        self.assertEquals(index.log, [])
+        self.assertEquals(sorted(GraphIndex(graph_edges()).iter_edges()),
+                          edges)
+
+    def test_rebuild(self):
+        index = get_graph_index()
+        self.assertTrue(rebuild_graph_index() is not index)
+        self.assertTrue(get_graph_index() is get_graph_index())
+        call_command('rebuild_graph_index', verbosity=0)
+
+    def test_other_processes(self):
+        index = get_graph_index()
+        generation = get_generation(GENERATION_KEY)
+        self.cat.parent = self.thing
+        self.cat.save()
+        self.assertTrue(get_graph_index() is index)
+        self.assertNotEquals(get_generation(GENERATION_KEY), generation)
+
+        # A change published by another process
+        publish_change(GENERATION_KEY, [('+', (self.plant.pk, PARENT,
+                                               self.cat.pk))])
+        self.assertTrue(get_graph_index() is index)
+        self.assertEquals(index.neighbours(self.plant.pk, [PARENT],
+                                           FORWARD), [self.cat.pk])
+        publish_change(GENERATION_KEY, [('+', (self.plant.pk, PARENT,
+                                               self.cat.pk))])
+        self.assertEquals(get_graph_index().edges(self.plant.pk),
+                          [(PARENT, self.cat.pk)])
+
+        # A change of another process missing from the cache
+        bump_generation(GENERATION_KEY)
+        Relation.objects.create(
+            title='cat eats plant', slug='cat-eats-plant',
+            left_subject=self.cat, relationtype=self.eats,
+            right_subject=self.plant)
+        self.assertTrue(INDEX['index'] is None)
+        self.assertEquals(get_graph_index().neighbours(
+            self.cat.pk, [self.eats.pk]), [self.plant.pk])
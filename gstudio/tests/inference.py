@@ -0,0 +1,114 @@
+"""Test cases for Gstudio's relation inference"""
+from django.test import TestCase
+from django.core.management import call_command
+
+from gstudio.models import Relation
+from gstudio.models import Objecttype
+from gstudio.models import Relationtype
+from gstudio.models import InferredRelation
+from gstudio.egonet import egonet
+
+
+class InferenceTestCase(TestCase):
+    """Test cases for the inferred relations"""
+
+    def setUp(self):
+        self.nodes = dict((slug, Objecttype.objects.create(
+            title=slug, slug=slug, content=slug))
+                          for slug in ('wheel', 'car', 'fleet', 'garage'))
+        self.part_of = Relationtype.objects.create(
+            title='part of', slug='part-of', inverse='has part',
+            content='part of', left_subjecttype=self.nodes['car'],
+            right_subjecttype=self.nodes['car'], is_transitive=True)
+        self.near = Relationtype.objects.create(
+            title='near', slug='near', inverse='near', content='near',
+            left_subjecttype=self.nodes['car'],
+            right_subjecttype=self.nodes['car'], is_symmetrical=True)
+
+    def relate(self, left, relationtype, right):
+        return Relation.objects.create(
+            title='%s %s' % (left, right), slug='%s-%s' % (left, right),
+            left_subject=self.nodes[left], relationtype=relationtype,
+            right_subject=self.nodes[right])
+
+    def pairs(self, relationtype):
+        slugs = dict((node.pk, slug) for slug, node in self.nodes.items())
+        return sorted([(slugs[left], slugs[right]) for left, right in
+                       InferredRelation.objects.filter(
+                           relationtype=relationtype).values_list(
+                           'left_subject', 'right_subject')])
+
+    def test_transitive(self):
+        self.relate('car', self.part_of, 'fleet')
+        wheel_car = self.relate('wheel', self.part_of, 'car')
+        self.assertEquals(self.pairs(self.part_of),
+                          [('car', 'fleet'), ('wheel', 'car'),
+                           ('wheel', 'fleet')])
+        self.relate('fleet', self.part_of, 'garage')
+        self.assertEquals(self.pairs(self.part_of),
+                          [('car', 'fleet'), ('car', 'garage'),
+                           ('fleet', 'garage'), ('wheel', 'car'),
+                           ('wheel', 'fleet'), ('wheel', 'garage')])
+
+        wheel_car.delete()
+        self.assertEquals(self.pairs(self.part_of),
+                          [('car', 'fleet'), ('car', 'garage'),
+                           ('fleet', 'garage')])
+
+        car_fleet = Relation.objects.get(left_subject=self.nodes['car'])
+        car_fleet.right_subject = self.nodes['garage']
+        car_fleet.save()
+        self.assertEquals(self.pairs(self.part_of),
+                          [('car', 'garage'), ('fleet', 'garage')])
+
+    def test_symmetric(self):
+        relation = self.relate('car', self.near, 'garage')
+        self.assertEquals(self.pairs(self.near),
+                          [('car', 'garage'), ('garage', 'car')])
+        relation.delete()
+        self.assertEquals(self.pairs(self.near), [])
+
+    def test_relationtype_flags(self):
+        self.relate('car', self.near, 'garage')
+        self.near.is_symmetrical = False
+        self.near.save()
+        self.assertEquals(self.pairs(self.near), [])
+        self.near.is_transitive = True
+        self.near.save()
+        self.assertEquals(self.pairs(self.near), [('car', 'garage')])
+
+        InferredRelation.objects.all().delete()
+        call_command('rebuild_inferred_relations', verbosity=0)
+        self.assertEquals(self.pairs(self.near), [('car', 'garage')])
+
+    def test_get_inferred_relations(self):
+        self.relate('wheel', self.part_of, 'car')
+        self.relate('car', self.part_of, 'fleet')
+        self.assertNumQueries(
+            1, lambda: self.nodes['wheel'].get_inferred_relations)
+        relations = self.nodes['wheel'].get_inferred_relations
+        self.assertEquals(sorted([node.pk for node in relations['part of']]),
+                          [self.nodes['car'].pk, self.nodes['fleet'].pk])
+        relations = self.nodes['fleet'].get_inferred_relations
+        self.assertEquals(len(relations['has part']), 2)
+
+    def test_get_inferred_relations_symmetrical(self):
+        self.near.is_transitive = True
+        self.near.save()
+        self.relate('car', self.near, 'garage')
+        self.assertTrue(('car', 'car') in self.pairs(self.near))
+        relations = self.nodes['car'].get_inferred_relations
+        self.assertEquals(relations.keys(), ['near'])
+        self.assertEquals([node.pk for node in relations['near']],
+                          [self.nodes['garage'].pk])
+        relations = self.nodes['garage'].get_inferred_relations
+        self.assertEquals([node.pk for node in relations['near']],
+                          [self.nodes['car'].pk])
+
+    def test_egonet(self):
+        self.relate('wheel', self.part_of, 'car')
+        self.relate('car', self.part_of, 'fleet')
+        nodes, edges = egonet(self.nodes['wheel'])
+        self.assertFalse(self.nodes['fleet'].pk in nodes)
+        nodes, edges = egonet(self.nodes['wheel'], inferred=True)
+        self.assertTrue(self.nodes['fleet'].pk in nodes)
@@ -176,7 +176,7 @@ class ManagersTestCase(TestCase):
         self.assertEquals(Nodetype.published.advanced_search(
             '(author:webmaster) or (author:contributor)').count(), 2)
         self.assertEquals(Nodetype.published.advanced_search(
-            '(author:webmaster) (author:contributor)').count(), 0)
+            '(author:webmaster) (author:contributor)').count(), 1)
         self.assertEquals(Nodetype.published.advanced_search(
             '(author:webmaster content) 1').count(), 1)
         self.assertEquals(Nodetype.published.advanced_search(
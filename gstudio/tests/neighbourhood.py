@@ -0,0 +1,79 @@
+"""Test cases for Gstudio's neighbourhood cache"""
+from django.test import TestCase
+from django.core.cache import cache
+
+from gstudio.models import Nodetype
+from gstudio.models import Relation
+from gstudio.models import Objecttype
+from gstudio.models import Relationtype
+from gstudio.neighbourhood import nbh_cache_key
+
+
+class NeighbourhoodTestCase(TestCase):
+    """Test cases for the materialized neighbourhoods"""
+
+    def setUp(self):
+        cache.clear()
+        self.parent = Objecttype.objects.create(
+            title='Animal', slug='animal', content='Animal')
+        self.cat = Objecttype.objects.create(
+            title='Cat', slug='cat', content='Cat', parent=self.parent)
+        self.dog = Objecttype.objects.create(
+            title='Dog', slug='dog', content='Dog', parent=self.parent)
+
+    def test_get_rendered_nbh_cached(self):
+        nbh = self.cat.get_rendered_nbh
+        self.assertEquals(nbh['title'], 'Cat')
+        self.assertEquals(nbh['siblings'].keys(), ['Dog'])
+        self.assertEquals(cache.get(nbh_cache_key(self.cat.pk))['siblings'],
+                          nbh['siblings'])
+        self.assertNumQueries(0, lambda: self.cat.get_rendered_nbh)
+
+    def test_nodetype_save_invalidates_siblings(self):
+        self.cat.get_rendered_nbh
+        self.parent.get_rendered_nbh
+        self.dog.title = 'Wolf'
+        self.dog.save()
+        self.assertEquals(cache.get(nbh_cache_key(self.cat.pk)), None)
+        self.assertEquals(cache.get(nbh_cache_key(self.parent.pk)), None)
+        self.assertEquals(self.cat.get_rendered_nbh['siblings'].keys(),
+                          ['Wolf'])
+
+    def test_reparent_invalidates_former_siblings(self):
+        self.cat.get_rendered_nbh
+        other = Nodetype.objects.create(title='Pet', slug='pet',
+                                        content='Pet')
+        other.get_rendered_nbh
+        dog = Objecttype.objects.get(pk=self.dog.pk)
+        dog.parent = other
+        dog.save()
+        self.assertEquals(cache.get(nbh_cache_key(self.cat.pk)), None)
+        self.assertEquals(cache.get(nbh_cache_key(other.pk)), None)
+        self.assertEquals(self.cat.get_rendered_nbh['siblings'], {})
+
+    def test_relation_invalidates_subjects(self):
+        relationtype = Relationtype.objects.create(
+            title='chases', slug='chases', inverse='is chased by',
+            content='chases', left_subjecttype=self.parent,
+            right_subjecttype=self.parent)
+        cache.set(nbh_cache_key(self.cat.pk), {'title': 'Cat'})
+        cache.set(nbh_cache_key(self.dog.pk), {'title': 'Dog'})
+        relation = Relation.objects.create(
+            title='dog chases cat', slug='dog-chases-cat',
+            left_subject=self.dog, relationtype=relationtype,
+            right_subject=self.cat)
+        self.assertEquals(cache.get(nbh_cache_key(self.cat.pk)), None)
+        self.assertEquals(cache.get(nbh_cache_key(self.dog.pk)), None)
+        cache.set(nbh_cache_key(self.dog.pk), {'title': 'Dog'})
+        relation.delete()
+        self.assertEquals(cache.get(nbh_cache_key(self.dog.pk)), None)
+
+    def test_m2m_changed_invalidates(self):
+        self.cat.get_rendered_nbh
+        self.dog.get_rendered_nbh
+        self.cat.prior_nodes.add(self.dog)
+        self.assertEquals(cache.get(nbh_cache_key(self.cat.pk)), None)
+        self.assertEquals(cache.get(nbh_cache_key(self.dog.pk)), None)
+        self.dog.get_rendered_nbh
+        self.cat.prior_nodes.clear()
+        self.assertEquals(cache.get(nbh_cache_key(self.dog.pk)), None)
@@ -0,0 +1,63 @@
+"""Test cases for Gstudio's NID"""
+from django.test import TestCase
+from django.core.management import call_command
+from django.contrib.contenttypes.models import ContentType
+
+from gstudio.models import NID
+from gstudio.models import Metatype
+from gstudio.models import Relation
+from gstudio.models import Objecttype
+from gstudio.models import Relationtype
+
+
+class NIDTestCase(TestCase):
+    """Test cases for the concrete models of the nodes"""
+
+    def setUp(self):
+        self.metatype = Metatype.objects.create(title='Metatype',
+                                                slug='metatype')
+        self.objecttype = Objecttype.objects.create(
+            title='Objecttype', slug='objecttype', content='Objecttype')
+        self.relationtype = Relationtype.objects.create(
+            title='knows', slug='knows', inverse='is known by',
+            content='knows', left_subjecttype=self.objecttype,
+            right_subjecttype=self.objecttype)
+        self.relation = Relation.objects.create(
+            title='knows itself', slug='knows-itself',
+            left_subject=self.objecttype, relationtype=self.relationtype,
+            right_subject=self.objecttype)
+
+    def test_content_type(self):
+        self.assertEquals(NID.objects.get(pk=self.objecttype.pk).content_type,
+                          ContentType.objects.get_for_model(Objecttype))
+        self.assertEquals(NID.objects.get(pk=self.relation.pk).content_type,
+                          ContentType.objects.get_for_model(Relation))
+
+    def test_ref(self):
+        node = NID.objects.get(pk=self.metatype.pk)
+        self.assertEquals(node.ref, self.metatype)
+        self.assertEquals(type(node.ref), Metatype)
+        self.assertNumQueries(0, lambda: self.metatype.ref)
+
+    def test_resolve_many(self):
+        ids = [self.relation.pk, self.metatype.pk, self.objecttype.pk]
+        self.assertNumQueries(4, NID.objects.resolve_many, ids)
+        nodes = NID.objects.resolve_many(ids)
+        self.assertEquals([type(node) for node in nodes],
+                          [Relation, Metatype, Objecttype])
+        self.assertEquals([node.pk for node in nodes], ids)
+
+        nodes = list(NID.objects.filter(pk__in=ids))
+        self.assertNumQueries(3, lambda: NID.objects.resolve_many(nodes))
+        self.assertEquals(NID.objects.resolve_many([str(ids[0]), 0]),
+                          [self.relation])
+
+    def test_backfill_nid_types(self):
+        NID.objects.update(content_type=None)
+        call_command('backfill_nid_types', verbosity=0)
+        self.assertEquals(NID.objects.get(pk=self.objecttype.pk).content_type,
+                          ContentType.objects.get_for_model(Objecttype))
+        self.assertEquals(NID.objects.get(pk=self.metatype.pk).content_type,
+                          ContentType.objects.get_for_model(Metatype))
+        self.assertEquals(NID.objects.filter(
+            content_type__isnull=True).count(), 0)
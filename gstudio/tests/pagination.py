@@ -0,0 +1,122 @@
+"""Test cases for Gstudio's keyset pagination"""
+from datetime import datetime
+
+from django.template import Context
+from django.template import TemplateDoesNotExist
+from django.core.paginator import InvalidPage
+
+from gstudio.models import Nodetype
+from gstudio.managers import PUBLISHED
+from gstudio.views import decorators
+from gstudio.pagination import KeysetPaginator
+from gstudio.pagination import encode_cursor
+from gstudio.pagination import decode_cursor
+from gstudio.pagination import estimate_count
+from gstudio.tests.views import ViewsBaseCase
+from gstudio.templatetags.gstudio_tags import gstudio_pagination
+
+
+class KeysetPaginationTestCase(ViewsBaseCase):
+    """Test cases for the keyset pagination of the nodetypes"""
+
+    def setUp(self):
+        super(KeysetPaginationTestCase, self).setUp()
+        for i in range(5):
+            nodetype = Nodetype.objects.create(
+                title='Nodetype %s' % i, slug='nodetype-%s' % i,
+                content='Nodetype %s' % i, tags='tests',
+                creation_date=datetime(2011, 1, 1), status=PUBLISHED)
+            nodetype.sites.add(self.site)
+        self.old_PAGINATION_KEYSET = decorators.PAGINATION_KEYSET
+        decorators.PAGINATION_KEYSET = True
+
+    def tearDown(self):
+        decorators.PAGINATION_KEYSET = self.old_PAGINATION_KEYSET
+        super(KeysetPaginationTestCase, self).tearDown()
+
+    def titles(self, page):
+        return [nodetype.title for nodetype in page.object_list]
+
+    def test_cursor(self):
+        nodetype = Nodetype.objects.get(slug='test-1')
+        self.assertEquals(encode_cursor(nodetype),
+                          '20100101000000000000-%s' % nodetype.pk)
+        self.assertEquals(decode_cursor(encode_cursor(nodetype)),
+                          (datetime(2010, 1, 1), nodetype.pk))
+        self.assertRaises(InvalidPage, decode_cursor, 'invalid')
+
+    def test_paginator(self):
+        paginator = KeysetPaginator(Nodetype.published.all(), 3)
+        first = paginator.page()
+        self.assertEquals(self.titles(first),
+                          ['Nodetype 4', 'Nodetype 3', 'Nodetype 2'])
+        self.assertEquals((first.has_previous(), first.has_next()),
+                          (False, True))
+        self.assertEquals(first.number, 1)
+        second = paginator.page(after=first.next_cursor)
+        self.assertEquals(self.titles(second),
+                          ['Nodetype 1', 'Nodetype 0', 'Test 2'])
+        last = paginator.page(after=second.next_cursor)
+        self.assertEquals(self.titles(last), ['Test 1'])
+        self.assertEquals((last.has_previous(), last.has_next()),
+                          (True, False))
+        self.assertEquals(last.number, None)
+        previous = paginator.page(before=last.previous_cursor)
+        self.assertEquals(self.titles(previous), self.titles(second))
+        self.assertTrue(previous.has_previous())
+        self.assertEquals(self.titles(paginator.page(
+            before=previous.previous_cursor)), self.titles(first))
+        self.assertEquals(paginator.count, None)
+
+    def test_paginator_queries(self):
+        paginator = KeysetPaginator(Nodetype.published.all(), 3)
+        cursor = paginator.page().next_cursor
+        self.assertNumQueries(1, lambda: paginator.page(after=cursor))
+        paginator = KeysetPaginator(Nodetype.published.all(), 3, 60)
+        self.assertEquals(paginator.count, 7)
+        paginator = KeysetPaginator(Nodetype.published.all(), 3, 60)
+        self.assertNumQueries(0, lambda: paginator.count)
+
+    def test_estimate_count(self):
+        self.assertEquals(estimate_count(Nodetype.published.filter(
+            creation_date__gte=datetime(2011, 1, 1))), 5)
+        self.assertEquals(estimate_count(Nodetype.published.filter(
+            creation_date__gte=datetime(2010, 1, 1))), 7)
+
+    def test_views(self):
+        response = self.client.get('/')
+        self.assertEquals(len(response.context['object_list']), 3)
+        self.assertTrue(response.context['is_paginated'])
+        self.assertContains(response, '?after=')
+        page = response.context['page_obj']
+        response = self.client.get('/tags/tests/?after=%s' %
+                                   page.next_cursor)
+        self.assertEquals([nodetype.title for nodetype
+                           in response.context['object_list']],
+                          ['Nodetype 1', 'Nodetype 0', 'Test 2'])
+        self.assertEquals(response.context['tag'].name, 'tests')
+        self.assertNotContains(response, 'Page None')
+        response = self.client.get('/search/?pattern=nodetype')
+        self.assertNotContains(response, 'None nodetypes found')
+        response = self.client.get('/authors/admin/')
+        self.assertEquals(len(response.context['object_list']), 2)
+        self.assertFalse(response.context['is_paginated'])
+        # Check a 404 error, but the 404.html may no exist
+        try:
+            self.assertRaises(TemplateDoesNotExist, self.client.get,
+                              '/search/?pattern=nodetype&after=bad')
+        except AssertionError:
+            response = self.client.get('/search/?pattern=nodetype&after=bad')
+            self.assertEquals(response.status_code, 404)
+
+    def test_gstudio_pagination(self):
+        class FakeRequest(object):
+            def __init__(self, get_dict):
+                self.GET = get_dict
+
+        page = KeysetPaginator(Nodetype.published.all(), 3).page()
+        context = gstudio_pagination(Context({'request': FakeRequest(
+            {'after': 'cursor', 'key': 'val'})}), page)
+        self.assertEquals(context['GET_string'], '&key=val')
+        self.assertEquals(context['template'],
+                          'gstudio/tags/keyset_pagination.html')
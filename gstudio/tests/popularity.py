@@ -0,0 +1,84 @@
+"""Test cases for Gstudio's popularity counters"""
+from datetime import datetime
+from datetime import timedelta
+
+from django.test import TestCase
+from django.contrib import comments
+from django.contrib.sites.models import Site
+
+from gstudio.models import Nodetype
+from gstudio.models import Objecttype
+from gstudio.models import NodetypePopularity
+from gstudio.managers import PUBLISHED
+from gstudio.popularity import popular_nodetypes
+from gstudio.popularity import compact_popularity
+from gstudio.popularity import rebuild_popularity
+
+
+class PopularityTestCase(TestCase):
+    """Test cases for the comment counters of the nodetypes"""
+
+    def setUp(self):
+        self.now = datetime.now()
+        self.site = Site.objects.get_current()
+        self.first = self.create_nodetype('first')
+        self.second = self.create_nodetype('second')
+
+    def create_nodetype(self, slug):
+        nodetype = Objecttype.objects.create(
+            title=slug, slug=slug, content=slug, status=PUBLISHED)
+        nodetype.sites.add(self.site)
+        return nodetype
+
+    def comment(self, nodetype, days=0, **kwargs):
+        return comments.get_model().objects.create(
+            comment='Comment', site=self.site, content_object=nodetype,
+            submit_date=self.now - timedelta(days=days), **kwargs)
+
+    def counts(self, nodetype):
+        popularity = NodetypePopularity.objects.get(nodetype=nodetype)
+        return (popularity.comments_count, popularity.week_count,
+                popularity.day_count)
+
+    def popular(self, period='all'):
+        return [nodetype.slug for nodetype in
+                popular_nodetypes(Nodetype.published.all(), period)]
+
+    def test_counters(self):
+        self.comment(self.first, days=3)
+        self.comment(self.first, days=10)
+        latest = self.comment(self.second)
+        self.assertEquals(self.counts(self.first), (2, 1, 0))
+        self.assertEquals(self.counts(self.second), (1, 1, 1))
+        self.assertEquals(self.popular(), ['first', 'second'])
+        self.assertEquals(self.popular('day'), ['second'])
+
+        latest.is_public = False
+        latest.save()
+        self.assertEquals(self.counts(self.second), (0, 0, 0))
+        self.assertEquals(self.popular(), ['first'])
+        latest.is_public = True
+        latest.save()
+        latest.delete()
+        self.assertEquals(self.counts(self.second), (0, 0, 0))
+        self.comment(self.second, is_public=False)
+        self.assertEquals(self.counts(self.second), (0, 0, 0))
+
+    def test_compact_popularity(self):
+        self.comment(self.first, days=3)
+        self.comment(self.second)
+        compact_popularity(self.now + timedelta(days=2))
+        self.assertEquals(self.counts(self.first), (1, 1, 0))
+        self.assertEquals(self.counts(self.second), (1, 1, 0))
+        compact_popularity(self.now + timedelta(days=5))
+        self.assertEquals(self.counts(self.first), (1, 0, 0))
+        self.assertEquals(self.popular('week'), ['second'])
+
+    def test_rebuild_popularity(self):
+        self.comment(self.first)
+        self.comment(self.second, days=3)
+        self.comment(self.second, days=30)
+        NodetypePopularity.objects.all().delete()
+        rebuild_popularity(self.now)
+        self.assertEquals(self.counts(self.first), (1, 1, 1))
+        self.assertEquals(self.counts(self.second), (2, 1, 0))
@@ -0,0 +1,103 @@
+"""Test cases for Gstudio's publication scheduler"""
+from datetime import datetime
+from datetime import timedelta
+
+from django.test import TestCase
+from django.contrib import admin
+from django.core.cache import cache
+from django.contrib.sites.models import Site
+from django.core.management import call_command
+
+from gstudio.models import Nodetype
+from gstudio.models import Objecttype
+from gstudio.managers import DRAFT
+from gstudio.managers import PUBLISHED
+from gstudio.publication import update_live
+from gstudio.publication import refresh_live
+from gstudio.publication import next_transition
+from gstudio.sampling import POOL_KEY
+from gstudio.comparison import get_similarity_version
+from gstudio.admin.objecttype import ObjecttypeAdmin
+from objectapp.models import Gbobject
+from objectapp.admin.gbobject import GbobjectAdmin
+
+
+class PublicationTestCase(TestCase):
+    """Test cases for the is_live flag of the nodes"""
+
+    def setUp(self):
+        self.now = datetime.now()
+        self.site = Site.objects.get_current()
+        self.current = self.create_node(Objecttype, 'current')
+        self.future = self.create_node(
+            Objecttype, 'future',
+            start_publication=self.now + timedelta(days=1))
+        self.ending = self.create_node(
+            Gbobject, 'ending', end_publication=self.now + timedelta(days=2))
+        self.draft = self.create_node(Objecttype, 'draft', status=DRAFT)
+
+    def create_node(self, model, slug, **kwargs):
+        params = {'title': slug, 'slug': slug, 'content': slug,
+                  'status': PUBLISHED, 'start_publication': self.now}
+        params.update(kwargs)
+        node = model.objects.create(**params)
+        node.sites.add(self.site)
+        return node
+
+    def live(self):
+        return sorted([node.slug for node in Nodetype.published.all()] +
+                      [node.slug for node in Gbobject.published.all()])
+
+    def test_pre_save(self):
+        self.assertEquals(self.live(), ['current', 'ending'])
+        self.draft.status = PUBLISHED
+        self.draft.save()
+        self.assertTrue(Nodetype.objects.get(pk=self.draft.pk).is_live)
+        self.current.end_publication = self.now
+        self.current.save()
+        self.assertEquals(self.live(), ['draft', 'ending'])
+
+    def test_update_live(self):
+        self.assertEquals(update_live(self.now), 0)
+        self.assertEquals(next_transition(self.now),
+                          self.future.start_publication)
+        version = get_similarity_version()
+        cache.set(POOL_KEY, {})
+        self.assertEquals(update_live(self.now + timedelta(days=1)), 1)
+        self.assertNotEquals(get_similarity_version(), version)
+        self.assertEquals(cache.get(POOL_KEY), None)
+        self.assertEquals(self.live(), ['current', 'ending', 'future'])
+        self.assertEquals(next_transition(self.now + timedelta(days=1)),
+                          self.ending.end_publication)
+        self.assertEquals(update_live(self.now + timedelta(days=3)), 1)
+        self.assertEquals(self.live(), ['current', 'future'])
+        current = Objecttype.objects.filter(pk=self.current.pk)
+        current.update(status=DRAFT)
+        self.assertEquals(refresh_live(current), 1)
+        self.assertEquals(self.live(), ['future'])
+
+    def test_admin_actions(self):
+        model_admin = ObjecttypeAdmin(Objecttype, admin.site)
+        model_admin.message_user = lambda *args: None
+        model_admin.ping_directories = lambda *args, **kwargs: None
+        model_admin.make_published(None, Objecttype.objects.filter(
+            status=DRAFT))
+        self.assertEquals(self.live(), ['current', 'draft', 'ending'])
+        model_admin.make_hidden(None, Objecttype.objects.filter(
+            status=PUBLISHED, slug='draft'))
+        self.assertEquals(self.live(), ['current', 'ending'])
+        model_admin = GbobjectAdmin(Gbobject, admin.site)
+        model_admin.message_user = lambda *args: None
+        model_admin.make_hidden(None, Gbobject.objects.filter(
+            status=PUBLISHED))
+        self.assertEquals(self.live(), ['current'])
+
+    def test_published_queries(self):
+        self.assertEquals(str(Nodetype.published.all().query),
+                          str(Nodetype.published.all().query))
+
+    def test_publish_scheduled(self):
+        Objecttype.objects.filter(pk=self.future.pk).update(
+            start_publication=self.now)
+        call_command('publish_scheduled', verbosity=0)
+        self.assertEquals(self.live(), ['current', 'ending', 'future'])
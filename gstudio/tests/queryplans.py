@@ -0,0 +1,195 @@
+"""Test cases for the query plans of Gstudio's hot lookups"""
+import re
+from datetime import datetime
+from datetime import timedelta
+
+from django.test import TestCase
+from django.db import connections
+from django.contrib.sites.models import Site
+from django.contrib.contenttypes.models import ContentType
+
+from gstudio.models import NID
+from gstudio.models import Metatype
+from gstudio.models import Nodetype
+from gstudio.models import Relation
+from gstudio.models import Objecttype
+from gstudio.models import Relationtype
+from gstudio.managers import PUBLISHED
+from gstudio.settings import PAGINATION
+from gstudio.indexes import index_name
+
+ROWS = 100000
+SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?\s*$')
+SQLITE_INDEX = re.compile(r'USING (?:COVERING )?INDEX (\w+)')
+POSTGRESQL_SCAN = re.compile(r'Seq Scan on (\w+)')
+POSTGRESQL_INDEX = re.compile(r'Index (?:Only )?Scan (?:Backward )?'
+                              r'(?:using|on) (\w+)')
+
+
+def insert_rows(model, rows, using='default'):
+    """Insert rows in the tables of a model and of its parents,
+    without the signals nor the queries of the ORM"""
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    models = sorted(model._meta.get_parent_list(),
+                    key=lambda parent: len(parent._meta.get_parent_list()))
+    cursor = connection.cursor()
+    for table_model in models + [model]:
+        fields = table_model._meta.local_fields
+        values = []
+        for row in rows:
+            values.append([field.get_db_prep_save(
+                field.primary_key and row['id'] or
+                row.get(field.attname, field.get_default()),
+                connection=connection) for field in fields])
+        cursor.executemany('INSERT INTO %s (%s) VALUES (%s)' % (
+            quote_name(table_model._meta.db_table),
+            ', '.join([quote_name(field.column) for field in fields]),
+            ', '.join(['%s'] * len(fields))), values)
+
+
+def full_scans(queryset):
+    """Return the tables fully scanned by the plan of a queryset"""
+    sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+    connection = connections[queryset.db]
+    cursor = connection.cursor()
+    if connection.vendor == 'sqlite':
+        cursor.execute('EXPLAIN QUERY PLAN %s' % sql, params)
+        return [match.group(1) for match in
+                [SQLITE_SCAN.match(row[-1]) for row in cursor.fetchall()]
+                if match]
+    if connection.vendor == 'postgresql':
+        cursor.execute('EXPLAIN %s' % sql, params)
+        return [match.group(1) for match in
+                [POSTGRESQL_SCAN.search(row[0]) for row in cursor.fetchall()]
+                if match]
+    cursor.execute('EXPLAIN %s' % sql, params)
+    columns = [column[0] for column in cursor.description]
+    return [row[columns.index('table')] for row in cursor.fetchall()
+            if row[columns.index('type')] == 'ALL']
+
+
+def used_indexes(queryset):
+    """Return the indexes used by the plan of a queryset"""
+    sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+    connection = connections[queryset.db]
+    cursor = connection.cursor()
+    if connection.vendor == 'sqlite':
+        cursor.execute('EXPLAIN QUERY PLAN %s' % sql, params)
+        return [match.group(1) for match in
+                [SQLITE_INDEX.search(row[-1]) for row in cursor.fetchall()]
+                if match]
+    if connection.vendor == 'postgresql':
+        cursor.execute('EXPLAIN %s' % sql, params)
+        return [match.group(1) for match in
+                [POSTGRESQL_INDEX.search(row[0]) for row in cursor.fetchall()]
+                if match]
+    cursor.execute('EXPLAIN %s' % sql, params)
+    columns = [column[0] for column in cursor.description]
+    return [row[columns.index('key')] for row in cursor.fetchall()
+            if row[columns.index('key')]]
+
+
+class QueryPlansTestCase(TestCase):
+    """Test cases checking that the hot lookups are planned
+    with the indexes, on a graph of ROWS nodes. They are only
+    run with the GSTUDIO_TEST_QUERY_PLANS setting enabled,
+    the rows being inserted before each test"""
+
+    def setUp(self):
+        self.now = datetime.now()
+        self.site = Site.objects.get_current()
+        self.metatype = Metatype.objects.create(title='Metatype',
+                                                slug='metatype')
+        animal = Objecttype.objects.create(title='Animal', slug='animal')
+        plant = Objecttype.objects.create(title='Plant', slug='plant')
+        self.eats = Relationtype.objects.create(
+            title='eats', slug='eats', inverse='is eaten by',
+            left_subjecttype=animal, right_subjecttype=plant)
+
+        start = NID.objects.order_by('-pk')[0].pk + 1
+        count = ROWS / 2
+        self.nodetype_ids = range(start, start + count)
+        relation_ids = range(start + count, start + ROWS)
+        nodetype_type = ContentType.objects.get_for_model(Nodetype).pk
+        relation_type = ContentType.objects.get_for_model(Relation).pk
+
+        insert_rows(Nodetype, [
+            {'id': pk, 'title': 'Nodetype %s' % pk,
+             'slug': 'nodetype-%s' % pk, 'tree_path': 'nodetype-%s' % pk,
+             'content': 'Nodetype %s' % pk,
+             'creation_date': self.now - timedelta(hours=pk - start),
+             'content_type_id': nodetype_type, 'status': PUBLISHED,
+             'start_publication': self.now - timedelta(days=1),
+             'is_live': (pk - start) % 10 != 0,
+             'lft': 1, 'rght': 2, 'tree_id': pk, 'level': 0}
+            for pk in self.nodetype_ids])
+        insert_rows(Nodetype.sites.through, [
+            {'id': i + 1, 'nodetype_id': pk, 'site_id': self.site.pk}
+            for i, pk in enumerate(self.nodetype_ids)])
+        insert_rows(Nodetype.metatypes.through, [
+            {'id': i + 1, 'nodetype_id': pk, 'metatype_id': self.metatype.pk}
+            for i, pk in enumerate(self.nodetype_ids[::10])])
+        insert_rows(Relation, [
+            {'id': pk, 'title': 'Relation %s' % pk,
+             'slug': 'relation-%s' % pk, 'creation_date': self.now,
+             'content_type_id': relation_type,
+             'left_subject_id': self.nodetype_ids[i],
+             'relationtype_id': self.eats.pk,
+             'right_subject_id': self.nodetype_ids[i - 1]}
+            for i, pk in enumerate(relation_ids)])
+
+        connection = connections['default']
+        if connection.vendor in ('sqlite', 'postgresql'):
+            connection.cursor().execute('ANALYZE')
+
+    def assertIndexed(self, queryset, table=None, columns=()):
+        self.assertEquals(full_scans(queryset), [])
+        if table:
+            self.assertTrue(index_name(table, columns) in
+                            used_indexes(queryset))
+
+    def test_get_relations(self):
+        nodetype = Nodetype.objects.get(pk=self.nodetype_ids[42])
+        self.assertEquals(len(nodetype.get_relations), 2)
+        self.assertIndexed(Relation.objects.filter(left_subject=nodetype.pk))
+        self.assertIndexed(Relation.objects.filter(right_subject=nodetype.pk))
+        self.assertIndexed(Relation.objects.filter(
+            left_subject=nodetype.pk, relationtype=self.eats),
+                           'gstudio_relation',
+                           ('left_subject_id', 'relationtype_id'))
+        self.assertIndexed(Relation.objects.filter(
+            right_subject=nodetype.pk, relationtype=self.eats),
+                           'gstudio_relation',
+                           ('right_subject_id', 'relationtype_id'))
+
+    def test_nodetypes_published(self):
+        self.assertIndexed(Nodetype.published.all()[:PAGINATION])
+        self.assertIndexed(self.metatype.nodetypes_published()[:PAGINATION])
+
+    def test_get_metatype_or_404(self):
+        self.assertIndexed(Metatype.objects.filter(tree_path='metatype'))
+
+    def test_archives(self):
+        date = self.now - timedelta(days=30)
+        published = Nodetype.published.all()
+        self.assertIndexed(published.filter(
+            creation_date__year=date.year,
+            creation_date__month=date.month,
+            creation_date__day=date.day))
+        self.assertIndexed(published.filter(
+            slug='nodetype-%s' % self.nodetype_ids[720],
+            creation_date__year=date.year,
+            creation_date__month=date.month,
+            creation_date__day=date.day))
+
+    def test_get_node(self):
+        self.assertIndexed(NID.objects.filter(
+            title='Nodetype %s' % self.nodetype_ids[720]),
+                           'gstudio_nid', ('title',))
+
+    def test_publication_windows(self):
+        self.assertIndexed(Nodetype.objects.filter(
+            status=PUBLISHED, start_publication__gt=self.now),
+                           'gstudio_nodetype',
+                           ('status', 'start_publication', 'end_publication'))
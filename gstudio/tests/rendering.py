@@ -0,0 +1,41 @@
+"""Test cases for Gstudio's rendered contents"""
+from django.test import TestCase
+
+from gstudio.models import Nodetype
+from gstudio.rendering import RENDERED_CONTENTS
+from gstudio.rendering import get_rendered_content
+
+
+class RenderingTestCase(TestCase):
+    """Test cases for the rendered contents of the nodetypes"""
+
+    def setUp(self):
+        RENDERED_CONTENTS.clear()
+        self.nodetype = Nodetype.objects.create(
+            title='My nodetype', slug='my-nodetype',
+            content='<p>Hello <a href="http://example.com/">world</a> '
+            '<img src="/image.jpg" /> <a name="anchor">!</a></p>')
+
+    def test_rendered_content(self):
+        rendered = self.nodetype.rendered_content
+        self.assertEquals(rendered.html, self.nodetype.content)
+        self.assertEquals(rendered.word_count, 3)
+        self.assertEquals(rendered.images, ('/image.jpg',))
+        self.assertEquals(rendered.links, ('http://example.com/',))
+        self.assertEquals(self.nodetype.word_count, 3)
+
+    def test_shared_rendering(self):
+        other = Nodetype.objects.get(pk=self.nodetype.pk)
+        self.assertTrue(other.rendered_content is
+                        self.nodetype.rendered_content)
+        self.assertEquals(len(RENDERED_CONTENTS.items), 1)
+        other.content = 'My content'
+        self.assertEquals(other.html_content, '<p>My content</p>')
+        self.assertEquals(len(RENDERED_CONTENTS.items), 2)
+
+    def test_keys(self):
+        html = get_rendered_content('My content', None)
+        markdown = get_rendered_content('My content', 'markdown')
+        self.assertFalse(html is markdown)
+        self.assertTrue(get_rendered_content('My content', None) is html)
+        self.assertEquals(get_rendered_content(None, None).word_count, 0)
@@ -0,0 +1,60 @@
+"""Test cases for Gstudio's random sampling"""
+from django.test import TestCase
+from django.core.cache import cache
+from django.contrib.sites.models import Site
+
+from gstudio import sampling
+from gstudio.models import Nodetype
+from gstudio.managers import DRAFT
+from gstudio.managers import PUBLISHED
+from gstudio.sampling import POOL_KEY
+from gstudio.sampling import sample_nodetypes
+
+
+class SamplingTestCase(TestCase):
+    """Test cases for the random sampling of the nodetypes"""
+
+    def setUp(self):
+        site = Site.objects.get_current()
+        for i in range(10):
+            nodetype = Nodetype.objects.create(
+                title='Nodetype %s' % i, slug='nodetype-%s' % i,
+                content='Nodetype %s' % i, status=PUBLISHED)
+            nodetype.sites.add(site)
+        self.draft = Nodetype.objects.create(
+            title='Draft', slug='draft', content='Draft', status=DRAFT)
+        self.old_RANDOM_POOL_SIZE = sampling.RANDOM_POOL_SIZE
+        cache.delete(POOL_KEY)
+
+    def tearDown(self):
+        sampling.RANDOM_POOL_SIZE = self.old_RANDOM_POOL_SIZE
+        cache.delete(POOL_KEY)
+
+    def slugs(self, nodetypes):
+        return [nodetype.slug for nodetype in nodetypes]
+
+    def test_sample_from_pool(self):
+        self.assertEquals(sample_nodetypes(0), [])
+        self.assertEquals(len(sample_nodetypes(20)), 10)
+        self.assertNumQueries(1, lambda: sample_nodetypes(3))
+        nodetypes = self.slugs(sample_nodetypes(5, seed=42))
+        self.assertEquals(len(set(nodetypes)), 5)
+        self.assertFalse('draft' in nodetypes)
+        self.assertEquals(self.slugs(sample_nodetypes(5, seed=42)), nodetypes)
+        self.assertEquals(len(sample_nodetypes(5, seed='minute')), 5)
+
+    def test_pool_invalidation(self):
+        self.assertEquals(len(sample_nodetypes(20)), 10)
+        self.draft.status = PUBLISHED
+        self.draft.save()
+        self.draft.sites.add(Site.objects.get_current())
+        self.assertEquals(len(sample_nodetypes(20)), 11)
+
+    def test_sample_by_probing(self):
+        sampling.RANDOM_POOL_SIZE = 4
+        nodetypes = self.slugs(sample_nodetypes(3, seed=42))
+        self.assertEquals(len(set(nodetypes)), len(nodetypes))
+        self.assertTrue(0 < len(nodetypes) <= 3)
+        self.assertFalse('draft' in nodetypes)
+        self.assertEquals(self.slugs(sample_nodetypes(3, seed=42)), nodetypes)
+        self.assertTrue(len(sample_nodetypes(20)) <= 10)
@@ -0,0 +1,91 @@
+"""Test cases for Gstudio's schema resolver"""
+from django.test import TestCase
+
+from gstudio.models import Nodetype
+from gstudio.models import Metatype
+from gstudio.models import Relation
+from gstudio.models import Attribute
+from gstudio.models import Objecttype
+from gstudio.models import Relationtype
+from gstudio.models import Attributetype
+from gstudio.schema import get_resolver
+from objectapp.models import Gbobject
+
+
+class SchemaResolverTestCase(TestCase):
+    """Test cases for the ancestor-aware schema resolver"""
+
+    def setUp(self):
+        get_resolver().clear()
+        self.thing = Objecttype.objects.create(
+            title='Thing', slug='thing', content='Thing')
+        self.animal = Objecttype.objects.create(
+            title='Animal', slug='animal', content='Animal',
+            parent=self.thing)
+        self.cat = Objecttype.objects.create(
+            title='Cat', slug='cat', content='Cat', parent=self.animal)
+        self.cat = Objecttype.objects.get(pk=self.cat.pk)
+        self.weight = Attributetype.objects.create(
+            title='weight', slug='weight', content='weight',
+            subjecttype=self.thing)
+        self.legs = Attributetype.objects.create(
+            title='legs', slug='legs', content='legs',
+            subjecttype=self.animal)
+        self.eats = Relationtype.objects.create(
+            title='eats', slug='eats', inverse='is eaten by',
+            content='eats', left_subjecttype=self.animal,
+            right_subjecttype=self.thing)
+
+    def test_ancestors(self):
+        self.assertEquals([node.pk for node in
+                           get_resolver().ancestors(self.cat)],
+                          [self.animal.pk, self.thing.pk])
+        self.assertEquals(get_resolver().ancestors(self.thing), [])
+
+    def test_get_possible_attributetypes(self):
+        self.assertNumQueries(3, lambda: self.cat.get_possible_attributetypes)
+        self.assertEquals(self.cat.get_possible_attributetypes,
+                          [self.legs, self.weight])
+        self.assertNumQueries(0, lambda: self.cat.get_possible_attributetypes)
+
+    def test_get_possible_reltypes(self):
+        reltypes = self.cat.get_possible_reltypes()
+        self.assertEquals(reltypes['possible_rightroles'], [self.eats])
+        self.assertEquals(reltypes['possible_leftroles'], [self.eats])
+
+    def test_get_possible_attributes_and_rels(self):
+        attribute = Attribute.objects.create(
+            title='animal legs', slug='animal-legs', subject=self.animal,
+            attributetype=self.legs, svalue='4')
+        relation = Relation.objects.create(
+            title='animal eats thing', slug='animal-eats-thing',
+            left_subject=self.animal, relationtype=self.eats,
+            right_subject=self.thing)
+        self.assertEquals(self.cat.get_possible_attributes, [attribute])
+        rels = self.cat.get_possible_rels
+        self.assertEquals(rels['possible_rightroles'], [relation])
+        self.assertEquals(rels['possible_leftroles'], [relation])
+
+    def test_memo_cleared_on_save(self):
+        self.assertEquals(len(self.cat.get_possible_attributetypes), 2)
+        Attributetype.objects.create(
+            title='name', slug='name', content='name',
+            subjecttype=self.animal)
+        self.assertEquals(len(self.cat.get_possible_attributetypes), 3)
+
+    def test_metatype(self):
+        root = Metatype.objects.create(title='Root', slug='root')
+        child = Metatype.objects.create(title='Child', slug='child',
+                                        parent=root)
+        child = Metatype.objects.get(pk=child.pk)
+        self.assertEquals(get_resolver().ancestors(child), [root])
+        self.assertEquals(get_resolver().ancestors(root), [])
+        self.assertEquals(child.get_possible_attributetypes, [])
+
+    def test_gbobject(self):
+        tom = Gbobject.objects.create(title='Tom', slug='tom',
+                                      content='Tom')
+        tom.objecttypes.add(Nodetype.objects.get(pk=self.cat.pk))
+        self.assertEquals([node.pk for node in
+                           get_resolver().ancestors(tom)],
+                          [self.cat.pk, self.animal.pk, self.thing.pk])
@@ -0,0 +1,270 @@
+"""Test cases for Gstudio's search index"""
+from django.test import TestCase
+from django.contrib.sites.models import Site
+from django.contrib.auth.models import User
+from django.core.management import call_command
+
+from gstudio.models import Relation
+from gstudio.models import Nodetype
+from gstudio.models import Metatype
+from gstudio.models import Attribute
+from gstudio.models import Objecttype
+from gstudio.models import Relationtype
+from gstudio.models import Attributetype
+from gstudio.models import SearchPosting
+from gstudio.models import SearchDocument
+from gstudio.caching import LRUCache
+from gstudio.managers import PUBLISHED
+from gstudio.search import Term
+from gstudio.search import QUERY
+from gstudio.search import parse_pattern
+from gstudio.search import search_pattern
+from gstudio.search import keywords_pattern
+from gstudio.searchindex import tokenize
+from gstudio.search.backends import index
+from gstudio.search.backends import database
+from gstudio.search.unified import search_nodes
+from gstudio.search.unified import search_facets
+from objectapp.models import Gbobject
+
+
+class SearchIndexTestCase(TestCase):
+    """Test cases for the inverted index of the search"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='webmaster',
+                                               email='webmaster@example.com')
+        self.metatype = Metatype.objects.create(title='Animals',
+                                                slug='animals')
+        self.cat = self.create_nodetype(
+            'cat', 'The cat', '<p>The cat chases the mouse. '
+            'A cat is a cat.</p>', 'pet, feline')
+        self.mouse = self.create_nodetype(
+            'mouse', 'The mouse', '<p>The mouse fears the cat.</p>',
+            'rodent')
+        self.cat.metatypes.add(self.metatype)
+        self.cat.authors.add(self.author)
+
+    def create_nodetype(self, slug, title, content, tags):
+        nodetype = Nodetype.objects.create(title=title, slug=slug,
+                                           content=content, tags=tags,
+                                           status=PUBLISHED)
+        nodetype.sites.add(Site.objects.get_current())
+        return nodetype
+
+    def search(self, pattern, backend=index.backend):
+        return [nodetype.slug for nodetype in backend(
+            Nodetype.published.all(), parse_pattern(pattern))]
+
+    def test_tokenize(self):
+        self.assertEquals(tokenize(u'The Cat, the m\xe9use!'),
+                          ['the', 'cat', 'the', u'm\xe9use'])
+
+    def test_parse_pattern(self):
+        term = parse_pattern('metatype:anim*')
+        self.assertTrue(isinstance(term, Term))
+        self.assertEquals((term.meta, term.search, term.wildcards),
+                          ('metatype', 'anim', 'END'))
+        operation = parse_pattern('cat -mouse or "the cat"')
+        self.assertEquals(operation.operator, 'and')
+        self.assertEquals(operation.operands[1].operator, 'or')
+        self.assertEquals(operation.operands[1].operands[0].operator, 'not')
+        self.assertEquals(parse_pattern('a').operands, ())
+        self.assertRaises(ValueError, parse_pattern, 'unknown:cat')
+
+    def test_keywords_pattern(self):
+        for pattern in ('cat', 'the cat 42', 'cat_2 of a cat'):
+            self.assertEquals(repr(keywords_pattern(pattern)),
+                              repr(QUERY.parseString(pattern)[0]))
+        self.assertEquals(keywords_pattern('cat or mouse'), None)
+        self.assertEquals(keywords_pattern('-cat'), None)
+        self.assertEquals(keywords_pattern(u'caf\xe9'), None)
+
+    def test_pattern_cache(self):
+        self.assertTrue(parse_pattern('cat  mouse') is
+                        parse_pattern(' cat mouse'))
+        self.assertTrue(parse_pattern('cat -mouse') is
+                        parse_pattern('cat -mouse'))
+        self.assertRaises(ValueError, parse_pattern, 'unknown:cat')
+        self.assertRaises(ValueError, parse_pattern, 'unknown:cat')
+        self.assertEquals(search_pattern('unknown:cat').search,
+                          'unknown:cat')
+
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEquals(sorted(cache.items.keys()), ['a', 'c'])
+        self.assertEquals(cache.get('b', 0), 0)
+        for i in range(20):
+            cache.get('a')
+        cache.set('d', 4)
+        self.assertEquals(sorted(cache.items.keys()), ['a', 'd'])
+        self.assertTrue(len(cache.queue) <= 8)
+
+    def test_index_node(self):
+        postings = dict(((posting.field, posting.term), posting)
+                        for posting in self.cat.search_postings.all())
+        self.assertEquals(postings[('', 'cat')].frequency, 4)
+        self.assertEquals(postings[('', 'cat')].positions, '1,3,8,11')
+        self.assertFalse(('', 'p') in postings)
+        self.assertTrue(('metatype', 'animals') in postings)
+        self.assertTrue(('author', 'webmaster') in postings)
+        self.assertTrue(('tag', 'feline') in postings)
+        self.assertEquals(self.cat.search_document.length, 12)
+
+        self.metatype.title = 'Felines'
+        self.metatype.save()
+        self.assertTrue(self.cat.search_postings.filter(
+            field='metatype', term='felines').count())
+        self.cat.metatypes.clear()
+        self.assertFalse(self.cat.search_postings.filter(
+            field='metatype').count())
+
+    def test_search(self):
+        self.assertEquals(self.search('cat'), ['cat', 'mouse'])
+        self.assertEquals(self.search('mouse'), ['mouse', 'cat'])
+        self.assertEquals(self.search('chases'), ['cat'])
+        self.assertEquals(self.search('cat -chases'), ['mouse'])
+        self.assertEquals(self.search('-chases'), ['mouse'])
+        self.assertEquals(sorted(self.search('chases or fears')),
+                          ['cat', 'mouse'])
+        self.assertEquals(self.search('"cat chases"'), ['cat'])
+        self.assertEquals(self.search('"chases cat"'), [])
+        self.assertEquals(self.search('"chases dog"'), [])
+        self.assertEquals(self.search('cha*'), ['cat'])
+        self.assertEquals(self.search('metatype:animals'), ['cat'])
+        self.assertEquals(self.search('metatype:*mals'), ['cat'])
+        self.assertEquals(self.search('author:webmaster mouse'), ['cat'])
+        self.assertEquals(self.search('tag:feli'), ['cat'])
+        self.assertEquals(sorted(self.search('cat', database.backend)),
+                          ['cat', 'mouse'])
+
+    def test_search_common_phrase(self):
+        limit = index.PHRASE_LIMIT
+        try:
+            index.PHRASE_LIMIT = 1
+            self.assertEquals(self.search('"cat chases"'), ['cat'])
+            index.PHRASE_LIMIT = 0
+            self.assertEquals(self.search('"chases cat"'), ['cat'])
+        finally:
+            index.PHRASE_LIMIT = limit
+
+    def test_search_queries(self):
+        self.assertNumQueries(3, lambda: self.search('cat -mouse'))
+        self.assertNumQueries(1, lambda: self.search('-mouse'))
+        self.assertNumQueries(2, lambda: self.search('cat -mouse'))
+        self.create_nodetype('dog', 'The dog', '<p>A dog.</p>', '')
+        self.assertNumQueries(3, lambda: self.search('cat -mouse'))
+        Nodetype.objects.get(slug='dog').delete()
+        self.assertNumQueries(3, lambda: self.search('cat -mouse'))
+
+    def test_manager_search(self):
+        self.assertEquals(Nodetype.published.search('chases').count(), 1)
+        self.assertEquals(Nodetype.published.basic_search(
+            'chases fears').count(), 2)
+
+    def test_rebuild_search_index(self):
+        SearchPosting.objects.all().delete()
+        SearchDocument.objects.all().delete()
+        call_command('rebuild_search_index', verbosity=0)
+        self.assertEquals(self.search('chases'), ['cat'])
+        self.assertEquals(SearchDocument.objects.count(),
+                          Nodetype.objects.count())
+
+
+class UnifiedSearchTestCase(TestCase):
+    """Test cases for the search over all the kinds of nodes"""
+
+    def setUp(self):
+        site = Site.objects.get_current()
+        self.animal = Objecttype.objects.create(
+            title='Animal', slug='animal', content='Animal',
+            status=PUBLISHED)
+        self.animal.sites.add(site)
+        self.tom = Gbobject.objects.create(
+            title='Tom', slug='tom', content='Tom the cat',
+            status=PUBLISHED)
+        self.tom.sites.add(site)
+        self.tom.objecttypes.add(self.animal)
+        self.jerry = Gbobject.objects.create(
+            title='Jerry', slug='jerry', content='Jerry the mouse',
+            status=PUBLISHED)
+        self.jerry.sites.add(site)
+        self.chases = Relationtype.objects.create(
+            title='chases', slug='chases', inverse='is chased by',
+            content='chases', left_subjecttype=self.animal,
+            right_subjecttype=self.animal, status=PUBLISHED)
+        self.chases.sites.add(site)
+        self.relation = Relation.objects.create(
+            title='tom chases jerry', slug='tom-chases-jerry',
+            left_subject=self.tom, relationtype=self.chases,
+            right_subject=self.jerry)
+        self.color = Attributetype.objects.create(
+            title='color', slug='color', content='color',
+            subjecttype=self.animal)
+        self.attribute = Attribute.objects.create(
+            title='tom color', slug='tom-color', subject=self.tom,
+            attributetype=self.color, svalue='Grey')
+
+    def search(self, pattern, backend=index.backend):
+        return [gbobject.slug for gbobject in backend(
+            Gbobject.published.all(), parse_pattern(pattern))]
+
+    def test_index_kinds(self):
+        self.assertEquals(self.relation.search_document.kind, 'relation')
+        self.assertEquals(self.attribute.search_document.kind, 'attribute')
+        self.assertEquals(self.tom.search_document.kind, 'gbobject')
+        self.assertEquals(self.chases.search_document.kind, 'nodetype')
+        self.assertTrue(self.tom.search_postings.filter(
+            field='attr', term='color=grey').count())
+        self.assertTrue(self.tom.search_postings.filter(
+            field='objecttype', term='animal').count())
+
+        self.attribute.svalue = 'Black'
+        self.attribute.save()
+        self.assertTrue(self.tom.search_postings.filter(
+            field='attr', term='color=black').count())
+        self.color.title = 'Colour'
+        self.color.save()
+        self.assertTrue(self.tom.search_postings.filter(
+            field='attr', term='colour=black').count())
+        self.attribute.delete()
+        self.assertFalse(self.tom.search_postings.filter(
+            field='attr').count())
+
+    def test_meta_search(self):
+        for backend in (index.backend, database.backend):
+            self.assertEquals(self.search('attr:color=grey', backend),
+                              ['tom'])
+            self.assertEquals(self.search('attr:color=gr*', backend),
+                              ['tom'])
+            self.assertEquals(self.search('attr:color', backend), ['tom'])
+            self.assertEquals(self.search('attr:color=black', backend), [])
+            self.assertEquals(self.search('Objecttype:animal', backend),
+                              ['tom'])
+        self.assertEquals(self.search('-objecttype:animal'), ['jerry'])
+        self.assertEquals(self.search('metatype:animal', database.backend),
+                          [])
+        self.assertEquals(sorted(self.search('-metatype:animal',
+                                             database.backend)),
+                          ['jerry', 'tom'])
+        self.assertEquals(list(database.backend(
+            Nodetype.published.all(), parse_pattern('objecttype:animal'))),
+                          [])
+        self.assertEquals(Gbobject.published.search('mouse').count(), 1)
+
+    def test_search_nodes(self):
+        ids = lambda pattern, *kinds: [node.pk for node in
+                                        search_nodes(pattern, *kinds)]
+        self.assertEquals(ids('tom')[0], self.tom.pk)
+        self.assertEquals(sorted(ids('tom')), sorted([
+            self.tom.pk, self.relation.pk, self.attribute.pk]))
+        self.assertEquals(ids('tom', ['relation']), [self.relation.pk])
+        self.assertEquals(ids('tom', []), [])
+        self.assertEquals(ids('chases', ['nodetype']), [self.chases.pk])
+        self.assertEquals(search_facets('tom'),
+                          {'gbobject': 1, 'relation': 1, 'attribute': 1})
+        self.assertEquals(search_facets('jerry', ['gbobject']),
+                          {'gbobject': 1})
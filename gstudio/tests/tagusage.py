@@ -0,0 +1,83 @@
+"""Test cases for Gstudio's tag usage"""
+from datetime import datetime
+from datetime import timedelta
+
+from django.test import TestCase
+from django.contrib.sites.models import Site
+
+from gstudio.models import Nodetype
+from gstudio.models import TagUsage
+from gstudio.managers import DRAFT
+from gstudio.managers import PUBLISHED
+from gstudio.managers import tags_published
+from gstudio.publication import update_live
+from gstudio.tagusage import tags_usage
+from gstudio.tagusage import rebuild_tag_usage
+
+
+class TagUsageTestCase(TestCase):
+    """Test cases for the usage of the tags"""
+
+    def setUp(self):
+        self.now = datetime.now()
+        self.site = Site.objects.get_current()
+        self.other_site = Site.objects.create(domain='http://domain.com',
+                                              name='Domain.com')
+        self.first = self.create_nodetype(
+            'first', 'gstudio, test', creation_date=datetime(2010, 1, 1))
+        self.second = self.create_nodetype(
+            'second', 'gstudio', creation_date=datetime(2011, 1, 1))
+
+    def create_nodetype(self, slug, tags, **kwargs):
+        params = {'title': slug, 'slug': slug, 'content': slug,
+                  'tags': tags, 'status': PUBLISHED,
+                  'start_publication': self.now - timedelta(days=1)}
+        params.update(kwargs)
+        nodetype = Nodetype.objects.create(**params)
+        nodetype.sites.add(self.site)
+        return nodetype
+
+    def usage(self):
+        return [(tag.name, tag.count, tag.last_used)
+                for tag in tags_usage(Nodetype)]
+
+    def test_tag_changes(self):
+        self.assertEquals(self.usage(),
+                          [('gstudio', 2, datetime(2011, 1, 1)),
+                           ('test', 1, datetime(2010, 1, 1))])
+        self.assertNumQueries(1, lambda: tags_usage(Nodetype))
+        self.second.tags = 'test'
+        self.second.save()
+        self.assertEquals(self.usage(),
+                          [('gstudio', 1, datetime(2010, 1, 1)),
+                           ('test', 2, datetime(2011, 1, 1))])
+        self.first.tags = 'test'
+        self.first.save()
+        self.assertEquals([tag.name for tag in tags_published()], ['test'])
+
+    def test_publication_changes(self):
+        self.second.status = DRAFT
+        self.second.save()
+        self.assertEquals(self.usage(),
+                          [('gstudio', 1, datetime(2010, 1, 1)),
+                           ('test', 1, datetime(2010, 1, 1))])
+        self.first.sites.add(self.other_site)
+        self.assertEquals(TagUsage.objects.filter(
+            site=self.other_site).count(), 2)
+        self.site.nodetypes.clear()
+        self.assertEquals(self.usage(), [])
+        self.first.delete()
+        self.assertEquals(TagUsage.objects.count(), 0)
+
+    def test_publication_scheduler(self):
+        self.create_nodetype('third', 'later',
+                             start_publication=self.now + timedelta(days=1))
+        self.assertEquals(tags_published().filter(name='later').count(), 0)
+        update_live(self.now + timedelta(days=2))
+        self.assertEquals(tags_published().filter(name='later').count(), 1)
+
+    def test_rebuild_tag_usage(self):
+        TagUsage.objects.all().delete()
+        rebuild_tag_usage()
+        self.assertEquals(TagUsage.objects.count(), 2)
+        self.assertEquals(self.usage()[0][1], 2)
@@ -0,0 +1,78 @@
+"""Test cases for Gstudio's tree paths"""
+from django.test import TestCase
+
+from gstudio.models import Metatype
+from gstudio.models import Objecttype
+from gstudio.treepaths import rebuild_tree_paths
+from gstudio.views.metatypes import get_metatype_or_404
+
+
+class TreePathsTestCase(TestCase):
+    """Test cases for the stored tree paths"""
+
+    def setUp(self):
+        self.root = Metatype.objects.create(title='Root', slug='root')
+        self.child = Metatype.objects.create(title='Child', slug='child',
+                                             parent=self.root)
+        self.leaf = Metatype.objects.create(title='Leaf', slug='leaf',
+                                            parent=self.child)
+        self.other = Metatype.objects.create(title='Other', slug='other')
+
+    def paths(self):
+        return dict(Metatype.objects.values_list('slug', 'tree_path'))
+
+    def test_create(self):
+        self.assertEquals(self.paths(), {'root': 'root',
+                                         'child': 'root/child',
+                                         'leaf': 'root/child/leaf',
+                                         'other': 'other'})
+        self.assertEquals(self.leaf.parent_tree_path, 'root/child')
+        self.assertEquals(self.leaf.composed_sentence,
+                          'Leaf is a kind of root/child')
+
+    def test_rename_and_move(self):
+        self.root.slug = 'top'
+        self.root.save()
+        self.assertEquals(self.paths()['leaf'], 'top/child/leaf')
+        child = Metatype.objects.get(pk=self.child.pk)
+        child.parent = self.other
+        child.save()
+        self.assertEquals(self.paths(), {'root': 'top',
+                                         'child': 'other/child',
+                                         'leaf': 'other/child/leaf',
+                                         'other': 'other'})
+
+    def test_rewrite_subtree_only(self):
+        sibling = Metatype.objects.create(title='Root 2', slug='root_2')
+        Metatype.objects.create(title='Child 2', slug='child',
+                                parent=sibling)
+        homonym = Metatype.objects.create(title='Root 3', slug='Root')
+        Metatype.objects.create(title='Child 3', slug='child',
+                                parent=homonym)
+        self.root.slug = 'top'
+        self.root.save()
+        self.assertEquals(
+            sorted(Metatype.objects.filter(slug='child').values_list(
+                'tree_path', flat=True)),
+            ['Root/child', 'root_2/child', 'top/child'])
+
+    def test_nodetypes(self):
+        animal = Objecttype.objects.create(title='Animal', slug='animal')
+        dog = Objecttype.objects.create(title='Dog', slug='dog',
+                                        parent=animal)
+        self.assertEquals(dog.tree_path, 'animal/dog')
+        self.assertEquals(dog.subtypeof(), 'animal')
+        self.assertEquals(animal.subtypeof(), None)
+
+    def test_get_metatype_or_404(self):
+        self.assertEquals(get_metatype_or_404('/root/child/leaf/'),
+                          self.leaf)
+        Metatype.objects.create(title='Leaf', slug='leaf',
+                                parent=self.other)
+        self.assertEquals(get_metatype_or_404('root/child/leaf'), self.leaf)
+
+    def test_rebuild_tree_paths(self):
+        Metatype.objects.update(tree_path='')
+        self.assertEquals(rebuild_tree_paths(), 4)
+        self.assertEquals(self.paths()['leaf'], 'root/child/leaf')
+        self.assertEquals(rebuild_tree_paths(), 0)
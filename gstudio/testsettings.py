@@ -32,7 +32,7 @@ INSTALLED_APPS = ['django.contrib.contenttypes',
                   'django.contrib.admin',
                   'django.contrib.auth',
                   'django_xmlrpc',
-                  'mptt', 'tagging', 'gstudio']
+                  'mptt', 'tagging', 'gstudio', 'objectapp']
 
 GSTUDIO_PAGINATION = 3
 
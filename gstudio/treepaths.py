@@ -0,0 +1,87 @@
+"""Materialized tree paths of the metatypes and nodetypes of Gstudio
+
+The slugs from the root down to a metatype or a nodetype are stored
+in its indexed tree_path column, computed from the path of its parent
+when it is saved. When the path of a node changes, by a new slug or
+a move in the tree, the paths of its descendants, found by their
+nested set interval, are rewritten by a single UPDATE of their common
+prefix. So the URLs and the sentences
+are built without walking up the ancestors, and the metatypes are
+found by their full path."""
+from django.db import connection
+from django.db import transaction
+
+
+def tree_path_models():
+    """Return the base models having a stored tree path"""
+    from gstudio.models import Metatype
+    from gstudio.models import Nodetype
+    return [Metatype, Nodetype]
+
+
+def tree_path_base(model):
+    """Return the base model storing the tree path of a model"""
+    for base in tree_path_models():
+        if issubclass(model, base):
+            return base
+
+
+def compute_tree_path(node):
+    """Return the tree path of a node, from the stored
+    tree path of its parent"""
+    if node.parent_id:
+        parent_path = tree_path_base(node.__class__).objects.filter(
+            pk=node.parent_id).values_list('tree_path', flat=True)[0]
+        return '%s/%s' % (parent_path, node.slug)
+    return node.slug
+
+
+def rewrite_subtree(base, node, old_path):
+    """Replace the old path of a node by its new one at the
+    start of the tree paths of its descendants, selected by
+    the saved position of the node in the tree"""
+    quote_name = connection.ops.quote_name
+    column = quote_name('tree_path')
+    if connection.vendor == 'mysql':
+        value = 'CONCAT(%%s, SUBSTR(%s, %%s))' % column
+    else:
+        value = '%%s || SUBSTR(%s, %%s)' % column
+    cursor = connection.cursor()
+    cursor.execute('UPDATE %s SET %s = %s WHERE %s = %%s '
+                   'AND %s > %%s AND %s < %%s' % (
+        quote_name(base._meta.db_table), column, value,
+        quote_name('tree_id'), quote_name('lft'), quote_name('rght')),
+                   ['%s/' % node.tree_path, len(old_path) + 2,
+                    node.tree_id, node.lft, node.rght])
+    transaction.commit_unless_managed()
+
+
+def rebuild_tree_paths():
+    """Recompute the tree paths of all the metatypes and nodetypes,
+    the parents before their children"""
+    count = 0
+    for base in tree_path_models():
+        paths = {}
+        for pk, parent, slug, tree_path in base.objects.order_by(
+            'tree_id', 'lft').values_list('pk', 'parent', 'slug', 'tree_path'):
+            paths[pk] = parent in paths and \
+                        '%s/%s' % (paths[parent], slug) or slug
+            if paths[pk] != tree_path:
+                base.objects.filter(pk=pk).update(tree_path=paths[pk])
+                count += 1
+    return count
+
+
+def tree_path_pre_save_handler(sender, **kwargs):
+    """Compute the tree path of a node being saved"""
+    if not kwargs.get('raw'):
+        instance = kwargs['instance']
+        instance.tree_path = compute_tree_path(instance)
+
+
+def tree_path_saved(sender, instance, created, previous):
+    """Rewrite the tree paths of the descendants of a node
+    renamed or moved in the tree"""
+    old_path = previous and previous['tree_path']
+    if old_path and old_path != instance.tree_path:
+        rewrite_subtree(tree_path_base(sender), instance, old_path)
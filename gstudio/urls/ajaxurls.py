@@ -6,4 +6,6 @@ urlpatterns = patterns('gstudio.views.ajaxviews',
                        url(r'^$', 'AjaxAttribute',
 
                            name='ajax_views'),
+                       url(r'^complete/?$', 'complete',
+                           name='gstudio_complete'),
                        )
@@ -10,5 +10,7 @@ from gstudio.settings import ALLOW_FUTURE
 urlpatterns = patterns(
     'gstudio.views.graphs',
     url(r'^graph_json/(?P<node_id>\d+)$','graph_json', name='graph_json_d3'), 
+    url(r'^graph_json/(?P<node_id>\d+)/egonet$', 'graph_egonet_json',
+        name='graph_egonet_json'),
     url(r'^graph/(?P<node_id>\d+)$','force_graph', name='force_graph_d3'), 
     )
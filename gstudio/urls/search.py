@@ -4,4 +4,5 @@ from django.conf.urls.defaults import patterns
 
 urlpatterns = patterns('gstudio.views.search',
                        url(r'^$', 'nodetype_search', name='gstudio_nodetype_search'),
+                       url(r'^nodes/$', 'node_search', name='gstudio_node_search'),
                        )
@@ -2,6 +2,8 @@ from django.http import HttpResponse
 import json
 from gstudio.models import *
 from objectapp.models import *
+from gstudio.settings import COMPLETION_LIMIT
+from gstudio.completion import get_completion_index
 
 def AjaxAttribute(request):
     iden = request.GET["id"]
@@ -15,6 +17,20 @@ def AjaxAttribute(request):
                 returndict[member.id] = member.title
     jsonobject = json.dumps(returndict)
     return HttpResponse(jsonobject, "application/json")
+
+
+def complete(request):
+    """Return the best nodes having a name
+    starting with the 'q' argument"""
+    try:
+        limit = min(max(int(request.GET.get('limit', COMPLETION_LIMIT)), 1),
+                    COMPLETION_LIMIT)
+    except ValueError:
+        limit = COMPLETION_LIMIT
+    completions = [{'id': pk, 'title': title} for pk, title in
+                   get_completion_index().complete(request.GET.get('q', ''),
+                                                   limit)]
+    return HttpResponse(json.dumps(completions), "application/json")
     
                 
                 
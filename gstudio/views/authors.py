@@ -5,6 +5,7 @@ from django.views.generic.list_detail import object_list
 from gstudio.models import Author
 from gstudio.settings import PAGINATION
 from gstudio.views.decorators import update_queryset
+from gstudio.views.decorators import keyset_pagination
 from gstudio.views.decorators import template_name_for_nodetype_queryset_filtered
 
 
@@ -23,6 +24,6 @@ def author_detail(request, username, page=None, **kwargs):
     extra_context.update({'author': author})
     kwargs['extra_context'] = extra_context
 
-    return object_list(request, queryset=author.nodetypes_published(),
-                       paginate_by=PAGINATION, page=page,
-                       **kwargs)
+    return keyset_pagination(object_list)(
+        request, queryset=author.nodetypes_published(),
+        paginate_by=PAGINATION, page=page, **kwargs)
@@ -1,6 +1,9 @@
 """Decorators for gstudio.views"""
+import time
+from datetime import date
 from functools import wraps
 
+from django.http import Http404
 from django.template import RequestContext
 from django.contrib.auth.views import login
 from django.shortcuts import redirect
@@ -9,8 +12,13 @@ from django.shortcuts import render_to_response
 from django.template.loader import get_template
 from django.template import TemplateDoesNotExist
 from django.views.decorators.csrf import csrf_protect
+from django.core.paginator import InvalidPage
 from django.views.decorators.cache import never_cache
 
+from gstudio.settings import PAGINATION_KEYSET
+from gstudio.archives import archive_dates
+from gstudio.pagination import KeysetPaginator
+
 
 def update_queryset(view, queryset,
                     queryset_parameter='queryset'):
@@ -28,6 +36,88 @@ def update_queryset(view, queryset,
     return wrapper
 
 
+def keyset_pagination(view):
+    """Decorator around the object_list view paginating
+    the nodetypes by keyset if GSTUDIO_PAGINATION_KEYSET
+    is enabled, with the 'after' and 'before' cursors
+    of the query string instead of the page number"""
+
+    @wraps(view)
+    def wrapper(request, queryset, paginate_by=None, page=None, **kwargs):
+        """Seek the page of nodetypes and pass it in the context"""
+        if not (PAGINATION_KEYSET and paginate_by):
+            return view(request, queryset, paginate_by=paginate_by,
+                        page=page, **kwargs)
+
+        paginator = KeysetPaginator(queryset, paginate_by)
+        try:
+            page_obj = paginator.page(request.GET.get('after'),
+                                      request.GET.get('before'))
+        except InvalidPage:
+            raise Http404
+        if not page_obj.object_list and not kwargs.get('allow_empty', True):
+            raise Http404
+
+        extra_context = kwargs.get('extra_context', {}).copy()
+        extra_context.update({
+            '%s_list' % kwargs.get('template_object_name', 'object'):
+            page_obj.object_list,
+            'paginator': paginator,
+            'page_obj': page_obj,
+            'is_paginated': page_obj.has_other_pages()})
+        kwargs.update({'extra_context': extra_context,
+                       'allow_empty': True})
+        return view(request, paginator.queryset, **kwargs)
+
+    return wrapper
+
+
+def date_archives(view, date_list_kind=None):
+    """Decorator around the date based views checking in
+    gstudio.archives that nodetypes are published in the period
+    before listing them, and passing the months or the days
+    having nodetypes as the date_list of the context"""
+
+    @wraps(view)
+    def wrapper(request, year, month=None, day=None, **kwargs):
+        """Check the archives of the period and list its dates"""
+        values = [year]
+        formats = ['%Y']
+        lookups = {}
+        if month:
+            values.append(month)
+            formats.append(kwargs.get('month_format', '%b'))
+            kwargs['month'] = month
+        if day:
+            values.append(day)
+            formats.append(kwargs.get('day_format', '%d'))
+            kwargs['day'] = day
+        try:
+            period = time.strptime('-'.join(values), '-'.join(formats))
+        except ValueError:
+            raise Http404
+
+        lookups['day__year'] = period.tm_year
+        if month:
+            lookups['day__month'] = period.tm_mon
+        if day:
+            lookups['day__day'] = period.tm_mday
+        if not kwargs.get('allow_future'):
+            lookups['day__lte'] = date.today()
+        dates = archive_dates(date_list_kind or 'day', **lookups)
+        if not dates and not kwargs.get('allow_empty'):
+            raise Http404
+
+        if date_list_kind:
+            extra_context = kwargs.get('extra_context', {}).copy()
+            extra_context['date_list'] = dates
+            kwargs['extra_context'] = extra_context
+        kwargs['allow_empty'] = True
+        return view(request, year, **kwargs)
+
+    return wrapper
+
+
 @csrf_protect
 @never_cache
 def password(request, nodetype):
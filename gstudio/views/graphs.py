@@ -9,6 +9,10 @@ from gstudio.gnowql import *
 import json
 import os
  
+from gstudio.models import NID
+from gstudio.egonet import egonet
+from gstudio.egonet import iter_egonet_json
+from gstudio.settings import GRAPH_MAX_DEPTH
 from gstudio.views.decorators import protect_nodetype
 from gstudio.views.decorators import update_queryset
 
@@ -28,6 +32,21 @@ def graph_json(request, node_id):
 
     return HttpResponse(node.get_graph_json(), "application/json")
     
+def graph_egonet_json(request, node_id):
+    """Stream the egonet of a node, explored up to the depth,
+    along the relation types given in the query string and
+    through the inferred relations if asked"""
+    node = get_object_or_404(NID, pk=node_id)
+    try:
+        depth = int(request.GET.get('depth', 1))
+    except ValueError:
+        depth = 1
+    depth = max(1, min(depth, GRAPH_MAX_DEPTH))
+
+    nodes, edges = egonet(node, depth, request.GET.getlist('relationtype'),
+                          bool(request.GET.get('inferred')))
+    return HttpResponse(iter_egonet_json(nodes, edges), 'application/json')
+
 def force_graph(request, node_id):
     return render_to_response('gstudio/graph1.html',{'node_id': node_id })
 
@@ -4,13 +4,14 @@ from django.views.generic.list_detail import object_list
 
 from gstudio.models import Metatype
 from gstudio.settings import PAGINATION
+from gstudio.views.decorators import keyset_pagination
 from gstudio.views.decorators import template_name_for_nodetype_queryset_filtered
 
 
 def get_metatype_or_404(path):
     """Retrieve a Metatype by a path"""
     path_bits = [p for p in path.split('/') if p]
-    return get_object_or_404(Metatype, slug=path_bits[-1])
+    return get_object_or_404(Metatype, tree_path='/'.join(path_bits))
 
 
 def metatype_detail(request, path, page=None, **kwargs):
@@ -25,6 +26,6 @@ def metatype_detail(request, path, page=None, **kwargs):
     extra_context.update({'metatype': metatype})
     kwargs['extra_context'] = extra_context
 
-    return object_list(request, queryset=metatype.nodetypes_published(),
-                       paginate_by=PAGINATION, page=page,
-                       **kwargs)
+    return keyset_pagination(object_list)(
+        request, queryset=metatype.nodetypes_published(),
+        paginate_by=PAGINATION, page=page, **kwargs)
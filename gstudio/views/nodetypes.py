@@ -1,24 +1,53 @@
 """Views for Gstudio nodetypes"""
+from datetime import datetime
+
 from django.shortcuts import redirect
 from django.shortcuts import get_object_or_404
 from django.views.generic.list_detail import object_list
-from django.views.generic.date_based import archive_year
 from django.views.generic.date_based import archive_month
 from django.views.generic.date_based import archive_day
 from django.views.generic.date_based import object_detail
 
 from gstudio.models import Nodetype
 from gstudio.views.decorators import protect_nodetype
+from gstudio.views.decorators import date_archives
 from gstudio.views.decorators import update_queryset
-
-
-nodetype_index = update_queryset(object_list, Nodetype.published.all)
-
-nodetype_year = update_queryset(archive_year, Nodetype.published.all)
-
-nodetype_month = update_queryset(archive_month, Nodetype.published.all)
-
-nodetype_day = update_queryset(archive_day, Nodetype.published.all)
+from gstudio.views.decorators import keyset_pagination
+
+
+def archive_year(request, year, queryset, date_field,
+                 allow_future=False, make_object_list=False, **kwargs):
+    """Archive of a year rendered by object_list, the months
+    having nodetypes being passed in the date_list of the
+    extra_context by date_archives instead of being queried"""
+    model = queryset.model
+    if make_object_list:
+        lookups = {'%s__year' % date_field: int(year)}
+        if not allow_future:
+            lookups['%s__lte' % date_field] = datetime.now()
+        queryset = queryset.filter(**lookups)
+    else:
+        queryset = queryset.none()
+
+    extra_context = kwargs.pop('extra_context', {}).copy()
+    extra_context['year'] = year
+    kwargs.setdefault('template_name', '%s/%s_archive_year.html' % (
+        model._meta.app_label, model._meta.object_name.lower()))
+    return object_list(request, queryset,
+                       extra_context=extra_context, **kwargs)
+
+
+nodetype_index = update_queryset(keyset_pagination(object_list),
+                                 Nodetype.published.all)
+
+nodetype_year = update_queryset(date_archives(archive_year, 'month'),
+                                Nodetype.published.all)
+
+nodetype_month = update_queryset(date_archives(archive_month, 'day'),
+                                 Nodetype.published.all)
+
+nodetype_day = update_queryset(date_archives(archive_day),
+                               Nodetype.published.all)
 
 nodetype_detail = protect_nodetype(object_detail)
 
@@ -1,9 +1,20 @@
 """Views for Gstudio nodetypes search"""
+from django.http import Http404
+from django.template import RequestContext
+from django.core.paginator import Paginator
+from django.core.paginator import InvalidPage
+from django.shortcuts import render_to_response
 from django.utils.translation import ugettext as _
 from django.views.generic.list_detail import object_list
 
+from gstudio.models import NID
 from gstudio.models import Nodetype
 from gstudio.settings import PAGINATION
+from gstudio.searchindex import KINDS
+from gstudio.searchindex import node_kind
+from gstudio.search.unified import search_nodes
+from gstudio.search.unified import search_facets
+from gstudio.views.decorators import keyset_pagination
 
 
 def nodetype_search(request):
@@ -21,8 +32,43 @@ def nodetype_search(request):
     else:
         error = _('No pattern to search found')
 
-    return object_list(request, queryset=nodetypes,
-                       paginate_by=PAGINATION,
-                       template_name='gstudio/nodetype_search.html',
-                       extra_context={'error': error,
-                                      'pattern': pattern})
+    return keyset_pagination(object_list)(
+        request, queryset=nodetypes, paginate_by=PAGINATION,
+        template_name='gstudio/nodetype_search.html',
+        extra_context={'error': error, 'pattern': pattern})
+
+
+def node_search(request):
+    """Search the nodetypes, gbobjects, relations and attributes
+    matching with a pattern, optionally of some kinds only"""
+    error = None
+    pattern = request.GET.get('pattern', '')
+    kinds = [kind for kind in request.GET.getlist('kind')
+             if kind in KINDS] or list(KINDS)
+    facets = {}
+    nodes = NID.objects.none()
+
+    if not request.GET:
+        error = _('No pattern to search found')
+    elif len(pattern) < 3:
+        error = _('The pattern is too short')
+    else:
+        nodes = search_nodes(pattern, kinds)
+        facets = search_facets(pattern)
+
+    paginator = Paginator(nodes, PAGINATION)
+    try:
+        page = paginator.page(request.GET.get('page', 1))
+    except (InvalidPage, ValueError):
+        raise Http404
+    page.object_list = NID.objects.resolve_many(page.object_list)
+    for node in page.object_list:
+        node.search_kind = node_kind(node)
+
+    return render_to_response(
+        'gstudio/node_search.html',
+        {'object_list': page.object_list, 'page_obj': page,
+         'paginator': paginator, 'is_paginated': paginator.num_pages > 1,
+         'error': error, 'pattern': pattern, 'kinds': kinds,
+         'facets': [(kind, facets.get(kind, 0)) for kind in KINDS]},
+        context_instance=RequestContext(request))
@@ -1,13 +1,18 @@
 """Views for Gstudio tags"""
+from django.http import Http404
 from django.template import RequestContext
 from django.shortcuts import render_to_response
 from django.template.defaultfilters import slugify
+from django.utils.translation import ugettext as _
+from django.views.generic.list_detail import object_list
 
-from tagging.models import Tag
-from tagging.views import tagged_object_list
+from tagging.utils import get_tag
+from tagging.models import TaggedItem
 
 from gstudio.models import Nodetype
 from gstudio.settings import PAGINATION
+from gstudio.tagusage import tags_usage
+from gstudio.views.decorators import keyset_pagination
 
 from gstudio.views.decorators import template_name_for_nodetype_queryset_filtered
 
@@ -15,19 +20,26 @@ from gstudio.views.decorators import template_name_for_nodetype_queryset_filtere
 def tag_list(request, template_name='gstudio/tag_list.html'):
     """Return the list of published tags with counts,
     try to simulate an object_list view"""
-    tag_list = Tag.objects.usage_for_queryset(
-        Nodetype.published.all(), counts=True)
+    tag_list = tags_usage(Nodetype)
     return render_to_response(template_name, {'object_list': tag_list},
                               context_instance=RequestContext(request))
 
 
 def tag_detail(request, tag, page=None, **kwargs):
-    """Display the nodetypes of a tag"""
+    """Display the nodetypes of a tag,
+    like tagging's tagged_object_list view"""
+    tag_instance = get_tag(tag)
+    if tag_instance is None:
+        raise Http404(_('No Tag found matching "%s".') % tag)
     if not kwargs.get('template_name'):
         kwargs['template_name'] = template_name_for_nodetype_queryset_filtered(
             'tag', slugify(tag))
 
-    return tagged_object_list(request, tag=tag,
-                              queryset_or_model=Nodetype.published.all(),
-                              paginate_by=PAGINATION, page=page,
-                              **kwargs)
+    extra_context = kwargs.pop('extra_context', {}).copy()
+    extra_context['tag'] = tag_instance
+    kwargs['extra_context'] = extra_context
+
+    return keyset_pagination(object_list)(
+        request, queryset=TaggedItem.objects.get_by_model(
+            Nodetype.published.all(), tag_instance),
+        paginate_by=PAGINATION, page=page, **kwargs)
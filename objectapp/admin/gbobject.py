@@ -17,6 +17,8 @@ from tagging.models import Tag
 from objectapp import settings
 from objectapp.managers import HIDDEN
 from objectapp.managers import PUBLISHED
+from gstudio.publication import refresh_live
+from gstudio.publication import redate_nodes
 from objectapp.ping import DirectoryPinger
 from objectapp.admin.forms import GbobjectAdminForm
 
@@ -216,7 +218,11 @@ class GbobjectAdmin(reversion.VersionAdmin):
 
     def make_published(self, request, queryset):
         """Set gbobjects selected as published"""
+        # The queryset may be filtered on the status it changes
+        pks = list(queryset.values_list('pk', flat=True))
+        queryset = queryset.model.objects.filter(pk__in=pks)
         queryset.update(status=PUBLISHED)
+        refresh_live(queryset)
         self.ping_directories(request, queryset, messages=False)
         self.message_user(
             request, _('The selected gbobjects are now marked as published.'))
@@ -224,7 +230,11 @@ class GbobjectAdmin(reversion.VersionAdmin):
 
     def make_hidden(self, request, queryset):
         """Set gbobjects selected as hidden"""
+        # The queryset may be filtered on the status it changes
+        pks = list(queryset.values_list('pk', flat=True))
+        queryset = queryset.model.objects.filter(pk__in=pks)
         queryset.update(status=HIDDEN)
+        refresh_live(queryset)
         self.message_user(
             request, _('The selected gbobjects are now marked as hidden.'))
     make_hidden.short_description = _('Set gbobjects selected as hidden')
@@ -263,7 +273,10 @@ class GbobjectAdmin(reversion.VersionAdmin):
 
     def put_on_top(self, request, queryset):
         """Put the selected gbobjects on top at the current date"""
-        queryset.update(creation_date=datetime.now())
+        # The queryset may be filtered on the date it changes
+        pks = list(queryset.values_list('pk', flat=True))
+        queryset = queryset.model.objects.filter(pk__in=pks)
+        redate_nodes(queryset, datetime.now())
         self.ping_directories(request, queryset, messages=False)
         self.message_user(request, _(
             'The selected gbobjects are now set at the current date.'))
@@ -1,6 +1,4 @@
 """Managers of Objectapp"""
-from datetime import datetime
-
 from django.db import models
 from django.contrib.sites.models import Site
 
@@ -10,13 +8,10 @@ PUBLISHED = 2
 
 
 def tags_published():
-    """Return the published tags"""
-    from tagging.models import Tag
+    """Return the published tags, as counted by gstudio.tagusage"""
     from objectapp.models import Gbobject
-    tags_gbobject_published = Tag.objects.usage_for_queryset(
-        Gbobject.published.all())
-    # Need to do that until the issue #44 of django-tagging is fixed
-    return Tag.objects.filter(name__in=[t.name for t in tags_gbobject_published])
+    from gstudio.tagusage import published_tags
+    return published_tags(Gbobject)
 
 
 class AuthorPublishedManager(models.Manager):
@@ -24,22 +19,16 @@ class AuthorPublishedManager(models.Manager):
 
     def get_query_set(self):
         """Return published authors"""
-        now = datetime.now()
         return super(AuthorPublishedManager, self).get_query_set().filter(
-            gbobjects__status=PUBLISHED,
-            gbobjects__start_publication__lte=now,
-            gbobjects__end_publication__gt=now,
+            gbobjects__is_live=True,
             gbobjects__sites=Site.objects.get_current()
             ).distinct()
 
 
 def gbobjects_published(queryset):
-    """Return only the gbobjects published"""
-    now = datetime.now()
-    return queryset.filter(status=PUBLISHED,
-                           start_publication__lte=now,
-                           end_publication__gt=now,
-                           sites=Site.objects.get_current())
+    """Return only the gbobjects published, live on the current site,
+    as flagged by gstudio.publication"""
+    return queryset.filter(is_live=True, sites=Site.objects.get_current())
 
 
 class GbobjectPublishedManager(models.Manager):
@@ -56,11 +45,12 @@ class GbobjectPublishedManager(models.Manager):
             ).filter(sites=Site.objects.get_current())
 
     def search(self, pattern):
-        """Top level search method on gbobjects"""
-        try:
-            return self.advanced_search(pattern)
-        except:
-            return self.basic_search(pattern)
+        """Top level search method on gbobjects,
+        falling back to a basic search if the pattern is invalid"""
+        from gstudio.search import search_pattern
+        from gstudio.search import get_search_backend
+        return get_search_backend()(self.get_query_set(),
+                                    search_pattern(pattern))
 
     def advanced_search(self, pattern):
         """Advanced search on gbobjects"""
@@ -69,14 +59,7 @@ class GbobjectPublishedManager(models.Manager):
 
     def basic_search(self, pattern):
         """Basic search on gbobjects"""
-        lookup = None
-        for pattern in pattern.split():
-            query_part = models.Q(content__icontains=pattern) | \
-                         models.Q(excerpt__icontains=pattern) | \
-                         models.Q(title__icontains=pattern)
-            if lookup is None:
-                lookup = query_part
-            else:
-                lookup |= query_part
-
-        return self.get_query_set().filter(lookup)
+        from gstudio.search import basic_pattern
+        from gstudio.search import get_search_backend
+        return get_search_backend()(self.get_query_set(),
+                                    basic_pattern(pattern))
@@ -4,20 +4,20 @@ from datetime import datetime
 
 from django.db import models
 from django.db.models import Q
-from django.utils.html import strip_tags
-from django.utils.html import linebreaks
 from django.contrib.auth.models import User
 from django.contrib.sites.models import Site
+from django.db.models.signals import pre_save
 from django.db.models.signals import post_save
+from django.db.models.signals import post_init
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import pre_delete
+from django.db.models.signals import post_delete
 from django.utils.importlib import import_module
 from django.contrib import comments
 from django.contrib.comments.models import CommentFlag
 from django.contrib.comments.moderation import moderator
 from django.utils.translation import ugettext_lazy as _
 import json
-from django.contrib.markup.templatetags.markup import markdown
-from django.contrib.markup.templatetags.markup import textile
-from django.contrib.markup.templatetags.markup import restructuredtext
 
 
 from djangoratings.fields import RatingField
@@ -49,6 +49,22 @@ from objectapp.moderator import GbobjectCommentModerator
 from objectapp.url_shortener import get_url_shortener
 from objectapp.signals import ping_directories_handler
 from objectapp.signals import ping_external_urls_handler
+from gstudio.neighbourhood import nbh_m2m_changed_handler
+from gstudio.rendering import get_rendered_content
+from gstudio.schema import get_resolver
+from gstudio.schema import clear_resolver_handler
+from gstudio.searchindex import search_post_init_handler
+from gstudio.searchindex import search_post_save_handler
+from gstudio.searchindex import search_m2m_changed_handler
+from gstudio.completion import completion_post_init_handler
+from gstudio.completion import completion_post_save_handler
+from gstudio.completion import completion_post_delete_handler
+from gstudio.publication import publication_pre_save_handler
+from gstudio.tagusage import tag_usage_pre_delete_handler
+from gstudio.tagusage import tag_usage_post_delete_handler
+from gstudio.tagusage import tag_usage_m2m_changed_handler
+from gstudio.snapshots import snapshot_post_init_handler
+from gstudio.snapshots import snapshot_post_save_handler
 
 '''
 class Author(User):
@@ -124,6 +140,8 @@ class Gbobject(Node):
     end_publication = models.DateTimeField(_('end publication'),
                                            help_text=_('date end publish'),
                                            default=datetime(2042, 3, 15))
+    is_live = models.BooleanField(_('live'), default=False, db_index=True,
+                                  editable=False)
 
     sites = models.ManyToManyField(Site, verbose_name=_('sites publication'),
                                    related_name='gbobjects')
@@ -199,62 +217,15 @@ class Gbobject(Node):
     
     def get_possible_rels(self):
         """
-        Gets the relations possible for this metatype
-        1. Recursively create a set of all the ancestors i.e. parent/subtypes of the MT. 
-        2. Get all the R's linked to each ancestor 
+        Returns the relations of all the ancestors, as left and right roles
         """
-        #Step 1. 
-        ancestor_list = []
-        this_parent = self.parent
-        
-        # append
-        while this_parent:
-            ancestor_list.append(this_parent)
-            this_parent = this_parent.parent
-            
-        #Step 2.
-        rels = {}
-        rt_set = Relation.objects.all()
-        right_subset = []
-        left_subset = []
-        
-        for each in ancestor_list:
-            # retrieve all the RT's from each ancestor 
-            right_subset.extend(rt_set.filter(subject1=each.id))
-            left_subset.extend(rt_set.filter(subject2=each.id))
-         
-        rels['possible_leftroles'] = left_subset
-        rels['possible_rightroles'] = right_subset
-        
-        return rels
-
+        return get_resolver().relations(self)
 
     def get_possible_attributes(self):
         """
-        Gets the relations possible for this metatype
-        1. Recursively create a set of all the ancestors i.e. parent/subtypes of the MT. 
-        2. Get all the RT's linked to each ancestor 
+        Returns the attributes of all the ancestors
         """
-        #Step 1. 
-        ancestor_list = []
-        this_parent = self.parent
-        
-        # recursive thru parent field and append
-        while this_parent:
-            ancestor_list.append(this_parent)
-            this_parent = this_parent.parent
-            
-        #Step 2.
-        attrs = [] 
-                
-        for each in ancestor_list:
-            # retrieve all the AT's from each ancestor 
-            attrs.extend(Attribute.objects.filter(subject=each.id))
-                     
-        return attrs
-
-
-
+        return get_resolver().attributes(self)
 
     @property
     def get_nbh(self):
@@ -438,18 +409,17 @@ class Gbobject(Node):
 
 
 
+    @property
+    def rendered_content(self):
+        """Return the content rendered once, with its
+        word count, images and links"""
+        return get_rendered_content(self.content, MARKUP_LANGUAGE,
+                                    MARKDOWN_EXTENSIONS)
+
     @property
     def html_content(self):
         """Return the content correctly formatted"""
-        if MARKUP_LANGUAGE == 'markdown':
-            return markdown(self.content, MARKDOWN_EXTENSIONS)
-        elif MARKUP_LANGUAGE == 'textile':
-            return textile(self.content)
-        elif MARKUP_LANGUAGE == 'restructuredtext':
-            return restructuredtext(self.content)
-        elif not '</p>' in self.content:
-            return linebreaks(self.content)
-        return self.content
+        return self.rendered_content.html
 
 
     @property
@@ -471,7 +441,7 @@ class Gbobject(Node):
     @property
     def word_count(self):
         """Count the words of an gbobject"""
-        return len(strip_tags(self.html_content).split())
+        return self.rendered_content.word_count
 
     @property
     def is_actual(self):
@@ -644,5 +614,47 @@ post_save.connect(ping_directories_handler, sender=Gbobject,
                   dispatch_uid='objectapp.gbobject.post_save.ping_directories')
 post_save.connect(ping_external_urls_handler, sender=Gbobject,
                   dispatch_uid='objectapp.gbobject.post_save.ping_external_urls')
-
-
+m2m_changed.connect(nbh_m2m_changed_handler,
+                    sender=Gbobject.objecttypes.through,
+                    dispatch_uid='objectapp.gbobject.objecttypes.m2m_changed.nbh')
+m2m_changed.connect(clear_resolver_handler,
+                    sender=Gbobject.objecttypes.through,
+                    dispatch_uid='objectapp.gbobject.objecttypes.m2m_changed.schema')
+for model in (Gbobject, Process, System):
+    name = model._meta.module_name
+    post_init.connect(search_post_init_handler, sender=model,
+                      dispatch_uid='objectapp.%s.post_init.search' % name)
+    post_save.connect(search_post_save_handler, sender=model,
+                      dispatch_uid='objectapp.%s.post_save.search' % name)
+for field_name in ('objecttypes', 'authors'):
+    m2m_changed.connect(search_m2m_changed_handler,
+                        sender=getattr(Gbobject, field_name).through,
+                        dispatch_uid='objectapp.gbobject.%s.m2m_changed.search' % \
+                        field_name)
+for model in (Gbobject, Process, System):
+    name = model._meta.module_name
+    post_init.connect(completion_post_init_handler, sender=model,
+                      dispatch_uid='objectapp.%s.post_init.completion' % name)
+    post_save.connect(completion_post_save_handler, sender=model,
+                      dispatch_uid='objectapp.%s.post_save.completion' % name)
+    post_delete.connect(completion_post_delete_handler, sender=model,
+                        dispatch_uid='objectapp.%s.post_delete.completion' % \
+                        name)
+for model in (Gbobject, Process, System):
+    pre_save.connect(publication_pre_save_handler, sender=model,
+                     dispatch_uid='objectapp.%s.pre_save.publication' % \
+                     model._meta.module_name)
+for model in (Gbobject, Process, System):
+    name = model._meta.module_name
+    post_init.connect(snapshot_post_init_handler, sender=model,
+                      dispatch_uid='objectapp.%s.post_init.snapshot' % name)
+    post_save.connect(snapshot_post_save_handler, sender=model,
+                      dispatch_uid='objectapp.%s.post_save.snapshot' % name)
+    pre_delete.connect(tag_usage_pre_delete_handler, sender=model,
+                       dispatch_uid='objectapp.%s.pre_delete.tag_usage' % name)
+    post_delete.connect(tag_usage_post_delete_handler, sender=model,
+                        dispatch_uid='objectapp.%s.post_delete.tag_usage' % \
+                        name)
+m2m_changed.connect(tag_usage_m2m_changed_handler,
+                    sender=Gbobject.sites.through,
+                    dispatch_uid='objectapp.gbobject.sites.m2m_changed.tag_usage')
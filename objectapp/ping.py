@@ -114,10 +114,9 @@ class ExternalUrlsPinger(threading.Thread):
 
     def find_external_urls(self, gbobject):
         """Find external urls in an gbobject"""
-        soup = BeautifulSoup(gbobject.html_content)
-        external_urls = [a['href'] for a in soup.findAll('a')
+        external_urls = [url for url in gbobject.rendered_content.links
                          if self.is_external_url(
-                             a['href'], self.ressources.site_url)]
+                             url, self.ressources.site_url)]
         return external_urls
 
     def find_pingback_href(self, content):
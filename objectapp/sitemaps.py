@@ -2,12 +2,10 @@
 from django.contrib.sitemaps import Sitemap
 from django.core.urlresolvers import reverse
 
-from tagging.models import TaggedItem
-
 from objectapp.models import Gbobject
 from objectapp.models import Author
 from objectapp.models import Objecttype
-from objectapp.managers import tags_published
+from gstudio.tagusage import tags_usage
 
 
 class GbobjectSitemap(Sitemap):
@@ -90,20 +88,17 @@ class TagSitemap(Sitemap):
         len_gbobjects = float(Gbobject.published.count())
         self.cache_tags = {}
         for tag in tags:
-            gbobjects = TaggedItem.objects.get_by_model(
-                Gbobject.published.all(), tag)
-            self.cache_tags[tag.pk] = (gbobjects, gbobjects.count() / len_gbobjects)
+            self.cache_tags[tag.pk] = (tag.last_used, tag.count / len_gbobjects)
 
     def items(self):
         """Return all tags with coeff"""
-        tags = tags_published()
+        tags = tags_usage(Gbobject)
         self.cache(tags)
         return tags
 
     def lastmod(self, obj):
         """Return last modification of a tag"""
-        gbobjects = self.cache_tags[obj.pk][0]
-        return gbobjects[0].creation_date
+        return self.cache_tags[obj.pk][0]
 
     def priority(self, obj):
         """Compute priority with cached coeffs"""
@@ -14,7 +14,6 @@ from django.contrib.contenttypes.models import ContentType
 from django.utils.encoding import smart_unicode
 from django.contrib.comments import get_model as get_comment_model
 
-from tagging.models import Tag
 from tagging.utils import calculate_cloud
 
 from gstudio.gnowql import get_node
@@ -23,6 +22,7 @@ from objectapp.models import Gbobject
 from objectapp.models import Author
 from objectapp.models import Objecttype
 from objectapp.managers import tags_published
+from gstudio.tagusage import tags_usage
 from objectapp.comparison import VectorBuilder
 from objectapp.comparison import pearson_score
 from objectapp.templatetags.zcalendar import ObjectappCalendar
@@ -322,7 +322,5 @@ def get_tags(parser, token):
 @register.inclusion_tag('objectapp/tags/dummy.html')
 def get_tag_cloud(steps=6, template='objectapp/tags/tag_cloud.html'):
     """Return a cloud of published tags"""
-    tags = Tag.objects.usage_for_queryset(
-        Gbobject.published.all(), counts=True)
     return {'template': template,
-            'tags': calculate_cloud(tags, steps)}
+            'tags': calculate_cloud(tags_usage(Gbobject), steps)}
@@ -10,7 +10,7 @@ from objectapp.views.decorators import template_name_for_gbobject_queryset_filte
 def get_Objecttype_or_404(path):
     """Retrieve a Objecttype by a path"""
     path_bits = [p for p in path.split('/') if p]
-    return get_object_or_404(Objecttype, slug=path_bits[-1])
+    return get_object_or_404(Objecttype, tree_path='/'.join(path_bits))
 
 
 def Objecttype_detail(request, path, page=None, **kwargs):
@@ -3,11 +3,11 @@ from django.template import RequestContext
 from django.shortcuts import render_to_response
 from django.template.defaultfilters import slugify
 
-from tagging.models import Tag
 from tagging.views import tagged_object_list
 
 from objectapp.models import Gbobject
 from objectapp.settings import PAGINATION
+from gstudio.tagusage import tags_usage
 
 from objectapp.views.decorators import template_name_for_gbobject_queryset_filtered
 
@@ -15,8 +15,7 @@ from objectapp.views.decorators import template_name_for_gbobject_queryset_filte
 def tag_list(request, template_name='objectapp/tag_list.html'):
     """Return the list of published tags with counts,
     try to simulate an object_list view"""
-    tag_list = Tag.objects.usage_for_queryset(
-        Gbobject.published.all(), counts=True)
+    tag_list = tags_usage(Gbobject)
     return render_to_response(template_name, {'object_list': tag_list},
                               context_instance=RequestContext(request))
 